@@ -0,0 +1,350 @@
+import math
+
+import numpy as np
+
+
+def solve_normal_equations(power, cross, degree):
+    """
+    Решает нормальные уравнения полиномиальной регрессии по степенным суммам.
+
+    Матрица Грама G[j, k] = Σx^(j+k) перед решением симметрично
+    масштабируется по диагонали, чтобы суммы высоких степеней
+    не ухудшали обусловленность.
+
+    Args:
+        power (array_like): суммы Σx^k, k = 0..2·degree и выше;
+            допускаются ведущие (пакетные) оси.
+        cross (array_like): суммы Σx^k·y, k = 0..degree и выше.
+        degree (int): степень полинома.
+
+    Returns:
+        np.ndarray: коэффициенты по возрастанию степени, форма (..., degree + 1).
+    """
+    power = np.asarray(power, dtype=np.float64)
+    cross = np.asarray(cross, dtype=np.float64)
+    k = degree + 1
+    idx = np.arange(k)[:, None] + np.arange(k)[None, :]
+    gram = power[..., idx]
+    rhs = cross[..., :k]
+    diag = np.diagonal(gram, axis1=-2, axis2=-1)
+    d = np.where(diag > 0, 1 / np.sqrt(np.where(diag > 0, diag, 1)), 1.0)
+    scaled = gram * d[..., :, None] * d[..., None, :]
+    try:
+        sol = np.linalg.solve(scaled, (rhs * d)[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        sol = (np.linalg.pinv(scaled) @ (rhs * d)[..., None])[..., 0]
+    return sol * d
+
+
+def linear_from_sums(sums):
+    """
+    Строит прямую v = a + b·u по суммам (n, Σu, Σu², Σv, Σu·v, Σv²).
+
+    Args:
+        sums (array_like): суммы; допускаются ведущие (пакетные) оси.
+
+    Returns:
+        tuple: (a, b) — массивы или скаляры по форме входа.
+    """
+    n, su, suu, sv, suv = (sums[..., i] for i in range(5))
+    b = (n * suv - su * sv) / (n * suu - su**2)
+    a = (sv - b * su) / n
+    return a, b
+
+
+class PowerSumAccumulator:
+    """
+    Накопитель достаточных статистик для моделей RegressionAnalysis.
+
+    Хранит степенные суммы Σx^k и Σx^k·y, а также суммы
+    логарифмированных данных для экспоненциальной и степенной моделей.
+    Обновляется за O(1) на точку (или O(m) на блок из m точек),
+    два накопителя объединяются сложением, поэтому данные можно
+    обрабатывать по частям и сводить результаты параллельно.
+
+    Точки каждого блока приводятся к float64 и суммируются внутри блока
+    (BLAS), а суммы блоков складываются с компенсацией Ноймайера, поэтому
+    погрешность не растёт с числом блоков даже для Σx^6.
+    """
+
+    _SUMS = ("power", "cross", "syy", "exp_sums", "pow_sums")
+
+    def __init__(self, max_degree=3):
+        """
+        Args:
+            max_degree (int): наибольшая степень полинома, которую
+                потребуется строить по накопленным суммам.
+        """
+        self.max_degree = max_degree
+        self.power = np.zeros(2 * max_degree + 1)
+        self.cross = np.zeros(max_degree + 1)
+        self.syy = 0.0
+        # (n, Σx, Σx², Σln y, Σx·ln y, Σ(ln y)²) по точкам с y > 0
+        self.exp_sums = np.zeros(6)
+        # (n, Σln x, Σ(ln x)², Σln y, Σln x·ln y, Σ(ln y)²) по точкам с x, y > 0
+        self.pow_sums = np.zeros(6)
+        self.x_min = math.inf
+        self.x_max = -math.inf
+        self.y_min = math.inf
+        self.y_max = -math.inf
+        # Поправки компенсированного суммирования для каждого поля _SUMS.
+        self._comp = {name: np.zeros_like(getattr(self, name)) for name in self._SUMS}
+
+    def _add(self, name, value, comp=0.0):
+        """
+        Прибавляет value (и поправку comp) к сумме name по алгоритму
+        Ноймайера; сумма хранит округлённый результат, а остаток
+        переносится в self._comp[name].
+        """
+        total = getattr(self, name)
+        value = np.asarray(value, dtype=np.float64)
+        new = total + value
+        err = np.where(
+            np.abs(total) >= np.abs(value), (total - new) + value, (value - new) + total
+        )
+        carry = self._comp[name] + np.where(np.isfinite(new), err, 0.0) + comp
+        folded = new + carry
+        self._comp[name] = np.where(np.isfinite(folded), carry - (folded - new), 0.0)
+        setattr(self, name, folded if np.ndim(folded) else float(folded))
+
+    @classmethod
+    def from_arrays(cls, x, y, max_degree=3):
+        """Создаёт накопитель и добавляет в него массивы x, y."""
+        acc = cls(max_degree)
+        acc.update(x, y)
+        return acc
+
+    @property
+    def n(self):
+        return int(round(self.power[0]))
+
+    def update(self, x, y):
+        """
+        Добавляет точку или блок точек.
+
+        Args:
+            x (float | array_like): значения X.
+            y (float | array_like): значения Y.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        if len(x) == 0:
+            return self
+        powers = np.vander(x, len(self.power), increasing=True)
+        sums = np.stack((np.ones_like(x), y)) @ powers
+        self._add("power", sums[0])
+        self._add("cross", sums[1, : len(self.cross)])
+        self._add("syy", float(y @ y))
+        self.x_min = min(self.x_min, float(x.min()))
+        self.x_max = max(self.x_max, float(x.max()))
+        self.y_min = min(self.y_min, float(y.min()))
+        self.y_max = max(self.y_max, float(y.max()))
+
+        pos_y = y > 0
+        x_e = x[pos_y]
+        ln_y = np.log(y[pos_y])
+        self._add("exp_sums", self._log_sums(x_e, ln_y))
+
+        pos_xy = pos_y & (x > 0)
+        ln_y = np.log(y[pos_xy])
+        ln_x = np.log(x[pos_xy])
+        self._add("pow_sums", self._log_sums(ln_x, ln_y))
+        return self
+
+    def update_groups(self, x, counts, y_sum, y_sq, ln_y, y_min, y_max):
+        """
+        Добавляет блок групп точек с одинаковым X (см. grouped.aggregate).
+
+        Суммы получаются те же, что при добавлении всех точек групп
+        по отдельности, но за O(m) на блок из m групп.
+
+        Args:
+            x (array_like): значения X групп.
+            counts (array_like): число точек в группах.
+            y_sum (array_like): суммы Y по группам.
+            y_sq (array_like): суммы Y² по группам.
+            ln_y (array_like): форма (m, 3) — число точек с y > 0,
+                Σln y и Σ(ln y)² по этим точкам.
+            y_min (array_like): наименьшие Y групп.
+            y_max (array_like): наибольшие Y групп.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        if len(x) == 0:
+            return self
+        powers = np.vander(x, len(self.power), increasing=True)
+        sums = np.stack((counts, y_sum)) @ powers
+        self._add("power", sums[0])
+        self._add("cross", sums[1, : len(self.cross)])
+        self._add("syy", float(np.sum(y_sq)))
+        self.x_min = min(self.x_min, float(x.min()))
+        self.x_max = max(self.x_max, float(x.max()))
+        self.y_min = min(self.y_min, float(np.min(y_min)))
+        self.y_max = max(self.y_max, float(np.max(y_max)))
+
+        count, ln_sum, ln_sq = np.asarray(ln_y, dtype=np.float64).T
+        self._add("exp_sums", self._group_log_sums(x, count, ln_sum, ln_sq))
+        pos_x = x > 0
+        ln_x = np.log(np.where(pos_x, x, 1.0))
+        count = np.where(pos_x, count, 0.0)
+        ln_sum = np.where(pos_x, ln_sum, 0.0)
+        ln_sq = np.where(pos_x, ln_sq, 0.0)
+        self._add("pow_sums", self._group_log_sums(ln_x, count, ln_sum, ln_sq))
+        return self
+
+    @staticmethod
+    def _group_log_sums(u, count, v_sum, v_sq):
+        cu = count * u
+        return np.array(
+            [count.sum(), cu.sum(), cu @ u, v_sum.sum(), u @ v_sum, v_sq.sum()]
+        )
+
+    @staticmethod
+    def _log_sums(u, v):
+        return np.array([len(u), u.sum(), u @ u, v.sum(), u @ v, v @ v])
+
+    def merge(self, other):
+        """
+        Добавляет к накопителю статистики другого накопителя.
+
+        Args:
+            other (PowerSumAccumulator): накопитель другой части данных.
+
+        Returns:
+            PowerSumAccumulator: self.
+        """
+        degree = min(self.max_degree, other.max_degree)
+        if degree < self.max_degree:
+            self._truncate(degree)
+        for name in self._SUMS:
+            size = np.size(getattr(self, name))
+            value = np.asarray(getattr(other, name))
+            comp = other._comp[name]
+            if np.ndim(value):
+                value, comp = value[:size], comp[:size]
+            self._add(name, value, comp)
+        self.x_min = min(self.x_min, other.x_min)
+        self.x_max = max(self.x_max, other.x_max)
+        self.y_min = min(self.y_min, other.y_min)
+        self.y_max = max(self.y_max, other.y_max)
+        return self
+
+    def _truncate(self, degree):
+        self.max_degree = degree
+        self.power = self.power[: 2 * degree + 1].copy()
+        self.cross = self.cross[: degree + 1].copy()
+        self._comp["power"] = self._comp["power"][: 2 * degree + 1].copy()
+        self._comp["cross"] = self._comp["cross"][: degree + 1].copy()
+
+    def state(self):
+        """
+        Возвращает состояние накопителя словарём массивов
+        (например, для сохранения через np.savez).
+        """
+        state = {name: np.asarray(getattr(self, name)) for name in self._SUMS}
+        state["bounds"] = np.array([self.x_min, self.x_max, self.y_min, self.y_max])
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Восстанавливает накопитель из словаря, полученного state()."""
+        acc = cls((len(state["power"]) - 1) // 2)
+        for name in cls._SUMS:
+            value = np.array(state[name], dtype=np.float64)
+            setattr(acc, name, value if value.ndim else float(value))
+        acc.x_min, acc.x_max, acc.y_min, acc.y_max = map(float, state["bounds"])
+        return acc
+
+    def copy(self):
+        acc = PowerSumAccumulator(self.max_degree)
+        return acc.merge(self)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    @property
+    def x_mean(self):
+        return self.power[1] / self.power[0]
+
+    @property
+    def y_mean(self):
+        return self.cross[0] / self.power[0]
+
+    def correlation_coefficient(self):
+        """
+        Вычисляет коэффициент корреляции Пирсона по накопленным суммам.
+
+        Returns:
+            float: коэффициент корреляции r.
+        """
+        n, sx, sx2 = self.power[:3]
+        sy, sxy = self.cross[:2]
+        num = n * sxy - sx * sy
+        den = math.sqrt((n * sx2 - sx**2) * (n * self.syy - sy**2))
+        return float(num / den) if den != 0 else 0
+
+    def linear_regression(self):
+        """Строит линейную модель: y = a + bx. Returns: tuple (a, b)."""
+        return self.polynomial_regression(1)
+
+    def quadratic_regression(self):
+        """Строит квадратичную модель. Returns: tuple (a, b, c)."""
+        return self.polynomial_regression(2)
+
+    def cubic_regression(self):
+        """Строит кубическую модель. Returns: tuple (a, b, c, d)."""
+        return self.polynomial_regression(3)
+
+    def polynomial_regression(self, degree):
+        """
+        Строит полиномиальную модель по накопленным суммам.
+
+        Args:
+            degree (int): степень полинома, не больше max_degree.
+
+        Returns:
+            tuple: (c0, ..., c_degree) — коэффициенты по возрастанию степени.
+        """
+        if degree > self.max_degree:
+            raise ValueError(
+                f"Степень {degree} больше накопленной max_degree={self.max_degree}"
+            )
+        coefs = solve_normal_equations(self.power, self.cross, degree)
+        return tuple(float(c) for c in coefs)
+
+    def exponential_regression(self):
+        """Строит экспоненциальную модель: y = a * exp(bx). Returns: (a, b)."""
+        ln_a, b = linear_from_sums(self.exp_sums)
+        return math.exp(ln_a), float(b)
+
+    def power_regression(self):
+        """Строит степенную модель: y = a * x^b. Returns: (a, b)."""
+        ln_a, b = linear_from_sums(self.pow_sums)
+        return math.exp(ln_a), float(b)
+
+    def polynomial_errors(self, coefs):
+        """
+        Вычисляет ошибки полиномиальной модели только по суммам:
+        SS_res = Σy² - 2·cᵀ(Σx^k·y) + cᵀGc.
+
+        Относительная ошибка (MARE) требует исходных точек
+        и здесь не вычисляется.
+
+        Args:
+            coefs (array_like): коэффициенты по возрастанию степени.
+
+        Returns:
+            tuple: (rmse, r2, ss_res, ss_tot).
+        """
+        c = np.asarray(coefs, dtype=np.float64)
+        k = len(c)
+        idx = np.arange(k)[:, None] + np.arange(k)[None, :]
+        gram = self.power[idx]
+        n = self.power[0]
+        ss_res = max(float(self.syy - 2 * c @ self.cross[:k] + c @ gram @ c), 0.0)
+        ss_tot = float(self.syy - self.cross[0] ** 2 / n)
+        rmse = math.sqrt(ss_res / n)
+        r2 = 1 - ss_res / ss_tot if ss_tot != 0 else 0
+        return rmse, r2, ss_res, ss_tot
@@ -1,66 +1,248 @@
 import math
 
+import numpy as np
+
+from accumulator import PowerSumAccumulator, linear_from_sums
+from data_io import BLOCK_SIZE, iter_blocks, load_dataset
+from nonlinear import EXPONENTIAL, POWER, levenberg_marquardt
+
+
+DEFAULT_X = [
+    0.2,
+    0.6,
+    0.7,
+    1.1,
+    1.2,
+    1.5,
+    1.8,
+    2.0,
+    2.2,
+    2.4,
+    2.7,
+    3.0,
+    3.2,
+    3.4,
+    3.8,
+    4.0,
+    4.2,
+    4.5,
+    4.8,
+    5.0,
+]
+
+DEFAULT_Y = [
+    1.9,
+    0.8,
+    0.7,
+    0.3,
+    0.0,
+    0.4,
+    0.3,
+    0.2,
+    0.2,
+    0.3,
+    0.2,
+    0.3,
+    0.2,
+    0.2,
+    0.2,
+    0.5,
+    0.3,
+    0.1,
+    0.4,
+    0.3,
+]
+
+
+def unscale_polynomial(coefs, shift, scale):
+    """
+    Переводит коэффициенты полинома от нормированной переменной
+    t = (x - shift) / scale к коэффициентам по степеням x.
+
+    Args:
+        coefs (array_like): коэффициенты по t, последняя ось — степени
+            по возрастанию; допускаются ведущие (пакетные) оси.
+        shift (float | array_like): сдвиг, совместимый с ведущими осями.
+        scale (float | array_like): масштаб, совместимый с ведущими осями.
+
+    Returns:
+        np.ndarray: коэффициенты по x той же формы, что и coefs.
+    """
+    coefs = np.asarray(coefs, dtype=np.float64)
+    size = coefs.shape[-1]
+    shift = np.asarray(shift, dtype=np.float64)[..., None, None]
+    scale = np.asarray(scale, dtype=np.float64)[..., None, None]
+    k = np.arange(size)[:, None]
+    j = np.arange(size)[None, :]
+    binom = np.array(
+        [[math.comb(kk, jj) for jj in range(size)] for kk in range(size)],
+        dtype=np.float64,
+    )
+    power = np.where(j <= k, k - j, 0)
+    transform = binom * (-shift) ** power / scale**k
+    return np.einsum("...k,...kj->...j", coefs, transform)
+
+
+def power_curve(x, a, b):
+    """
+    Вычисляет степенную модель y = a * x^b, полагая y = 0 при x <= 0.
+
+    Args:
+        x (float | array_like): значения X.
+        a (float): коэффициент a.
+        b (float): показатель степени b.
+
+    Returns:
+        np.ndarray: значения модели.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.zeros_like(x)
+    np.power(x, b, out=y, where=x > 0)
+    return a * y
+
+
+def as_storage(values, dtype):
+    """
+    Массив хранения X или Y.
+
+    np.memmap остаётся отображением файла в собственном типе: блоки
+    приводятся к float64 при обработке (iter_blocks), поэтому данные
+    файла не копируются в память при любом dtype. Остальные данные
+    приводятся к dtype.
+
+    Args:
+        values (array_like): значения.
+        dtype (np.dtype): тип хранения данных в памяти.
+
+    Returns:
+        np.ndarray: массив хранения.
+    """
+    if isinstance(values, np.memmap):
+        return values
+    return np.asarray(values, dtype=dtype)
+
+
+def approximation_errors(pairs, n, y_mean):
+    """
+    Ошибки аппроксимации за один проход по блокам остатков.
+
+    Args:
+        pairs (iterable[tuple]): блоки (y, y_model) — значения Y
+            и значения модели в тех же точках.
+        n (int): общее число точек.
+        y_mean (float): среднее Y.
+
+    Returns:
+        tuple: (rmse, mare, r2, ss_res, ss_tot).
+    """
+    ss_res = ss_tot = mare = 0.0
+    count = 0
+    for y, y_model in pairs:
+        resid = y - y_model
+        dev = y - y_mean
+        ss_res += float(resid @ resid)
+        ss_tot += float(dev @ dev)
+        nonzero = np.abs(y) > 1e-10
+        count += int(np.count_nonzero(nonzero))
+        mare += float(np.abs(resid[nonzero] / y[nonzero]).sum())
+    rmse = math.sqrt(ss_res / n)
+    mare = (mare / count * 100) if count > 0 else 0
+    r2 = 1 - ss_res / ss_tot if ss_tot != 0 else 0
+    return rmse, mare, r2, ss_res, ss_tot
+
 
 class RegressionAnalysis:
-    def __init__(self):
-        self.x = [
-            0.2,
-            0.6,
-            0.7,
-            1.1,
-            1.2,
-            1.5,
-            1.8,
-            2.0,
-            2.2,
-            2.4,
-            2.7,
-            3.0,
-            3.2,
-            3.4,
-            3.8,
-            4.0,
-            4.2,
-            4.5,
-            4.8,
-            5.0,
-        ]
-        self.y = [
-            1.9,
-            0.8,
-            0.7,
-            0.3,
-            0.0,
-            0.4,
-            0.3,
-            0.2,
-            0.2,
-            0.3,
-            0.2,
-            0.3,
-            0.2,
-            0.2,
-            0.2,
-            0.5,
-            0.3,
-            0.1,
-            0.4,
-            0.3,
-        ]
+    MAX_DEGREE = 3
+    STORAGE_DTYPES = (np.float64, np.float32)
+
+    def __init__(self, x=None, y=None, block_size=BLOCK_SIZE, dtype=np.float64):
+        """
+        Args:
+            x (array_like | None): значения X; по умолчанию — данные варианта.
+            y (array_like | None): значения Y; по умолчанию — данные варианта.
+            block_size (int): размер блока, которыми обрабатываются данные;
+                для np.memmap ограничивает потребление памяти.
+            dtype (np.dtype): тип хранения X и Y — float64 или float32.
+                Все вычисления идут по блокам, приведённым к float64,
+                а суммы блоков складываются с компенсацией, поэтому
+                float32 только вдвое сокращает память и не ухудшает
+                точность сумм (погрешность остаётся лишь от округления
+                самих данных до float32). np.memmap хранится в типе
+                файла (см. as_storage).
+        """
+        if np.dtype(dtype) not in self.STORAGE_DTYPES:
+            raise ValueError(f"Неподдерживаемый тип хранения: {dtype}")
+        self.dtype = np.dtype(dtype)
+        self.x = as_storage(DEFAULT_X if x is None else x, dtype)
+        self.y = as_storage(DEFAULT_Y if y is None else y, dtype)
         self.n = len(self.x)
+        self.block_size = block_size
+        self.stats = None
+        self._qr_cache = None
+
+    @classmethod
+    def from_file(cls, path, block_size=BLOCK_SIZE, dtype=np.float64):
+        """
+        Создаёт анализ по данным из CSV- или .npy-файла (через np.memmap).
+
+        Args:
+            path (str): путь к файлу с двумя столбцами X, Y.
+            block_size (int): размер блока обработки.
+            dtype (np.dtype): тип хранения X и Y (float64 или float32).
+
+        Returns:
+            RegressionAnalysis: анализ с данными файла.
+        """
+        x, y = load_dataset(path, dtype)
+        return cls(x, y, block_size, dtype)
+
+    def iter_blocks(self, *arrays):
+        """Перебирает блоки (x, y, *arrays) размером block_size."""
+        return iter_blocks(self.x, self.y, *arrays, block_size=self.block_size)
 
     def calculate_basic_stats(self):
         """
         Вычисляет базовые статистические характеристики:
         средние значения, суммы, квадраты и произведения.
+
+        Все степенные суммы Σx^k (k = 0..6), Σx^k·y (k = 0..3) и суммы
+        логарифмов для нелинейных моделей собираются за один проход
+        в накопитель self.stats (см. PowerSumAccumulator).
         """
-        self.x_mean = sum(self.x) / self.n
-        self.y_mean = sum(self.y) / self.n
-        self.sum_x = sum(self.x)
-        self.sum_y = sum(self.y)
-        self.sum_x2 = sum(xi**2 for xi in self.x)
-        self.sum_y2 = sum(yi**2 for yi in self.y)
-        self.sum_xy = sum(self.x[i] * self.y[i] for i in range(self.n))
+        self.use_stats(self._accumulate())
+
+    def use_stats(self, stats):
+        """
+        Устанавливает накопитель базовых статистик, вычисленный ранее
+        (например, восстановленный из кеша), вместо прохода по данным.
+
+        Args:
+            stats (PowerSumAccumulator): статистики данных анализа.
+        """
+        self.stats = stats
+        self._qr_cache = None
+        self.Sx = self.stats.power
+        self.Sxy = self.stats.cross
+        self.sum_x = float(self.Sx[1])
+        self.sum_y = float(self.Sxy[0])
+        self.sum_x2 = float(self.Sx[2])
+        self.sum_y2 = self.stats.syy
+        self.sum_xy = float(self.Sxy[1])
+        self.x_mean = self.sum_x / self.n
+        self.y_mean = self.sum_y / self.n
+
+    def _accumulate(self):
+        stats = PowerSumAccumulator(self.MAX_DEGREE)
+        for x, y in self.iter_blocks():
+            stats.update(x, y)
+        return stats
+
+    def _least_squares_blocks(self):
+        """
+        Перебирает блоки (x, y, w) для задач наименьших квадратов;
+        w — корни из весов точек (None — все веса равны 1).
+        """
+        return ((x, y, None) for x, y in self.iter_blocks())
 
     def correlation_coefficient(self):
         """
@@ -76,21 +258,22 @@ class RegressionAnalysis:
         )
         return num / den if den != 0 else 0
 
-    def correlation_significance(self, r):
+    def correlation_significance(self, r, alpha=0.05):
         """
-        Проверяет значимость коэффициента корреляции с помощью t-критерия.
+        Проверяет значимость коэффициента корреляции с помощью t-критерия
+        с n - 2 степенями свободы (см. correlation.correlation_test).
 
         Args:
             r (float): коэффициент корреляции.
+            alpha (float): уровень значимости.
 
         Returns:
             tuple: (is_significant (bool), t_calc (float)).
         """
-        if abs(r) >= 1:
-            return True, float("inf")
-        t_calc = abs(r) * math.sqrt((self.n - 2) / (1 - r**2))
-        t_crit = 2.101  # df=18, alpha=0.05
-        return t_calc > t_crit, t_calc
+        from correlation import correlation_test
+
+        is_sig, t_calc, _ = correlation_test(r, self.n, alpha)
+        return bool(is_sig), float(t_calc)
 
     def linear_regression(self):
         """
@@ -103,7 +286,7 @@ class RegressionAnalysis:
             self.n * self.sum_x2 - self.sum_x**2
         )
         a = self.y_mean - b * self.x_mean
-        return a, b
+        return float(a), float(b)
 
     def quadratic_regression(self):
         """
@@ -112,23 +295,7 @@ class RegressionAnalysis:
         Returns:
             tuple: (a, b, c) — коэффициенты модели.
         """
-        Sx = self.sum_x
-        Sx2 = self.sum_x2
-        Sx3 = sum(x**3 for x in self.x)
-        Sx4 = sum(x**4 for x in self.x)
-        Sy = self.sum_y
-        Sxy = self.sum_xy
-        Sx2y = sum((self.x[i] ** 2) * self.y[i] for i in range(self.n))
-
-        D = self.det3([[self.n, Sx, Sx2], [Sx, Sx2, Sx3], [Sx2, Sx3, Sx4]])
-        Da = self.det3([[Sy, Sx, Sx2], [Sxy, Sx2, Sx3], [Sx2y, Sx3, Sx4]])
-        Db = self.det3([[self.n, Sy, Sx2], [Sx, Sxy, Sx3], [Sx2, Sx2y, Sx4]])
-        Dc = self.det3([[self.n, Sx, Sy], [Sx, Sx2, Sxy], [Sx2, Sx3, Sx2y]])
-
-        a = Da / D
-        b = Db / D
-        c = Dc / D
-        return a, b, c
+        return self.polynomial_regression(2)
 
     def cubic_regression(self):
         """
@@ -137,63 +304,76 @@ class RegressionAnalysis:
         Returns:
             tuple: (a, b, c, d) — коэффициенты модели.
         """
-        Sx = self.sum_x
-        Sx2 = self.sum_x2
-        Sx3 = sum(x**3 for x in self.x)
-        Sx4 = sum(x**4 for x in self.x)
-        Sx5 = sum(x**5 for x in self.x)
-        Sx6 = sum(x**6 for x in self.x)
-        Sy = self.sum_y
-        Sxy = self.sum_xy
-        Sx2y = sum((self.x[i] ** 2) * self.y[i] for i in range(self.n))
-        Sx3y = sum((self.x[i] ** 3) * self.y[i] for i in range(self.n))
-
-        D = self.det4(
-            [
-                [self.n, Sx, Sx2, Sx3],
-                [Sx, Sx2, Sx3, Sx4],
-                [Sx2, Sx3, Sx4, Sx5],
-                [Sx3, Sx4, Sx5, Sx6],
-            ]
-        )
-        Da = self.det4(
-            [
-                [Sy, Sx, Sx2, Sx3],
-                [Sxy, Sx2, Sx3, Sx4],
-                [Sx2y, Sx3, Sx4, Sx5],
-                [Sx3y, Sx4, Sx5, Sx6],
-            ]
-        )
-        Db = self.det4(
-            [
-                [self.n, Sy, Sx2, Sx3],
-                [Sx, Sxy, Sx3, Sx4],
-                [Sx2, Sx2y, Sx4, Sx5],
-                [Sx3, Sx3y, Sx5, Sx6],
-            ]
-        )
-        Dc = self.det4(
-            [
-                [self.n, Sx, Sy, Sx3],
-                [Sx, Sx2, Sxy, Sx4],
-                [Sx2, Sx3, Sx2y, Sx5],
-                [Sx3, Sx4, Sx3y, Sx6],
-            ]
-        )
-        Dd = self.det4(
-            [
-                [self.n, Sx, Sx2, Sy],
-                [Sx, Sx2, Sx3, Sxy],
-                [Sx2, Sx3, Sx4, Sx2y],
-                [Sx3, Sx4, Sx5, Sx3y],
-            ]
-        )
+        return self.polynomial_regression(3)
+
+    def polynomial_regression(self, degree):
+        """
+        Строит полиномиальную модель: y = c0 + c1·x + ... + c_d·x^d.
+
+        Задача наименьших квадратов решается через QR-разложение матрицы
+        Вандермонда от нормированного X, без составления нормальных уравнений.
+
+        Args:
+            degree (int): степень полинома.
+
+        Returns:
+            tuple: (c0, c1, ..., c_d) — коэффициенты по возрастанию степени.
+        """
+        return self.polynomial_sweep([degree])[degree]
+
+    def polynomial_sweep(self, degrees):
+        """
+        Строит полиномиальные модели сразу для нескольких степеней.
+
+        QR-разложение выполняется один раз для наибольшей степени:
+        решение для меньшей степени k использует ведущий блок R[:k+1, :k+1].
+
+        Args:
+            degrees (iterable[int]): степени полиномов, например range(1, 16).
+
+        Returns:
+            dict: {degree: (c0, ..., c_degree)}.
+        """
+        degrees = list(degrees)
+        shift, scale, R, qty = self._polynomial_qr(max(degrees))
+        result = {}
+        for degree in degrees:
+            k = degree + 1
+            coefs = np.linalg.lstsq(R[:k, :k], qty[:k], rcond=None)[0]
+            coefs = unscale_polynomial(coefs, shift, scale)
+            result[degree] = tuple(float(c) for c in coefs)
+        return result
+
+    def _polynomial_qr(self, degree):
+        """
+        Возвращает QR-разложение матрицы Вандермонда степени не ниже degree
+        (с кешированием между вызовами).
 
-        a = Da / D
-        b = Db / D
-        c = Dc / D
-        d = Dd / D
-        return a, b, c, d
+        Разложение строится поблочно (TSQR): R-фактор расширенной матрицы
+        [V | y] уточняется блок за блоком, поэтому Q не хранится, а Qᵀy
+        берётся из последнего столбца R.
+
+        Returns:
+            tuple: (shift, scale, R, Qᵀy) — X нормируется как (x - shift) / scale.
+        """
+        cached = self._qr_cache
+        if cached is not None and cached[0] >= degree:
+            return cached[1:]
+        shift = (self.stats.x_max + self.stats.x_min) / 2
+        scale = (self.stats.x_max - self.stats.x_min) / 2 or 1.0
+        k = degree + 1
+        R_aug = np.zeros((0, k + 1))
+        for x, y, w in self._least_squares_blocks():
+            vander = np.vander((x - shift) / scale, k, increasing=True)
+            rows = np.column_stack((vander, y))
+            if w is not None:
+                rows *= w[:, None]
+            block = np.vstack((R_aug, rows))
+            R_aug = np.linalg.qr(block, mode="r")
+        R = R_aug[:k, :k]
+        qty = R_aug[:k, k]
+        self._qr_cache = (degree, shift, scale, R, qty)
+        return shift, scale, R, qty
 
     def exponential_regression(self):
         """
@@ -202,18 +382,7 @@ class RegressionAnalysis:
         Returns:
             tuple: (a, b) — коэффициенты модели.
         """
-        ln_y = [math.log(yi) for yi in self.y if yi > 0]
-        x_valid = [self.x[i] for i in range(self.n) if self.y[i] > 0]
-        n = len(x_valid)
-        Sx = sum(x_valid)
-        Sx2 = sum(x**2 for x in x_valid)
-        Sy = sum(ln_y)
-        Sxy = sum(x_valid[i] * ln_y[i] for i in range(n))
-
-        b = (n * Sxy - Sx * Sy) / (n * Sx2 - Sx**2)
-        ln_a = (Sy - b * Sx) / n
-        a = math.exp(ln_a)
-        return a, b
+        return self.stats.exponential_regression()
 
     def power_regression(self):
         """
@@ -222,92 +391,106 @@ class RegressionAnalysis:
         Returns:
             tuple: (a, b) — коэффициенты модели.
         """
-        ln_x, ln_y = [], []
-        for i in range(self.n):
-            if self.x[i] > 0 and self.y[i] > 0:
-                ln_x.append(math.log(self.x[i]))
-                ln_y.append(math.log(self.y[i]))
-        n = len(ln_x)
-        Sx = sum(ln_x)
-        Sx2 = sum(x**2 for x in ln_x)
-        Sy = sum(ln_y)
-        Sxy = sum(ln_x[i] * ln_y[i] for i in range(n))
-
-        b = (n * Sxy - Sx * Sy) / (n * Sx2 - Sx**2)
-        ln_a = (Sy - b * Sx) / n
-        a = math.exp(ln_a)
-        return a, b
+        return self.stats.power_regression()
 
-    def calculate_errors(self, y_model):
+    def exponential_regression_nls(self):
         """
-        Вычисляет ошибки аппроксимации модели.
+        Строит экспоненциальную модель y = a * exp(bx) нелинейным МНК
+        по всем точкам (включая y <= 0), начиная с логарифмической оценки.
+
+        Returns:
+            tuple: (a, b) — коэффициенты модели.
+        """
+        return self.fit_curve_model(EXPONENTIAL, self._nls_seed(self.stats.exp_sums))
+
+    def power_regression_nls(self):
+        """
+        Строит степенную модель y = a * x^b нелинейным МНК по всем точкам,
+        начиная с логарифмической оценки.
+
+        Returns:
+            tuple: (a, b) — коэффициенты модели.
+        """
+        return self.fit_curve_model(POWER, self._nls_seed(self.stats.pow_sums))
+
+    def _nls_seed(self, log_sums):
+        # Без точек с y > 0 логарифмическая оценка не определена:
+        # начинаем с константы y = ȳ.
+        if log_sums[0] < 2:
+            return self.y_mean, 0.0
+        a, b = linear_from_sums(log_sums)
+        return (math.exp(a), b) if math.isfinite(a + b) else (self.y_mean, 0.0)
+
+    def fit_curve_model(self, model, p0, **options):
+        """
+        Строит произвольную нелинейную модель методом Левенберга — Марквардта,
+        проходя данные блоками.
 
         Args:
-            y_model (list[float]): значения Y, рассчитанные моделью.
+            model (CurveModel): модель (см. nonlinear.CurveModel).
+            p0 (array_like): начальные значения параметров.
+            **options: параметры nonlinear.levenberg_marquardt.
 
         Returns:
-            tuple: (rmse, mare, r2, ss_res, ss_tot).
+            tuple: параметры модели.
         """
-        mse = sum((self.y[i] - y_model[i]) ** 2 for i in range(self.n)) / self.n
-        rmse = math.sqrt(mse)
-        mare, count = 0, 0
-        for i in range(self.n):
-            if abs(self.y[i]) > 1e-10:
-                mare += abs((self.y[i] - y_model[i]) / self.y[i])
-                count += 1
-        mare = (mare / count * 100) if count > 0 else 0
-        ss_res = sum((self.y[i] - y_model[i]) ** 2 for i in range(self.n))
-        ss_tot = sum((self.y[i] - self.y_mean) ** 2 for i in range(self.n))
-        r2 = 1 - ss_res / ss_tot if ss_tot != 0 else 0
-        return rmse, mare, r2, ss_res, ss_tot
+        blocks = lambda: (
+            (x[None], y[None], None if w is None else w[None])
+            for x, y, w in self._least_squares_blocks()
+        )
+        p, _, _, _ = levenberg_marquardt(model, blocks, p0, **options)
+        return tuple(float(c) for c in p[0])
 
-    def model_significance(self, r2, k):
+    def calculate_errors(self, y_model):
         """
-        Проверяет значимость модели с помощью F-критерия Фишера.
+        Вычисляет ошибки аппроксимации модели.
+
+        Все метрики считаются за один векторизованный проход по остаткам.
 
         Args:
-            r2 (float): коэффициент детерминации.
-            k (int): число параметров модели.
+            y_model (array_like): значения Y, рассчитанные моделью.
 
         Returns:
-            tuple: (is_significant (bool), F (float)).
+            tuple: (rmse, mare, r2, ss_res, ss_tot).
         """
-        df1 = k - 1
-        df2 = self.n - k
-        if df2 <= 0:
-            return False, 0
-        F = (r2 / df1) / ((1 - r2) / df2)
-        f_crit = 4.41 if df1 == 2 else 3.59
-        return F > f_crit, F
+        y_model = np.broadcast_to(np.asarray(y_model, dtype=np.float64), self.y.shape)
+        return approximation_errors(
+            ((y, y_m) for _, y, y_m in self.iter_blocks(y_model)), self.n, self.y_mean
+        )
 
-    def det3(self, m):
+    def calculate_model_errors(self, func):
         """
-        Вычисляет определитель 3x3.
+        Вычисляет ошибки аппроксимации модели, заданной векторизованной
+        функцией, не создавая массив прогноза на все точки.
 
         Args:
-            m (list[list[float]]): матрица 3x3.
+            func (callable): функция np.ndarray -> np.ndarray.
 
         Returns:
-            float: значение определителя.
+            tuple: (rmse, mare, r2, ss_res, ss_tot).
         """
-        return (
-            m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
-            - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
-            + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+        return approximation_errors(
+            ((y, func(x)) for x, y in self.iter_blocks()), self.n, self.y_mean
         )
 
-    def det4(self, m):
+    def model_significance(self, r2, k, alpha=0.05):
         """
-        Вычисляет определитель 4x4.
+        Проверяет значимость модели с помощью F-критерия Фишера
+        с критическим значением для степеней свободы (k - 1, n - k).
 
         Args:
-            m (list[list[float]]): матрица 4x4.
+            r2 (float): коэффициент детерминации.
+            k (int): число параметров модели.
+            alpha (float): уровень значимости.
 
         Returns:
-            float: значение определителя.
+            tuple: (is_significant (bool), F (float)).
         """
-        det = 0
-        for i in range(4):
-            minor = [[m[r][c] for c in range(4) if c != i] for r in range(1, 4)]
-            det += ((-1) ** i) * m[0][i] * self.det3(minor)
-        return det
+        from scipy import special
+
+        df1 = k - 1
+        df2 = self.n - k
+        if df2 <= 0 or df1 <= 0:
+            return False, 0
+        F = (r2 / df1) / ((1 - r2) / df2) if r2 < 1 else math.inf
+        return bool(F > special.fdtri(df1, df2, 1 - alpha)), F
@@ -0,0 +1,248 @@
+import numpy as np
+
+from accumulator import linear_from_sums, solve_normal_equations
+from analysis import unscale_polynomial
+from nonlinear import EXPONENTIAL, POWER, array_blocks, levenberg_marquardt
+
+MODEL_DEGREES = {"Линейная": 1, "Квадратичная": 2, "Кубическая": 3}
+
+
+class BatchRegression:
+    """
+    Пакетный регрессионный анализ множества независимых рядов.
+
+    Ряды передаются двумерными массивами (ряды × точки); ряды разной
+    длины выравниваются маской. Все модели строятся одним векторизованным
+    вызовом для всех рядов сразу.
+    """
+
+    def __init__(self, x, y, mask=None):
+        """
+        Args:
+            x (array_like): значения X формы (S, N).
+            y (array_like): значения Y формы (S, N).
+            mask (array_like | None): булева маска допустимых точек формы
+                (S, N); по умолчанию допустимы все конечные значения.
+        """
+        self.x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        self.y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+        valid = np.isfinite(self.x) & np.isfinite(self.y)
+        self.mask = valid if mask is None else valid & np.asarray(mask, dtype=bool)
+        self.weights = self.mask.astype(np.float64)
+        self.n = self.weights.sum(axis=1)
+
+        x_min = np.where(self.mask, self.x, np.inf).min(axis=1)
+        x_max = np.where(self.mask, self.x, -np.inf).max(axis=1)
+        self.shift = (x_max + x_min) / 2
+        scale = (x_max - x_min) / 2
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self._t = np.where(
+            self.mask, (self.x - self.shift[:, None]) / self.scale[:, None], 0.0
+        )
+        self._y = np.where(self.mask, self.y, 0.0)
+        self.y_mean = self._y.sum(axis=1) / self.n
+        self._sums_degree = -1
+
+    def _power_sums(self, degree):
+        """Степенные суммы нормированного X для всех рядов (с кешированием)."""
+        if self._sums_degree < degree:
+            power = np.empty((len(self.n), 2 * degree + 1))
+            cross = np.empty((len(self.n), degree + 1))
+            p = self.weights.copy()
+            for k in range(2 * degree + 1):
+                power[:, k] = p.sum(axis=1)
+                if k <= degree:
+                    cross[:, k] = (p * self._y).sum(axis=1)
+                p *= self._t
+            self._power, self._cross = power, cross
+            self._sums_degree = degree
+        return self._power, self._cross
+
+    def correlation_coefficient(self):
+        """
+        Returns:
+            np.ndarray: коэффициенты корреляции Пирсона всех рядов.
+        """
+        power, cross = self._power_sums(1)
+        n, st, stt = power[:, 0], power[:, 1], power[:, 2]
+        sy, sty = cross[:, 0], cross[:, 1]
+        syy = (self._y**2).sum(axis=1)
+        num = n * sty - st * sy
+        den = np.sqrt((n * stt - st**2) * (n * syy - sy**2))
+        return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+    def correlation_significance(self, r, alpha=0.05):
+        """
+        Проверяет значимость коэффициентов корреляции по t-критерию
+        с критическим значением для фактического числа точек каждого ряда.
+
+        Returns:
+            tuple: (is_significant, t_calc) — массивы по рядам.
+        """
+        from scipy import special
+
+        df = self.n - 2
+        r = np.abs(r)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_calc = np.where(r >= 1, np.inf, r * np.sqrt(df / (1 - r**2)))
+        t_crit = special.stdtrit(np.maximum(df, 1), 1 - alpha / 2)
+        return (t_calc > t_crit) & (df > 0), t_calc
+
+    def linear_regression(self):
+        """Returns: tuple (a, b) — массивы коэффициентов y = a + bx."""
+        coefs = self.polynomial_regression(1)
+        return coefs[:, 0], coefs[:, 1]
+
+    def polynomial_regression(self, degree):
+        """
+        Строит полиномиальные модели степени degree для всех рядов.
+
+        Returns:
+            np.ndarray: коэффициенты формы (S, degree + 1) по возрастанию степени.
+        """
+        power, cross = self._power_sums(degree)
+        coefs = solve_normal_equations(power, cross, degree)
+        return unscale_polynomial(coefs, self.shift, self.scale)
+
+    def exponential_regression(self):
+        """Returns: tuple (a, b) — массивы коэффициентов y = a * exp(bx)."""
+        valid = self.mask & (self.y > 0)
+        ln_y = np.log(np.where(valid, self.y, 1.0))
+        return self._log_linear(valid, np.where(valid, self.x, 0.0), ln_y)
+
+    def power_regression(self):
+        """Returns: tuple (a, b) — массивы коэффициентов y = a * x^b."""
+        valid = self.mask & (self.y > 0) & (self.x > 0)
+        ln_x = np.log(np.where(valid, self.x, 1.0))
+        ln_y = np.log(np.where(valid, self.y, 1.0))
+        return self._log_linear(valid, ln_x, ln_y)
+
+    def exponential_regression_nls(self):
+        """
+        Строит экспоненциальные модели нелинейным МНК по всем точкам рядов,
+        начиная с логарифмических оценок.
+
+        Returns:
+            tuple: (a, b) — массивы коэффициентов y = a * exp(bx).
+        """
+        return self._fit_curve(EXPONENTIAL, self.exponential_regression())
+
+    def power_regression_nls(self):
+        """
+        Строит степенные модели нелинейным МНК по всем точкам рядов,
+        начиная с логарифмических оценок.
+
+        Returns:
+            tuple: (a, b) — массивы коэффициентов y = a * x^b.
+        """
+        return self._fit_curve(POWER, self.power_regression())
+
+    def _fit_curve(self, model, seed):
+        p0 = np.stack(seed, axis=1)
+        bad = ~np.isfinite(p0).all(axis=1)
+        p0[bad] = np.column_stack((self.y_mean[bad], np.zeros(bad.sum())))
+        p, _, _, _ = levenberg_marquardt(
+            model, array_blocks(self.x, self.y, self.mask), p0
+        )
+        return p[:, 0], p[:, 1]
+
+    @staticmethod
+    def _log_linear(valid, u, v):
+        w = valid.astype(np.float64)
+        u, v = u * w, v * w
+        sums = np.stack(
+            [
+                w.sum(axis=1),
+                u.sum(axis=1),
+                (u * u).sum(axis=1),
+                v.sum(axis=1),
+                (u * v).sum(axis=1),
+            ],
+            axis=1,
+        )
+        ln_a, b = linear_from_sums(sums)
+        return np.exp(ln_a), b
+
+    def polynomial_values(self, coefs):
+        """Вычисляет значения полиномов (S, d+1) во всех точках рядов."""
+        result = np.zeros_like(self.x)
+        for c in np.asarray(coefs).T[::-1]:
+            result = result * self.x + c[:, None]
+        return result
+
+    def exponential_values(self, a, b):
+        return a[:, None] * np.exp(b[:, None] * np.where(self.mask, self.x, 0.0))
+
+    def power_values(self, a, b):
+        x = np.where(self.mask & (self.x > 0), self.x, 0.0)
+        base = np.zeros_like(x)
+        np.power(x, b[:, None], out=base, where=x > 0)
+        return a[:, None] * base
+
+    def calculate_errors(self, y_model):
+        """
+        Вычисляет ошибки аппроксимации для всех рядов.
+
+        Args:
+            y_model (array_like): значения моделей формы (S, N).
+
+        Returns:
+            tuple: (rmse, mare, r2, ss_res, ss_tot) — массивы по рядам.
+        """
+        resid = np.where(self.mask, self.y - y_model, 0.0)
+        dev = np.where(self.mask, self.y - self.y_mean[:, None], 0.0)
+        ss_res = (resid**2).sum(axis=1)
+        ss_tot = (dev**2).sum(axis=1)
+        rmse = np.sqrt(ss_res / self.n)
+        nonzero = self.mask & (np.abs(self.y) > 1e-10)
+        count = nonzero.sum(axis=1)
+        rel = np.abs(resid) / np.where(nonzero, np.abs(self.y), 1.0)
+        rel_sum = np.where(nonzero, rel, 0.0).sum(axis=1)
+        mare = np.divide(rel_sum, count, out=np.zeros_like(rel_sum), where=count > 0)
+        r2 = np.where(ss_tot != 0, 1 - ss_res / np.where(ss_tot != 0, ss_tot, 1), 0.0)
+        return rmse, mare * 100, r2, ss_res, ss_tot
+
+    def model_significance(self, r2, k, alpha=0.05):
+        """
+        Проверяет значимость моделей по F-критерию Фишера с критическим
+        значением для фактических степеней свободы каждого ряда.
+
+        Returns:
+            tuple: (is_significant, F) — массивы по рядам.
+        """
+        from scipy import special
+
+        df1 = k - 1
+        df2 = self.n - k
+        with np.errstate(divide="ignore", invalid="ignore"):
+            F = np.where(df2 > 0, (r2 / df1) / ((1 - r2) / df2), 0.0)
+        f_crit = special.fdtri(df1, np.maximum(df2, 1), 1 - alpha)
+        return (F > f_crit) & (df2 > 0), F
+
+    def fit_all(self):
+        """
+        Строит все пять семейств моделей для всех рядов.
+
+        Returns:
+            dict: {имя модели: dict(coefs, rmse, mare, r2, F, sig)}, где
+            coefs имеет форму (S, число коэффициентов), остальные — (S,).
+        """
+        models = {}
+        for name, degree in MODEL_DEGREES.items():
+            coefs = self.polynomial_regression(degree)
+            models[name] = self._report(coefs, self.polynomial_values(coefs))
+        a, b = self.exponential_regression()
+        models["Экспоненциальная"] = self._report(
+            np.stack((a, b), axis=1), self.exponential_values(a, b)
+        )
+        a, b = self.power_regression()
+        models["Степенная"] = self._report(
+            np.stack((a, b), axis=1), self.power_values(a, b)
+        )
+        return models
+
+    def _report(self, coefs, y_model):
+        rmse, mare, r2, _, _ = self.calculate_errors(y_model)
+        k = coefs.shape[1]
+        sig, F = self.model_significance(r2, k)
+        return dict(coefs=coefs, rmse=rmse, mare=mare, r2=r2, F=F, sig=sig)
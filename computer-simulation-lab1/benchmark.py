@@ -0,0 +1,284 @@
+"""
+Замеры времени и памяти расчётов лабораторной работы №1 на синтетических
+данных размера n = 10² … 10⁸.
+
+Каждый размер считается в отдельном процессе, поэтому пиковый объём
+резидентной памяти (peak RSS) относится только к нему. Данные больше
+MEMMAP_THRESHOLD точек создаются поблочно в файлах .npy во временном
+каталоге и открываются через np.memmap, как при загрузке больших файлов.
+Результаты записываются в JSON; --compare печатает отношение времени
+к прошлому запуску (например, на другом коммите).
+
+Пример:
+    python benchmark.py --max-size 1e6 --out before.json
+    python benchmark.py --max-size 1e6 --out after.json --compare before.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from analysis import RegressionAnalysis
+from data_io import BLOCK_SIZE
+from models import ExponentialModel, PolynomialModel, PowerModel
+from plotting import draw_models, prepare_plot_data
+from profiling import Profiler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [10**k for k in range(2, 9)]
+MEMMAP_THRESHOLD = 10**7
+# calculate_errors принимает готовый массив прогноза на все точки;
+# для больших n замеряется только поблочный calculate_model_errors.
+ARRAY_ERRORS_LIMIT = 10**7
+
+FITS = [
+    ("linear_regression", PolynomialModel),
+    ("quadratic_regression", PolynomialModel),
+    ("cubic_regression", PolynomialModel),
+    ("exponential_regression", ExponentialModel),
+    ("power_regression", PowerModel),
+]
+NLS_FITS = [
+    ("exponential_regression_nls", ExponentialModel),
+    ("power_regression_nls", PowerModel),
+]
+
+
+def peak_rss_mb():
+    """Пиковый объём резидентной памяти процесса, МБ (None без resource)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает КБ, macOS — байты.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_data(n, seed=0, directory=None):
+    """
+    Синтетические данные y = 2 + 0.5x - 0.03x² + шум, x ∈ [1, 10].
+
+    Args:
+        n (int): число точек.
+        seed (int): зерно генератора.
+        directory (str | None): каталог для файлов .npy; если задан,
+            данные пишутся поблочно и возвращаются как np.memmap.
+
+    Returns:
+        tuple: (x, y).
+    """
+    rng = np.random.default_rng(seed)
+    if directory is None:
+        x = rng.uniform(1, 10, n)
+        return x, 2 + 0.5 * x - 0.03 * x**2 + rng.normal(0, 0.2, n)
+    x_out = np.lib.format.open_memmap(
+        os.path.join(directory, "x.npy"), "w+", np.float64, (n,)
+    )
+    y_out = np.lib.format.open_memmap(
+        os.path.join(directory, "y.npy"), "w+", np.float64, (n,)
+    )
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        x = rng.uniform(1, 10, stop - start)
+        x_out[start:stop] = x
+        y_out[start:stop] = 2 + 0.5 * x - 0.03 * x**2 + rng.normal(0, 0.2, x.size)
+    x_out.flush()
+    y_out.flush()
+    del x_out, y_out
+    return (
+        np.load(os.path.join(directory, "x.npy"), mmap_mode="r"),
+        np.load(os.path.join(directory, "y.npy"), mmap_mode="r"),
+    )
+
+
+def plot_results(analysis, models):
+    """Данные графика и отрисовка всех моделей на холсте Agg."""
+    figure = Figure(figsize=(12, 8))
+    canvas = FigureCanvasAgg(figure)
+    draw_models(figure, analysis, models, prepare_plot_data(analysis))
+    canvas.draw()
+
+
+def measure(analysis, nonlinear=False):
+    """
+    Один проход замеров по готовому анализу.
+
+    Returns:
+        dict: {этап: секунды}.
+    """
+    profiler = Profiler()
+    n = analysis.n
+    with profiler.stage("calculate_basic_stats", n):
+        analysis.calculate_basic_stats()
+    models = {}
+    for name, cls in FITS + (NLS_FITS if nonlinear else []):
+        with profiler.stage(name, n):
+            models[name] = cls(getattr(analysis, name)())
+    for m in models.values():
+        with profiler.stage("calculate_model_errors", n):
+            analysis.calculate_model_errors(m.predict)
+        if n <= ARRAY_ERRORS_LIMIT:
+            y_model = m.predict(analysis.x)
+            with profiler.stage("calculate_errors", n):
+                analysis.calculate_errors(y_model)
+            del y_model
+    plotted = {name: models[name] for name, _ in FITS}
+    with profiler.stage("plot_results", n):
+        plot_results(analysis, plotted)
+    return {name: entry["seconds"] for name, entry in profiler.stages.items()}
+
+
+def run_size(n, repeat=3, seed=0, nonlinear=False):
+    """
+    Замеры для одного размера данных (выполняется в отдельном процессе).
+
+    Время каждого этапа — минимум по repeat повторам.
+
+    Returns:
+        dict: n, stages {этап: секунды}, baseline_rss_mb (после импортов)
+        и peak_rss_mb.
+    """
+    baseline = peak_rss_mb()
+    directory = tempfile.mkdtemp(prefix="lab1-bench-") if n > MEMMAP_THRESHOLD else None
+    try:
+        x, y = synthetic_data(n, seed, directory)
+        stages = {}
+        for _ in range(repeat):
+            for name, seconds in measure(RegressionAnalysis(x, y), nonlinear).items():
+                stages[name] = min(seconds, stages.get(name, seconds))
+        del x, y
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return dict(n=n, stages=stages, baseline_rss_mb=baseline, peak_rss_mb=peak_rss_mb())
+
+
+def environment():
+    """Версии и коммит, к которым относятся замеры."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(
+        commit=commit,
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        python=platform.python_version(),
+        numpy=np.__version__,
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+    )
+
+
+def run_benchmark(sizes, repeat=3, seed=0, nonlinear=False):
+    """
+    Запускает замеры для всех размеров, каждый в новом процессе.
+
+    Yields:
+        dict: результат run_size для очередного размера.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context, max_tasks_per_child=1) as pool:
+        for n in sizes:
+            yield pool.submit(run_size, n, repeat, seed, nonlinear).result()
+
+
+def result_lines(result, previous=None):
+    """
+    Строки сводки по одному размеру; если задан previous (тот же размер
+    из прошлого запуска), к времени добавляется отношение new / old.
+    """
+    rss = result["peak_rss_mb"]
+    lines = [
+        f"n = {result['n']:.0e}"
+        + (f", peak RSS = {rss:.0f} МБ" if rss is not None else "")
+    ]
+    for name, seconds in result["stages"].items():
+        line = f"  {name:<28} {seconds * 1000:12.3f} мс"
+        old = (previous or {}).get("stages", {}).get(name)
+        if old:
+            line += f"  ×{seconds / old:.2f}"
+        lines.append(line)
+    return lines
+
+
+def parse_size(text):
+    return int(float(text))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Замеры времени и памяти расчётов лабораторной работы №1"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [parse_size(s) for s in text.split(",")],
+        default=DEFAULT_SIZES,
+        help="размеры данных через запятую (по умолчанию 1e2,1e3,…,1e8)",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=parse_size,
+        help="не запускать размеры больше заданного",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="число повторов (берётся минимум)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора данных")
+    parser.add_argument(
+        "--nonlinear",
+        action="store_true",
+        help="замерять также нелинейный МНК (exponential/power_regression_nls)",
+    )
+    parser.add_argument(
+        "--out",
+        metavar="PATH",
+        default="benchmark.json",
+        help="файл JSON с результатами (по умолчанию benchmark.json)",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="JSON прошлого запуска для сравнения времени",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [n for n in args.sizes if args.max_size is None or n <= args.max_size]
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = {r["n"]: r for r in json.load(f)["results"]}
+
+    report = dict(environment=environment(), results=[])
+    for result in run_benchmark(sizes, args.repeat, args.seed, args.nonlinear):
+        report["results"].append(result)
+        print("\n".join(result_lines(result, previous.get(result["n"]))), flush=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+import warnings
+
+import numpy as np
+
+from accumulator import linear_from_sums, solve_normal_equations
+from analysis import power_curve, unscale_polynomial
+from batch import MODEL_DEGREES
+from grouped import COUNT, LN_COUNT, LN_SUM, Y_SUM, GroupedRegressionAnalysis
+from nonlinear import EXPONENTIAL, POWER, levenberg_marquardt
+
+MAX_DEGREE = 3
+WEIGHTS_PER_BLOCK = 1 << 22
+JACKKNIFE_LIMIT = 1 << 20
+
+# Столбцы матрицы признаков: t^k (k = 0..6), t^k·y (k = 0..3), затем
+# суммы для экспоненциальной и степенной моделей в формате linear_from_sums.
+_POWER = slice(0, 2 * MAX_DEGREE + 1)
+_CROSS = slice(2 * MAX_DEGREE + 1, 3 * MAX_DEGREE + 2)
+_EXP = slice(3 * MAX_DEGREE + 2, 3 * MAX_DEGREE + 7)
+_POW = slice(3 * MAX_DEGREE + 7, 3 * MAX_DEGREE + 12)
+N_FEATURES = 3 * MAX_DEGREE + 12
+
+# Модели, которые при nonlinear=True строятся нелинейным МНК.
+CURVE_MODELS = {"Экспоненциальная": EXPONENTIAL, "Степенная": POWER}
+
+# Таблица обратной функции распределения Poisson(1) с шагом 2^-16:
+# 16-битное случайное число сразу превращается в вес точки. Строится
+# при первом бутстрепе, чтобы импорт модуля не загружал scipy.
+_poisson_table = None
+
+
+def feature_matrix(x, y, shift, scale):
+    """
+    Строит матрицу вкладов точек в достаточные статистики всех моделей.
+
+    Взвешенная сумма строк матрицы даёт статистики для выборки
+    с повторениями, поэтому любая повторная выборка — это одно
+    матричное произведение весов на эту матрицу.
+    """
+    t = (x - shift) / scale
+    features = np.empty((len(x), N_FEATURES))
+    features[:, _POWER] = np.vander(t, 2 * MAX_DEGREE + 1, increasing=True)
+    features[:, _CROSS] = features[:, : MAX_DEGREE + 1] * y[:, None]
+
+    pos_y = y > 0
+    ln_y = np.log(np.where(pos_y, y, 1.0))
+    features[:, _EXP] = _log_features(pos_y, x, ln_y)
+
+    pos_xy = pos_y & (x > 0)
+    ln_x = np.log(np.where(pos_xy, x, 1.0))
+    features[:, _POW] = _log_features(pos_xy, ln_x, ln_y)
+    return features
+
+
+def _log_features(valid, u, v):
+    w = valid.astype(np.float64)
+    u, v = u * w, v * w
+    return np.column_stack((w, u, u * u, v, u * v))
+
+
+def group_feature_matrix(x, table, shift, scale):
+    """
+    Строит матрицу вкладов групп точек с одинаковым X
+    (строк таблицы GroupedRegressionAnalysis) в достаточные статистики:
+    строка равна сумме строк feature_matrix по точкам группы.
+    """
+    t = (x - shift) / scale
+    count, ln_count, ln_sum = table[:, COUNT], table[:, LN_COUNT], table[:, LN_SUM]
+    features = np.empty((len(x), N_FEATURES))
+    features[:, _POWER] = np.vander(t, 2 * MAX_DEGREE + 1, increasing=True)
+    features[:, _CROSS] = features[:, : MAX_DEGREE + 1] * table[:, Y_SUM, None]
+    features[:, _POWER] *= count[:, None]
+    features[:, _EXP] = _group_log_features(ln_count, x, ln_sum)
+
+    pos_x = x > 0
+    ln_x = np.log(np.where(pos_x, x, 1.0))
+    features[:, _POW] = _group_log_features(ln_count * pos_x, ln_x, ln_sum * pos_x)
+    return features
+
+
+def _group_log_features(count, u, v_sum):
+    cu = count * u
+    return np.column_stack((count, cu, cu * u, v_sum, u * v_sum))
+
+
+def iter_rows(analysis):
+    """
+    Перебирает блоки строк (x, y, table), из которых составляются
+    повторные выборки и блоки перекрёстной проверки.
+
+    Для GroupedRegressionAnalysis строка — целая группа точек
+    с одинаковым X (y — среднее группы, table — строки таблицы групп),
+    для остальных анализов — отдельная точка (table = None).
+    """
+    if isinstance(analysis, GroupedRegressionAnalysis):
+        for x, table in analysis.iter_groups():
+            yield x, table[:, Y_SUM] / table[:, COUNT], table
+    else:
+        for x, y in analysis.iter_blocks():
+            yield x, y, None
+
+
+def all_rows(analysis):
+    """Все строки анализа (x, y, table) сразу, см. iter_rows."""
+    if isinstance(analysis, GroupedRegressionAnalysis):
+        return analysis.x, analysis.y, analysis.table
+    x = np.asarray(analysis.x, dtype=np.float64)
+    return x, np.asarray(analysis.y, dtype=np.float64), None
+
+
+def row_features(x, y, table, shift, scale):
+    """Матрица признаков блока строк из iter_rows или all_rows."""
+    if table is None:
+        return feature_matrix(x, y, shift, scale)
+    return group_feature_matrix(x, table, shift, scale)
+
+
+def fit_from_sums(sums, shift, scale):
+    """
+    Строит все пять семейств моделей для пакета наборов статистик.
+
+    Args:
+        sums (np.ndarray): статистики формы (R, N_FEATURES).
+        shift (float): сдвиг нормировки X.
+        scale (float): масштаб нормировки X.
+
+    Returns:
+        dict: {имя модели: коэффициенты формы (R, k)}.
+    """
+    coefs = {}
+    for name, degree in MODEL_DEGREES.items():
+        c = solve_normal_equations(sums[:, _POWER], sums[:, _CROSS], degree)
+        coefs[name] = unscale_polynomial(c, shift, scale)
+    for name, part in (("Экспоненциальная", _EXP), ("Степенная", _POW)):
+        ln_a, b = linear_from_sums(sums[:, part])
+        coefs[name] = np.column_stack((np.exp(ln_a), b))
+    return coefs
+
+
+def predict(name, coefs, x):
+    """
+    Вычисляет прогнозы модели для пакета коэффициентов.
+
+    Args:
+        name (str): имя семейства моделей.
+        coefs (np.ndarray): коэффициенты формы (R, k).
+        x (np.ndarray): точки прогноза формы (G,).
+
+    Returns:
+        np.ndarray: прогнозы формы (R, G).
+    """
+    if name == "Экспоненциальная":
+        return coefs[:, :1] * np.exp(coefs[:, 1:] * x)
+    if name == "Степенная":
+        x = np.broadcast_to(x, (len(coefs), len(x)))
+        return power_curve(x, coefs[:, :1], coefs[:, 1:])
+    return coefs @ np.vander(x, coefs.shape[1], increasing=True).T
+
+
+def normalization(analysis):
+    """Сдвиг и масштаб, переводящие диапазон X в [-1, 1]."""
+    stats_ = analysis.stats
+    shift = (stats_.x_max + stats_.x_min) / 2
+    scale = (stats_.x_max - stats_.x_min) / 2 or 1.0
+    return shift, scale
+
+
+def bootstrap_sums(analysis, n_resamples=1000, seed=None):
+    """
+    Вычисляет статистики для n_resamples пуассоновских бутстреп-выборок.
+
+    Вес каждой точки в каждой выборке ~ Poisson(1); веса генерируются
+    поблочно, поэтому данные проходятся один раз при ограниченной памяти.
+    Веса берутся из таблицы квантилей по 16-битным случайным числам:
+    это в несколько раз быстрее Generator.poisson, а погрешность
+    вероятностей не превышает 2^-16.
+
+    Для GroupedRegressionAnalysis вес получает целая группа точек
+    с одинаковым X (бутстреп по группам).
+
+    Returns:
+        np.ndarray: статистики формы (n_resamples, N_FEATURES).
+    """
+    rng = np.random.default_rng(seed)
+    shift, scale = normalization(analysis)
+    block = max(1, WEIGHTS_PER_BLOCK // n_resamples)
+    sums = np.zeros((n_resamples, N_FEATURES))
+    for x, y, table in iter_rows(analysis):
+        for start in range(0, len(x), block):
+            part = slice(start, start + block)
+            features = row_features(
+                x[part], y[part], None if table is None else table[part], shift, scale
+            )
+            sums += _poisson_weights(rng, n_resamples, len(features)) @ features
+    return sums
+
+
+def _poisson_weights(rng, rows, cols):
+    global _poisson_table
+    if _poisson_table is None:
+        from scipy import stats
+
+        _poisson_table = stats.poisson.ppf((np.arange(1 << 16) + 0.5) / (1 << 16), 1.0)
+    size = rows * cols
+    raw = rng.bit_generator.random_raw(-(-size // 4)).view(np.uint16)
+    return _poisson_table[raw[:size].reshape(rows, cols)]
+
+
+def jackknife_sums(analysis):
+    """
+    Вычисляет статистики всех выборок без одной точки
+    (для GroupedRegressionAnalysis — без одной группы):
+    из общих сумм вычитается вклад каждой строки.
+
+    Returns:
+        np.ndarray: статистики формы (число строк, N_FEATURES).
+    """
+    rows = len(analysis.x)
+    if rows > JACKKNIFE_LIMIT:
+        raise ValueError(
+            f"Складной нож требует не более {JACKKNIFE_LIMIT} строк, получено {rows}"
+        )
+    shift, scale = normalization(analysis)
+    features = row_features(*all_rows(analysis), shift, scale)
+    return features.sum(axis=0) - features
+
+
+def curve_seeds(coefs, analysis):
+    """
+    Начальные параметры пакетного метода Левенберга — Марквардта
+    из лог-линейных оценок формы (S, 2); неопределённые оценки
+    заменяются константой y = ȳ, как в RegressionAnalysis._nls_seed.
+    """
+    p0 = np.array(coefs, dtype=np.float64)
+    p0[~np.isfinite(p0).all(axis=1)] = (analysis.y_mean, 0.0)
+    return p0
+
+
+def curve_block(x, y, table, weights):
+    """
+    Блок (x, y, w) пакетной задачи levenberg_marquardt для строк
+    из iter_rows: ряд s — выборка с весами строк weights[s].
+
+    Для групп вес умножается на число точек группы, а y — среднее группы,
+    поэтому сумма квадратов совпадает с суммой по исходным точкам
+    с точностью до постоянного внутригруппового слагаемого.
+    """
+    if table is not None:
+        weights = weights * table[:, COUNT]
+    shape = weights.shape
+    return np.broadcast_to(x, shape), np.broadcast_to(y, shape), np.sqrt(weights)
+
+
+def bootstrap_curves(analysis, seeds, n_resamples, seed_sequence):
+    """
+    Оценки нелинейного МНК экспоненциальной и степенной моделей
+    для тех же пуассоновских выборок, что и bootstrap_sums
+    с тем же seed_sequence.
+
+    Все выборки решаются одним пакетным методом Левенберга — Марквардта;
+    веса не хранятся, а генерируются заново на каждом проходе по данным.
+
+    Args:
+        seeds (dict): лог-линейные оценки выборок (fit_from_sums) —
+            начальные параметры.
+
+    Returns:
+        dict: {имя модели: коэффициенты формы (n_resamples, 2)}.
+    """
+    block = max(1, WEIGHTS_PER_BLOCK // n_resamples)
+
+    def blocks():
+        rng = np.random.default_rng(seed_sequence)
+        for x, y, table in iter_rows(analysis):
+            for start in range(0, len(x), block):
+                part = slice(start, start + block)
+                weights = _poisson_weights(rng, n_resamples, len(x[part]))
+                yield curve_block(
+                    x[part], y[part], None if table is None else table[part], weights
+                )
+
+    return {
+        name: levenberg_marquardt(model, blocks, curve_seeds(seeds[name], analysis))[0]
+        for name, model in CURVE_MODELS.items()
+    }
+
+
+def jackknife_curves(analysis, estimates):
+    """
+    Оценки нелинейного МНК без одной строки в одношаговом приближении
+    Гаусса — Ньютона от оценки p̂ по всем данным:
+    p₋ᵢ = p̂ − A⁻¹Jᵢ·cᵢrᵢ / (1 − cᵢJᵢᵀA⁻¹Jᵢ), где A = Σ cⱼJⱼJⱼᵀ,
+    rᵢ — остаток, cᵢ — вес строки (число точек группы).
+
+    Returns:
+        dict: {имя модели: коэффициенты формы (число строк, 2)}.
+    """
+    x, y, table = all_rows(analysis)
+    count = np.ones(len(x)) if table is None else table[:, COUNT]
+    result = {}
+    for name, model in CURVE_MODELS.items():
+        p = np.asarray(estimates[name], dtype=np.float64)[None]
+        resid = y - model.func(x[None], p)[0]
+        jac = model.jacobian(x[None], p)[0]
+        u = jac @ np.linalg.pinv((jac * count[:, None]).T @ jac)
+        leverage = count * np.einsum("ij,ij->i", u, jac)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[name] = p - u * (count * resid / (1 - leverage))[:, None]
+    return result
+
+
+def confidence_intervals(
+    analysis,
+    method="bootstrap",
+    n_resamples=1000,
+    confidence=0.95,
+    grid_points=101,
+    seed=None,
+    nonlinear=False,
+):
+    """
+    Оценивает доверительные интервалы коэффициентов и прогнозов всех моделей.
+
+    Все повторные выборки обрабатываются пакетно: статистики выборок
+    получаются матричным произведением, а модели строятся одним
+    векторизованным решением для всех выборок сразу.
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        method (str): "bootstrap" (процентильный интервал) или
+            "jackknife" (интервал по стандартной ошибке складного ножа).
+        n_resamples (int): число бутстреп-выборок.
+        confidence (float): доверительная вероятность.
+        grid_points (int): число точек сетки X для интервалов прогноза.
+        seed (int | None): зерно генератора случайных чисел.
+        nonlinear (bool): экспоненциальная и степенная модели — оценки
+            нелинейного МНК, как в отчёте с pipeline.iter_models(nonlinear=True):
+            бутстреп решает каждую выборку методом Левенберга — Марквардта,
+            складной нож — одношаговым приближением (jackknife_curves).
+
+    Returns:
+        dict: method, confidence, x (сетка прогноза) и models —
+        {имя модели: dict(coef, coef_low, coef_high, pred, pred_low,
+        pred_high)}.
+    """
+    shift, scale = normalization(analysis)
+    seed_sequence = np.random.SeedSequence(seed)
+    if method == "bootstrap":
+        replicates = bootstrap_sums(analysis, n_resamples, seed_sequence)
+    elif method == "jackknife":
+        replicates = jackknife_sums(analysis)
+    else:
+        raise ValueError(f"Неизвестный метод: {method}")
+
+    fitted = fit_from_sums(replicates, shift, scale)
+    estimates = point_estimates(analysis, nonlinear)
+    if nonlinear and method == "bootstrap":
+        fitted.update(bootstrap_curves(analysis, fitted, n_resamples, seed_sequence))
+    elif nonlinear:
+        fitted.update(jackknife_curves(analysis, estimates))
+    grid = np.linspace(analysis.stats.x_min, analysis.stats.x_max, grid_points)
+    alpha = 1 - confidence
+
+    result = dict(method=method, confidence=confidence, x=grid, models={})
+    for name, coef in estimates.items():
+        pred = predict(name, coef[None, :], grid)[0]
+        coef_low, coef_high = _interval(fitted[name], coef, method, alpha)
+        pred_low, pred_high = _interval(
+            predict(name, fitted[name], grid), pred, method, alpha
+        )
+        result["models"][name] = dict(
+            coef=coef,
+            coef_low=coef_low,
+            coef_high=coef_high,
+            pred=pred,
+            pred_low=pred_low,
+            pred_high=pred_high,
+        )
+    return result
+
+
+def point_estimates(analysis, nonlinear=False):
+    """Коэффициенты моделей по полной выборке, как в основном отчёте."""
+    if nonlinear:
+        exponential = analysis.exponential_regression_nls()
+        power = analysis.power_regression_nls()
+    else:
+        exponential = analysis.exponential_regression()
+        power = analysis.power_regression()
+    return {
+        "Линейная": np.array(analysis.polynomial_regression(1)),
+        "Квадратичная": np.array(analysis.polynomial_regression(2)),
+        "Кубическая": np.array(analysis.polynomial_regression(3)),
+        "Экспоненциальная": np.array(exponential),
+        "Степенная": np.array(power),
+    }
+
+
+def _interval(replicates, estimate, method, alpha):
+    from scipy import special
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # Столбцы без единой конечной оценки дают NaN без предупреждений.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        # Вырожденные повторные оценки (лог-модель без допустимых точек,
+        # группа с рычагом 1) исключаются, а не портят весь интервал.
+        finite = np.isfinite(replicates)
+        replicates = np.where(finite, replicates, np.nan)
+        if method == "bootstrap":
+            low, high = np.nanpercentile(
+                replicates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0
+            )
+            return low, high
+        n = finite.sum(axis=0)
+        deviation = replicates - np.nanmean(replicates, axis=0)
+        se = np.sqrt((n - 1) / n * np.nansum(deviation**2, axis=0))
+        t = special.stdtrit(np.maximum(n - 1, 1), 1 - alpha / 2)
+        return estimate - t * se, estimate + t * se
+
+
+def interval_lines(intervals):
+    """Текст блока доверительных интервалов коэффициентов построчно."""
+    title = "Бутстреп" if intervals["method"] == "bootstrap" else "Складной нож"
+    lines = [
+        f"Доверительные интервалы коэффициентов ({title}, "
+        f"{intervals['confidence']:.0%}):"
+    ]
+    for name, ci in intervals["models"].items():
+        bounds = ", ".join(
+            f"{c:.4f} [{lo:.4f}; {hi:.4f}]"
+            for c, lo, hi in zip(ci["coef"], ci["coef_low"], ci["coef_high"])
+        )
+        lines.append(f"{name}: {bounds}")
+    return lines
+
+
+def intervals_to_dict(intervals):
+    """Преобразует результат confidence_intervals в структуру для JSON."""
+    return dict(
+        method=intervals["method"],
+        confidence=intervals["confidence"],
+        x=intervals["x"].tolist(),
+        models={
+            name: {key: np.asarray(value).tolist() for key, value in ci.items()}
+            for name, ci in intervals["models"].items()
+        },
+    )
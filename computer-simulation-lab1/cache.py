@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import tempfile
+import weakref
+import zipfile
+
+import numpy as np
+
+from accumulator import PowerSumAccumulator
+from grouped import GroupedRegressionAnalysis
+from models import FittedModel
+
+CACHE_VERSION = 3
+DEFAULT_MAX_BYTES = 256 << 20
+HASH_BLOCK_BYTES = 1 << 24
+
+# Хеши данных вычисляются один раз на объект анализа: данные
+# после загрузки не меняются.
+_data_hashes = weakref.WeakKeyDictionary()
+
+
+def default_directory():
+    """Каталог кеша: $LAB1_CACHE_DIR или ~/.cache/lab1."""
+    return os.environ.get("LAB1_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "lab1"
+    )
+
+
+def data_hash(analysis):
+    """
+    Хеш содержимого данных анализа (BLAKE2b по блокам байтов массивов).
+
+    Для np.memmap в память попадает только текущий блок.
+
+    Returns:
+        str: шестнадцатеричный хеш.
+    """
+    cached = _data_hashes.get(analysis)
+    if cached is not None:
+        return cached
+    if isinstance(analysis, GroupedRegressionAnalysis):
+        arrays = (analysis.x, analysis.table)
+    else:
+        arrays = (analysis.x, analysis.y)
+    h = hashlib.blake2b(type(analysis).__name__.encode(), digest_size=20)
+    for a in arrays:
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        rows = max(1, HASH_BLOCK_BYTES // max(1, a.itemsize * a[:1].size))
+        for start in range(0, len(a), rows):
+            h.update(np.ascontiguousarray(a[start : start + rows]).data)
+    result = h.hexdigest()
+    _data_hashes[analysis] = result
+    return result
+
+
+class ResultCache:
+    """
+    Дисковый кеш результатов анализа.
+
+    Запись — файл .npz с коэффициентами и метриками моделей,
+    корреляцией, перекрёстной проверкой, статистиками данных
+    (PowerSumAccumulator), доверительными интервалами и подготовленными
+    данными графика. Ключ — хеш содержимого данных и параметров
+    анализа, поэтому одна запись используется и окном приложения,
+    и консольным запуском. Когда суммарный размер записей превышает
+    max_bytes, удаляются давно не использованные (LRU по времени
+    изменения файла, которое обновляется при каждом чтении).
+
+    Ошибки чтения и записи кеша не прерывают анализ: повреждённая
+    запись удаляется и считается отсутствующей.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str | None): каталог кеша; по умолчанию
+                default_directory().
+            max_bytes (int): наибольший суммарный размер записей.
+        """
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+
+    def key(self, analysis, **config):
+        """
+        Ключ записи для данных анализа и параметров расчёта.
+
+        Args:
+            analysis (RegressionAnalysis): анализ.
+            **config: параметры, от которых зависит результат
+                (nonlinear, intervals и т. п.), сериализуемые в JSON.
+
+        Returns:
+            str: ключ записи.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{CACHE_VERSION}:{data_hash(analysis)}:".encode())
+        h.update(json.dumps(config, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def load(self, key, analysis=None):
+        """
+        Читает запись.
+
+        Args:
+            key (str): ключ записи.
+            analysis (RegressionAnalysis | None): если задан и его
+                статистики ещё не вычислены, они восстанавливаются из записи.
+
+        Returns:
+            dict | None: отчёт в формате pipeline.run_analysis (с ключами
+            intervals и plot_data, если они были сохранены) или None.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                report, stats = _unpack(data)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self._remove(path)
+            return None
+        if analysis is not None and analysis.stats is None:
+            analysis.use_stats(stats)
+        return report
+
+    def store(self, key, analysis, report):
+        """
+        Сохраняет отчёт и статистики анализа, затем удаляет давно
+        не использованные записи сверх max_bytes.
+        """
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **_pack(report, analysis.stats))
+            os.replace(tmp, self.path(key))
+            self._evict(keep=key)
+        except OSError:
+            if tmp is not None:
+                self._remove(tmp)
+
+    def _evict(self, keep=None):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".npz"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != self.path(keep):
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        """Удаляет все записи кеша."""
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _pack(report, stats):
+    names = list(report["models"])
+    meta = dict(
+        correlation={
+            key: value if isinstance(value, str) else float(value)
+            for key, value in report["correlation"].items()
+        },
+        models=names,
+        cv=report.get("cv"),
+        best=report["best"],
+    )
+    arrays = {f"stats.{key}": value for key, value in stats.state().items()}
+    for i, name in enumerate(names):
+        model_bytes = report["models"][name].to_bytes()
+        arrays[f"model.{i}"] = np.frombuffer(model_bytes, dtype=np.uint8)
+
+    intervals = report.get("intervals")
+    if intervals is not None:
+        meta["intervals"] = dict(
+            method=intervals["method"],
+            confidence=intervals["confidence"],
+            models=list(intervals["models"]),
+        )
+        arrays["intervals.x"] = intervals["x"]
+        for i, ci in enumerate(intervals["models"].values()):
+            for field, value in ci.items():
+                arrays[f"intervals.{i}.{field}"] = np.asarray(value)
+
+    plot_data = report.get("plot_data")
+    if plot_data is not None:
+        meta["plot_mode"] = plot_data["mode"]
+        for field, value in plot_data.items():
+            if field != "mode":
+                arrays[f"plot.{field}"] = value
+
+    arrays["meta"] = np.array(json.dumps(meta, ensure_ascii=False))
+    return arrays
+
+
+def _unpack(data):
+    meta = json.loads(str(data["meta"]))
+    state = {
+        key[len("stats.") :]: data[key]
+        for key in data.files
+        if key.startswith("stats.")
+    }
+    correlation = meta["correlation"]
+    correlation["sig"] = bool(correlation["sig"])
+    report = dict(
+        correlation=correlation,
+        models={
+            name: FittedModel.from_bytes(data[f"model.{i}"].tobytes())
+            for i, name in enumerate(meta["models"])
+        },
+        cv=meta["cv"],
+        best=meta["best"],
+    )
+
+    if "intervals" in meta:
+        info = meta["intervals"]
+        prefix = "intervals.{}."
+        report["intervals"] = dict(
+            method=info["method"],
+            confidence=info["confidence"],
+            x=data["intervals.x"],
+            models={
+                name: {
+                    key[len(prefix.format(i)) :]: data[key]
+                    for key in data.files
+                    if key.startswith(prefix.format(i))
+                }
+                for i, name in enumerate(info["models"])
+            },
+        )
+
+    if "plot_mode" in meta:
+        plot_data = dict(mode=meta["plot_mode"])
+        for key in data.files:
+            if key.startswith("plot."):
+                plot_data[key[len("plot.") :]] = data[key]
+        report["plot_data"] = plot_data
+    return report, PowerSumAccumulator.from_state(state)
@@ -0,0 +1,458 @@
+"""
+Консольный запуск анализа лабораторной работы №1 без графического интерфейса.
+
+Qt не импортируется вовсе, matplotlib — только при запросе графиков (--plot),
+модули интервалов, множественной регрессии и матрицы корреляций (и scipy) —
+только при соответствующих флагах.
+
+Пример:
+    python cli.py data.csv --json report.json --csv models.csv --plot models.png
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from analysis import RegressionAnalysis
+from cache import ResultCache
+from grouped import GroupedRegressionAnalysis
+from models import save_models
+from parallel import (
+    BATCH_COLUMNS,
+    find_datasets,
+    iter_datasets,
+    summary_row,
+    summary_to_dict,
+)
+from pipeline import (
+    REPORT_COLUMNS,
+    multivariate_model,
+    report_to_dict,
+    run_analysis,
+    table_row,
+)
+from profiling import NULL_PROFILER, Profiler
+from progressive import (
+    TOLERANCE,
+    applies,
+    iter_refinements,
+    sample_lines,
+    sample_report,
+)
+from rolling import rolling_regression, save_rolling
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Корреляционный и регрессионный анализ (лабораторная работа №1)"
+    )
+    parser.add_argument(
+        "data",
+        nargs="?",
+        help="CSV- или .npy-файл с двумя столбцами X, Y (по умолчанию — данные варианта)",
+    )
+    parser.add_argument("--json", metavar="PATH", help="записать отчёт в JSON")
+    parser.add_argument("--csv", metavar="PATH", help="записать таблицу моделей в CSV")
+    parser.add_argument(
+        "--models",
+        metavar="PATH",
+        help="сохранить построенные модели в двоичный файл (models.load_models)",
+    )
+    parser.add_argument(
+        "--plot", metavar="PATH", help="сохранить графики моделей (PNG, PDF, SVG)"
+    )
+    parser.add_argument(
+        "--render-mode",
+        choices=["auto", "scatter", "density", "envelope"],
+        default="auto",
+        help="отображение точек данных на графиках",
+    )
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="хранить X, Y в float32 (вдвое меньше памяти; суммы считаются в float64)",
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="сжать повторяющиеся X в группы и строить модели по группам",
+    )
+    parser.add_argument(
+        "--nonlinear",
+        action="store_true",
+        help="строить экспоненциальную и степенную модели нелинейным МНК",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        metavar="N",
+        type=int,
+        default=0,
+        help="оценить доверительные интервалы по N бутстреп-выборкам",
+    )
+    parser.add_argument(
+        "--jackknife",
+        action="store_true",
+        help="оценить доверительные интервалы методом складного ножа",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="доверительная вероятность интервалов (по умолчанию 0.95)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="зерно генератора для бутстрепа и подвыборок --progressive",
+    )
+    parser.add_argument(
+        "--progressive",
+        action="store_true",
+        help="для больших данных строить модели по растущим случайным подвыборкам "
+        "и остановиться, когда оценки перестанут меняться",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="допуск изменения кривых моделей для --progressive в долях СКО Y "
+        f"(по умолчанию {TOLERANCE})",
+    )
+    parser.add_argument(
+        "--multivariate",
+        metavar="PATH",
+        help="построить множественную регрессию по таблице (столбцы X..., Y)",
+    )
+    parser.add_argument(
+        "--target",
+        type=int,
+        default=-1,
+        help="номер столбца Y в таблице --multivariate (по умолчанию последний)",
+    )
+    parser.add_argument(
+        "--correlation",
+        metavar="PATH",
+        help="матрица корреляций всех столбцов таблицы (CSV или .npy) "
+        "с t-статистиками и p-уровнями",
+    )
+    parser.add_argument(
+        "--heatmap",
+        metavar="PATH",
+        help="сохранить тепловую карту матрицы --correlation (PNG, PDF, SVG)",
+    )
+    parser.add_argument(
+        "--solver",
+        choices=["cholesky", "qr"],
+        default="cholesky",
+        help="метод решения для множественной регрессии",
+    )
+    parser.add_argument(
+        "--rolling",
+        metavar="W",
+        type=int,
+        help="построить модели на каждом положении скользящего окна ширины W",
+    )
+    parser.add_argument(
+        "--rolling-out",
+        metavar="PATH",
+        default="rolling.npz",
+        help="файл .npz для результатов скользящего окна (по умолчанию rolling.npz)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="каталог кеша результатов (по умолчанию $LAB1_CACHE_DIR или ~/.cache/lab1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="не использовать кеш результатов",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help="проанализировать все наборы данных каталога в пуле процессов "
+        "(--json и --csv получают сводную таблицу)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="DIR",
+        help="экспортировать отчёт (с --batch — отчёт каждого набора и index.html) "
+        "в каталог DIR",
+    )
+    parser.add_argument(
+        "--formats",
+        default="html,png,pdf",
+        help="форматы --export через запятую: html, png, pdf (по умолчанию все)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="число процессов для --batch (по умолчанию число ядер)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="записать время этапов анализа и счётчики точек в JSON",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="добавить в --profile профиль cProfile",
+    )
+    args = parser.parse_args(argv)
+    if args.heatmap and not args.correlation:
+        parser.error("--heatmap требует --correlation")
+    return args
+
+
+def json_report(report):
+    result = report_to_dict(report)
+    if "intervals" in report:
+        from bootstrap import intervals_to_dict
+
+        result["intervals"] = intervals_to_dict(report["intervals"])
+    if "correlation_matrix" in report:
+        result["correlation_matrix"] = report["correlation_matrix"].to_dict()
+    return result
+
+
+def write_json(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(json_report(report), f, ensure_ascii=False, indent=2)
+
+
+def write_csv(report, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        for name, m in report["models"].items():
+            writer.writerow(table_row(name, m))
+        if "multivariate" in report:
+            name, m, _ = report["multivariate"]
+            writer.writerow(table_row(name, m))
+
+
+def save_plot(analysis, report, path):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from plotting import draw_models
+
+    figure = Figure(figsize=(12, 8))
+    FigureCanvasAgg(figure)
+    draw_models(figure, analysis, report["models"], report["plot_data"])
+    figure.savefig(path)
+
+
+def save_heatmap(corr, path):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from plotting import draw_correlation
+
+    figure = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figure)
+    draw_correlation(figure, corr)
+    figure.savefig(path)
+
+
+def analyze(analysis, args, cache=None, profiler=NULL_PROFILER):
+    """
+    Выполняет анализ или берёт его результат из кеша.
+
+    С --progressive большие данные сначала анализируются по подвыборкам;
+    если оценки сошлись, возвращается отчёт по подвыборке (с ключом
+    sample) и не кешируется.
+
+    Returns:
+        tuple: (отчёт, ключ записи кеша или None).
+    """
+    intervals = None
+    if args.bootstrap or args.jackknife:
+        from bootstrap import confidence_intervals
+
+        intervals = dict(
+            method="jackknife" if args.jackknife else "bootstrap",
+            n_resamples=args.bootstrap or 1000,
+            confidence=args.confidence,
+            seed=args.seed,
+        )
+    if args.progressive and applies(analysis):
+        for step in iter_refinements(
+            analysis, args.nonlinear, args.tolerance, seed=args.seed, profiler=profiler
+        ):
+            sys.stderr.write("; ".join(sample_lines(step)) + "\n")
+        if step["converged"]:
+            report = sample_report(step, args.nonlinear, profiler)
+            if intervals is not None:
+                with profiler.stage("Доверительные интервалы", step["n"]):
+                    report["intervals"] = confidence_intervals(
+                        step["analysis"], nonlinear=args.nonlinear, **intervals
+                    )
+            return report, None
+    key = None
+    if cache is not None:
+        with profiler.stage("Чтение кеша"):
+            key = cache.key(analysis, nonlinear=args.nonlinear, intervals=intervals)
+            report = cache.load(key, analysis)
+        if report is not None:
+            profiler.count("Попадания в кеш")
+            return report, key
+    with profiler.stage("Базовые статистики", len(analysis.x)):
+        analysis.calculate_basic_stats()
+    report = run_analysis(analysis, args.nonlinear, profiler)
+    if intervals is not None:
+        with profiler.stage("Доверительные интервалы", len(analysis.x)):
+            report["intervals"] = confidence_intervals(
+                analysis, nonlinear=args.nonlinear, **intervals
+            )
+    if key is not None:
+        with profiler.stage("Запись кеша"):
+            cache.store(key, analysis, report)
+    return report, key
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch:
+        run_batch(args)
+        return
+    profiler = Profiler(args.cprofile) if args.profile else NULL_PROFILER
+    with profiler.capture():
+        run(args, profiler)
+    if args.profile:
+        profiler.save_json(args.profile)
+
+
+def export_formats(args):
+    return [name.strip().lower() for name in args.formats.split(",") if name.strip()]
+
+
+def run_batch(args):
+    """
+    Анализирует каталог args.batch и записывает сводную таблицу;
+    с --export также отчёт каждого набора и index.html.
+    """
+    paths = find_datasets(args.batch)
+    options = dict(
+        nonlinear=args.nonlinear,
+        aggregate=args.aggregate,
+        dtype=np.float32 if args.float32 else np.float64,
+        cache_dir=None if args.no_cache else ResultCache(args.cache_dir).directory,
+    )
+    if args.export:
+        from export import export_dataset
+
+        os.makedirs(args.export, exist_ok=True)
+        options.update(
+            task=export_dataset,
+            out_dir=args.export,
+            formats=export_formats(args),
+            render_mode=args.render_mode,
+        )
+    results = []
+    for result in iter_datasets(paths, args.workers, **options):
+        results.append(result)
+        sys.stderr.write(f"[{len(results)}/{len(paths)}] {result['name']}\n")
+    results.sort(key=lambda result: result["path"])
+    if args.export:
+        from export import write_index
+
+        write_index(results, args.export)
+
+    summary = [summary_to_dict(result) for result in results]
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(BATCH_COLUMNS)
+            writer.writerows(summary_row(result) for result in results)
+    if not (args.json or args.csv):
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+
+
+def run(args, profiler=NULL_PROFILER):
+    dtype = np.float32 if args.float32 else np.float64
+    with profiler.stage("Загрузка данных"):
+        if args.data:
+            analysis = RegressionAnalysis.from_file(args.data, dtype=dtype)
+        else:
+            analysis = RegressionAnalysis()
+    profiler.count("Загружено точек", len(analysis.x))
+    points = analysis
+    if args.aggregate:
+        with profiler.stage("Сжатие повторов X", len(points.x)):
+            analysis = GroupedRegressionAnalysis.from_analysis(points)
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    report, key = analyze(analysis, args, cache, profiler)
+    if "sample" in report:
+        analysis = report["sample"]["analysis"]
+    if args.plot:
+        from plotting import prepare_plot_data, resolve_mode
+
+        mode = resolve_mode(analysis, args.render_mode)
+        plot_data = report.get("plot_data")
+        if plot_data is None or plot_data["mode"] != mode:
+            with profiler.stage("Данные графика", len(analysis.x)):
+                report["plot_data"] = prepare_plot_data(analysis, mode)
+            if key is not None:
+                cache.store(key, analysis, report)
+    if args.multivariate:
+        from multivariate import MultivariateRegression
+
+        mv = MultivariateRegression.from_file(
+            args.multivariate, args.target, dtype=dtype
+        )
+        with profiler.stage("Множественная регрессия", mv.n):
+            mv.calculate_basic_stats()
+            name, m = multivariate_model(mv, args.solver)
+        report["multivariate"] = (name, m, mv.names)
+    if args.correlation:
+        from correlation import CorrelationMatrix
+
+        corr = CorrelationMatrix.from_file(args.correlation, dtype=dtype)
+        with profiler.stage("Корреляционная матрица", corr.n):
+            report["correlation_matrix"] = corr.calculate()
+
+    if args.json:
+        write_json(report, args.json)
+    if args.csv:
+        write_csv(report, args.csv)
+    if args.models:
+        save_models(report["models"], args.models)
+    if args.rolling:
+        save_rolling(
+            rolling_regression(points.x, points.y, args.rolling), args.rolling_out
+        )
+    if args.plot:
+        with profiler.stage("Отрисовка графиков"):
+            save_plot(analysis, report, args.plot)
+    if args.heatmap:
+        save_heatmap(report["correlation_matrix"], args.heatmap)
+    if args.export:
+        from export import write_report
+
+        os.makedirs(args.export, exist_ok=True)
+        name = os.path.splitext(os.path.basename(args.data or "variant"))[0]
+        write_report(
+            analysis,
+            report,
+            os.path.join(args.export, name),
+            export_formats(args),
+            args.render_mode,
+        )
+    if not (args.json or args.csv):
+        json.dump(json_report(report), sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import numpy as np
+
+from data_io import BLOCK_SIZE, iter_blocks, load_table
+
+
+def centered_gram(blocks, n):
+    """
+    Средние столбцов и центрированная матрица ZᵀZ за один проход по блокам.
+
+    Данные сдвигаются на средние первого блока, чтобы суммы
+    произведений не теряли точность на больших смещениях;
+    поправка к точным средним вносится после прохода.
+
+    Args:
+        blocks (iterable[np.ndarray]): блоки строк Z формы (m, k), float64.
+        n (int): общее число строк.
+
+    Returns:
+        tuple: (means, gram) — массивы формы (k,) и (k, k).
+    """
+    gram = total = pivot = None
+    for Z in blocks:
+        if pivot is None:
+            pivot = Z.mean(axis=0)
+            gram = np.zeros((Z.shape[1], Z.shape[1]))
+            total = np.zeros(Z.shape[1])
+        Z = Z - pivot
+        gram += Z.T @ Z
+        total += Z.sum(axis=0)
+    delta = total / n
+    return pivot + delta, gram - n * np.outer(delta, delta)
+
+
+def correlation_test(r, n, alpha=0.05):
+    """
+    Проверяет значимость коэффициентов корреляции по t-критерию
+    Стьюдента с n - 2 степенями свободы.
+
+    Args:
+        r (float | np.ndarray): коэффициенты корреляции.
+        n (int): число наблюдений.
+        alpha (float): уровень значимости.
+
+    Returns:
+        tuple: (is_significant, t, p) — значимость, t-статистика |t|
+        и двусторонний p-уровень той же формы, что r.
+    """
+    from scipy import special
+
+    df = n - 2
+    r = np.abs(np.asarray(r, dtype=np.float64))
+    if df <= 0:
+        return np.zeros(r.shape, dtype=bool), np.zeros_like(r), np.ones_like(r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(r >= 1, np.inf, r * np.sqrt(df / (1 - r**2)))
+    # Функция распределения Стьюдента из scipy.special: scipy.stats
+    # импортируется больше секунды, а тест выполняется при каждом анализе.
+    p = 2 * special.stdtr(df, -t)
+    return p < alpha, t, p
+
+
+class CorrelationMatrix:
+    """
+    Матрица корреляций Пирсона всех пар столбцов таблицы.
+
+    Таблица обрабатывается блоками строк (np.memmap любой длины):
+    за один проход накапливается центрированная матрица ZᵀZ размера
+    k × k, из которой получаются все k·(k - 1)/2 коэффициентов сразу.
+    Значимость каждого коэффициента проверяется по t-критерию
+    с точным p-уровнем для фактического n.
+    """
+
+    def __init__(self, data, names=None, block_size=BLOCK_SIZE):
+        """
+        Args:
+            data (array_like): таблица формы (n, k).
+            names (list[str] | None): имена столбцов.
+            block_size (int): наибольшее число элементов в блоке;
+                число строк блока равно block_size // k.
+        """
+        self.data = (
+            data if isinstance(data, np.ndarray) else np.asarray(data, np.float64)
+        )
+        if self.data.ndim != 2 or self.data.shape[1] < 2:
+            raise ValueError(
+                f"Ожидалась таблица хотя бы из двух столбцов, получена {self.data.shape}"
+            )
+        self.n, self.k = self.data.shape
+        self.names = list(names) if names else [f"x{i + 1}" for i in range(self.k)]
+        self.block_rows = max(1, block_size // self.k)
+        self.r = None
+
+    @classmethod
+    def from_file(cls, path, block_size=BLOCK_SIZE, dtype=np.float64):
+        """
+        Создаёт анализ по таблице из CSV- или .npy-файла (через np.memmap).
+
+        Returns:
+            CorrelationMatrix: анализ всех столбцов файла.
+        """
+        data, names = load_table(path, dtype)
+        return cls(data, names, block_size)
+
+    def calculate(self, alpha=0.05):
+        """
+        Вычисляет матрицы коэффициентов r, t-статистик t, p-уровней
+        p_values и значимости significant (все формы k × k).
+
+        Для столбцов с нулевой дисперсией коэффициенты равны NaN.
+        """
+        blocks = (Z for (Z,) in iter_blocks(self.data, block_size=self.block_rows))
+        self.means, gram = centered_gram(blocks, self.n)
+        std = np.sqrt(np.clip(np.diagonal(gram), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = gram / np.outer(std, std)
+        r = np.clip(r, -1, 1)
+        np.fill_diagonal(r, np.where(std > 0, 1.0, np.nan))
+        self.r = r
+        self.significant, self.t, self.p_values = correlation_test(r, self.n, alpha)
+        self.significant &= np.isfinite(r)
+        return self
+
+    def pairs(self, top=None, only_significant=False):
+        """
+        Пары столбцов по убыванию |r|.
+
+        Args:
+            top (int | None): наибольшее число пар.
+            only_significant (bool): только значимые пары.
+
+        Returns:
+            list[tuple]: (имя i, имя j, r, t, p).
+        """
+        i, j = np.triu_indices(self.k, 1)
+        keep = np.isfinite(self.r[i, j])
+        if only_significant:
+            keep &= self.significant[i, j]
+        i, j = i[keep], j[keep]
+        order = np.argsort(-np.abs(self.r[i, j]), kind="stable")[:top]
+        return [
+            (
+                self.names[a],
+                self.names[b],
+                float(self.r[a, b]),
+                float(self.t[a, b]),
+                float(self.p_values[a, b]),
+            )
+            for a, b in zip(i[order], j[order])
+        ]
+
+    def lines(self, top=10):
+        """Текст сводки по матрице корреляций построчно."""
+        i, j = np.triu_indices(self.k, 1)
+        lines = [
+            f"n = {self.n}, столбцов: {self.k}, пар: {len(i)}, "
+            f"значимых: {int(self.significant[i, j].sum())}",
+            f"Наиболее сильные связи (до {top}):",
+        ]
+        lines += [
+            f"  {a} — {b}: r = {r:.4f}, t = {t:.3f}, p = {p:.3g}"
+            for a, b, r, t, p in self.pairs(top)
+        ]
+        return lines
+
+    def to_dict(self):
+        """Матрицы в виде, пригодном для JSON (NaN заменяются на None)."""
+
+        def matrix(values):
+            return [
+                [float(v) if np.isfinite(v) else None for v in row] for row in values
+            ]
+
+        return dict(
+            n=int(self.n),
+            names=self.names,
+            r=matrix(self.r),
+            t=matrix(self.t),
+            p=matrix(self.p_values),
+        )
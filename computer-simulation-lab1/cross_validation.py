@@ -0,0 +1,197 @@
+import numpy as np
+
+from analysis import power_curve
+from bootstrap import (
+    CURVE_MODELS,
+    JACKKNIFE_LIMIT,
+    N_FEATURES,
+    WEIGHTS_PER_BLOCK,
+    all_rows,
+    curve_block,
+    curve_seeds,
+    fit_from_sums,
+    iter_rows,
+    normalization,
+    row_features,
+)
+from grouped import COUNT, Y_M2
+from nonlinear import levenberg_marquardt
+
+CV_FOLDS = 10
+LOO_LIMIT = 1000
+
+
+def evaluate(name, coefs, x):
+    """
+    Вычисляет значения модели, у которой в каждой точке свои коэффициенты.
+
+    Args:
+        name (str): имя семейства моделей.
+        coefs (np.ndarray): коэффициенты формы (m, k) — по строке на точку.
+        x (np.ndarray): значения X формы (m,).
+
+    Returns:
+        np.ndarray: значения модели формы (m,).
+    """
+    if name == "Экспоненциальная":
+        return coefs[:, 0] * np.exp(coefs[:, 1] * x)
+    if name == "Степенная":
+        return power_curve(x, coefs[:, 0], coefs[:, 1])
+    result = np.zeros_like(x)
+    for c in coefs.T[::-1]:
+        result = result * x + c
+    return result
+
+
+def cross_validate(analysis, folds=None, seed=0, nonlinear=False):
+    """
+    Оценивает ошибку всех моделей на отложенных данных перекрёстной проверкой.
+
+    Модели для обучающих частей не перестраиваются по исходным данным:
+    достаточные статистики каждого блока (fold) вычитаются из общих сумм,
+    и модели всех блоков получаются одним пакетным решением. Второй проход
+    по данным считает ошибку каждой точки по модели без её блока.
+
+    Для GroupedRegressionAnalysis блоки составляются из целых групп
+    точек с одинаковым X, и LOO исключает по одной группе.
+
+    При nonlinear=True экспоненциальная и степенная модели обучающих
+    частей строятся нелинейным МНК, как в отчёте: все части решаются
+    одним пакетным методом Левенберга — Марквардта (fit_curves).
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        folds (int | None): число блоков; None — скользящий контроль
+            с исключением по одной точке (LOO) при n ≤ LOO_LIMIT,
+            иначе CV_FOLDS блоков. При folds ≥ n выполняется LOO
+            (n — число точек или групп).
+        seed (int | None): зерно случайного разбиения на блоки.
+        nonlinear (bool): см. pipeline.iter_models.
+
+    Returns:
+        dict: method ("loo" или "kfold"), folds, rmse
+        ({имя модели: СКО на отложенных данных}) и best.
+    """
+    rows = len(analysis.x)
+    if folds is None:
+        folds = rows if rows <= LOO_LIMIT else CV_FOLDS
+    if folds < 2:
+        raise ValueError("Для перекрёстной проверки нужно не менее двух блоков")
+    if folds >= rows:
+        sse = _leave_one_out(analysis, nonlinear)
+        method, folds = "loo", rows
+    else:
+        sse = _k_fold(analysis, folds, np.random.SeedSequence(seed), nonlinear)
+        method = "kfold"
+    rmse = {name: float(np.sqrt(value / analysis.n)) for name, value in sse.items()}
+    best = min(rmse, key=lambda name: rmse[name] if np.isfinite(rmse[name]) else np.inf)
+    return dict(method=method, folds=folds, rmse=rmse, best=best)
+
+
+def _squared_error(y, y_model, table):
+    """Σ(y - f)² по исходным точкам строк (групп, если задана table)."""
+    resid = y - y_model
+    if table is None:
+        return float(resid @ resid)
+    return float(table[:, Y_M2].sum() + table[:, COUNT] @ (resid * resid))
+
+
+def _leave_one_out(analysis, nonlinear):
+    rows = len(analysis.x)
+    if rows > JACKKNIFE_LIMIT:
+        raise ValueError(
+            f"Скользящий контроль LOO требует не более {JACKKNIFE_LIMIT} строк, "
+            f"получено {rows}"
+        )
+    shift, scale = normalization(analysis)
+    x, y, table = all_rows(analysis)
+    features = row_features(x, y, table, shift, scale)
+    coefs = fit_from_sums(features.sum(axis=0) - features, shift, scale)
+    if nonlinear:
+        coefs.update(fit_curves(analysis, rows, _running_labels, coefs))
+    return {
+        name: _squared_error(y, evaluate(name, c, x), table)
+        for name, c in coefs.items()
+    }
+
+
+def _k_fold(analysis, folds, seed_sequence, nonlinear):
+    shift, scale = normalization(analysis)
+    blocks = np.arange(folds)[:, None]
+
+    # Разбиение на блоки не хранится: оба прохода получают одинаковые
+    # метки из генераторов с одним и тем же SeedSequence.
+    rng = np.random.default_rng(seed_sequence)
+    sums = np.zeros((folds, N_FEATURES))
+    for x, y, table in iter_rows(analysis):
+        labels = rng.integers(0, folds, len(x))
+        sums += (labels == blocks).astype(np.float64) @ row_features(
+            x, y, table, shift, scale
+        )
+    coefs = fit_from_sums(sums.sum(axis=0) - sums, shift, scale)
+    if nonlinear:
+
+        def labels():
+            rng = np.random.default_rng(seed_sequence)
+            return lambda size: rng.integers(0, folds, size)
+
+        coefs.update(fit_curves(analysis, folds, labels, coefs))
+
+    rng = np.random.default_rng(seed_sequence)
+    sse = dict.fromkeys(coefs, 0.0)
+    for x, y, table in iter_rows(analysis):
+        labels = rng.integers(0, folds, len(x))
+        for name, c in coefs.items():
+            sse[name] += _squared_error(y, evaluate(name, c[labels], x), table)
+    return sse
+
+
+def fit_curves(analysis, folds, labels, seeds):
+    """
+    Строит экспоненциальную и степенную модели нелинейным МНК сразу
+    для всех обучающих частей: ряд f пакетной задачи Левенберга — Марквардта
+    — все строки, кроме строк блока f.
+
+    Args:
+        analysis (RegressionAnalysis): анализ.
+        folds (int): число блоков.
+        labels (callable): вызывается в начале каждого прохода по данным
+            и возвращает функцию size -> метки блоков очередных size строк
+            iter_rows; метки должны повторяться от прохода к проходу.
+        seeds (dict): лог-линейные оценки частей (fit_from_sums) —
+            начальные параметры.
+
+    Returns:
+        dict: {имя модели: коэффициенты формы (folds, 2)}.
+    """
+    step = max(1, WEIGHTS_PER_BLOCK // folds)
+    fold_ids = np.arange(folds)[:, None]
+
+    def blocks():
+        next_labels = labels()
+        for x, y, table in iter_rows(analysis):
+            block_labels = next_labels(len(x))
+            for start in range(0, len(x), step):
+                part = slice(start, start + step)
+                weights = (block_labels[part] != fold_ids).astype(np.float64)
+                yield curve_block(
+                    x[part], y[part], None if table is None else table[part], weights
+                )
+
+    return {
+        name: levenberg_marquardt(model, blocks, curve_seeds(seeds[name], analysis))[0]
+        for name, model in CURVE_MODELS.items()
+    }
+
+
+def _running_labels():
+    # LOO: блок строки — её номер.
+    offset = 0
+
+    def next_labels(size):
+        nonlocal offset
+        offset += size
+        return np.arange(offset - size, offset)
+
+    return next_labels
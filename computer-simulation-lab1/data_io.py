@@ -0,0 +1,196 @@
+import os
+import tempfile
+import weakref
+from itertools import islice
+
+import numpy as np
+
+BLOCK_SIZE = 1 << 20
+CSV_CHUNK_ROWS = 1 << 18
+
+
+def iter_blocks(*arrays, block_size=BLOCK_SIZE):
+    """
+    Разбивает массивы одинаковой длины на блоки фиксированного размера.
+
+    Для np.memmap в память попадает только текущий блок.
+
+    Args:
+        *arrays (np.ndarray): массивы одинаковой длины.
+        block_size (int): число элементов в блоке.
+
+    Yields:
+        tuple: блоки всех массивов, приведённые к float64.
+    """
+    n = len(arrays[0])
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        yield tuple(np.asarray(a[start:stop], dtype=np.float64) for a in arrays)
+
+
+def _detect_delimiter(line):
+    for delimiter in (";", "\t", ","):
+        if delimiter in line:
+            return delimiter
+    return None
+
+
+def _is_header(line, delimiter):
+    try:
+        float(line.split(delimiter)[0])
+    except ValueError:
+        return True
+    return False
+
+
+def read_csv_chunks(path, chunk_rows=CSV_CHUNK_ROWS, usecols=(0, 1)):
+    """
+    Читает CSV-файл блоками строк.
+
+    Разделитель (';', табуляция, ',' или пробелы) определяется
+    по первой строке, строка заголовка пропускается.
+
+    Args:
+        path (str): путь к файлу.
+        chunk_rows (int): число строк в блоке.
+        usecols (tuple[int] | None): номера читаемых столбцов
+            (None — все столбцы).
+
+    Yields:
+        np.ndarray: блок формы (rows, len(usecols)).
+    """
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+        delimiter = _detect_delimiter(first)
+        pending = [] if _is_header(first, delimiter) else [first]
+        while True:
+            raw = pending + list(islice(f, chunk_rows - len(pending)))
+            pending = []
+            if not raw:
+                return
+            lines = [line for line in raw if line.strip()]
+            if lines:
+                yield np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2)
+
+
+def csv_to_memmap(
+    path, out_path=None, chunk_rows=CSV_CHUNK_ROWS, usecols=(0, 1), dtype=np.float64
+):
+    """
+    Переносит CSV-файл в бинарный файл и открывает его через np.memmap.
+
+    Файл читается блоками, поэтому потребление памяти не зависит
+    от его размера.
+
+    Args:
+        path (str): путь к CSV-файлу.
+        out_path (str | None): путь к бинарному файлу; по умолчанию —
+            временный файл, который удаляется, как только массив
+            становится не нужен.
+        chunk_rows (int): число строк в блоке.
+        usecols (tuple[int] | None): номера читаемых столбцов.
+        dtype (np.dtype): тип хранения (float64 или float32).
+
+    Returns:
+        np.memmap: массив формы (n, число столбцов).
+    """
+    dtype = np.dtype(dtype)
+    temporary = out_path is None
+    if temporary:
+        fd, out_path = tempfile.mkstemp(suffix=f".f{dtype.itemsize * 8}")
+        os.close(fd)
+    try:
+        rows, cols = 0, None
+        with open(out_path, "wb") as out:
+            for chunk in read_csv_chunks(path, chunk_rows, usecols):
+                cols = chunk.shape[1]
+                out.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+                rows += len(chunk)
+        if rows == 0:
+            raise ValueError(f"В файле {path} нет данных")
+        data = np.memmap(out_path, dtype=dtype, mode="r", shape=(rows, cols))
+    except BaseException:
+        if temporary:
+            _remove(out_path)
+        raise
+    if temporary:
+        # В POSIX открытый файл можно удалить сразу: данные остаются
+        # доступны через отображение до его закрытия. Если удалить
+        # нельзя (Windows), файл удаляется вместе с массивом.
+        try:
+            os.remove(out_path)
+        except OSError:
+            weakref.finalize(data, _remove, out_path)
+    return data
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def load_npy(path):
+    """
+    Открывает .npy-файл через np.memmap без чтения в память.
+
+    Args:
+        path (str): путь к файлу формы (n, 2) или (2, n).
+
+    Returns:
+        tuple: (x, y) — представления memmap-массива.
+    """
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 2 or 2 not in data.shape:
+        raise ValueError(
+            f"Ожидался массив формы (n, 2) или (2, n), получен {data.shape}"
+        )
+    if data.shape[1] == 2:
+        return data[:, 0], data[:, 1]
+    return data[0], data[1]
+
+
+def load_dataset(path, dtype=np.float64):
+    """
+    Загружает пару X, Y из CSV- или .npy-файла с ограниченным расходом памяти.
+
+    Args:
+        path (str): путь к файлу.
+        dtype (np.dtype): тип хранения CSV-данных; .npy-файл открывается
+            в собственном типе.
+
+    Returns:
+        tuple: (x, y) — массивы на основе np.memmap.
+    """
+    if os.path.splitext(path)[1].lower() == ".npy":
+        return load_npy(path)
+    data = csv_to_memmap(path, dtype=dtype)
+    return data[:, 0], data[:, 1]
+
+
+def load_table(path, dtype=np.float64):
+    """
+    Загружает многостолбцовую таблицу из CSV- или .npy-файла через np.memmap.
+
+    Args:
+        path (str): путь к файлу.
+        dtype (np.dtype): тип хранения CSV-данных; .npy-файл открывается
+            в собственном типе.
+
+    Returns:
+        tuple: (data, names) — массив формы (n, число столбцов) и имена
+        столбцов из строки заголовка CSV (None, если заголовка нет).
+    """
+    if os.path.splitext(path)[1].lower() == ".npy":
+        data = np.load(path, mmap_mode="r")
+        if data.ndim != 2:
+            raise ValueError(f"Ожидался двумерный массив, получен {data.shape}")
+        return data, None
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+    delimiter = _detect_delimiter(first)
+    names = None
+    if _is_header(first, delimiter):
+        names = [name.strip() for name in first.strip().split(delimiter)]
+    return csv_to_memmap(path, usecols=None, dtype=dtype), names
@@ -0,0 +1,241 @@
+"""
+Экспорт отчёта лабораторной работы №1 в HTML, PNG и PDF без окна
+приложения (matplotlib Agg, Qt не импортируется).
+
+Пакет наборов данных экспортируется в пуле процессов
+(parallel.iter_datasets с задачей export_dataset): каждый процесс
+загружает набор, строит модели и рисует свои графики, поэтому время
+экспорта сокращается пропорционально числу ядер.
+"""
+
+import base64
+import html
+import io
+import os
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from bootstrap import interval_lines
+from parallel import BATCH_COLUMNS, load_and_analyze, summary_row
+from pipeline import REPORT_COLUMNS, correlation_lines, summary_lines, table_row
+from plotting import draw_models, prepare_plot_data, resolve_mode
+from progressive import sample_lines
+
+FORMATS = ("html", "png", "pdf")
+FIGURE_SIZE = (12, 8)
+PAGE_SIZE = (11.69, 8.27)
+DPI = 100
+
+_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+th { background: #e0e0e0; }
+pre { background: #fdfdfd; border: 1px solid #ccc; padding: 6px; }
+img { max-width: 100%; }
+"""
+
+
+def render_models(analysis, report, render_mode="auto"):
+    """
+    Рисует графики всех моделей отчёта на фигуре Agg.
+
+    Данные графика берутся из report["plot_data"], если они подготовлены
+    для того же режима, иначе вычисляются заново.
+
+    Returns:
+        matplotlib.figure.Figure: фигура с холстом FigureCanvasAgg.
+    """
+    plot_data = report.get("plot_data")
+    mode = resolve_mode(analysis, render_mode)
+    if plot_data is None or plot_data["mode"] != mode:
+        plot_data = prepare_plot_data(analysis, mode)
+    figure = Figure(figsize=FIGURE_SIZE, dpi=DPI)
+    FigureCanvasAgg(figure)
+    draw_models(figure, analysis, report["models"], plot_data)
+    return figure
+
+
+def report_lines(report):
+    """
+    Returns:
+        tuple: (строки блока корреляции, строки блока выводов).
+    """
+    summary = summary_lines(report["models"], report.get("cv"))
+    if "intervals" in report:
+        summary += [""] + interval_lines(report["intervals"])
+    if "sample" in report:
+        summary += [""] + sample_lines(report["sample"])
+    return correlation_lines(report["correlation"]), summary
+
+
+def _html_table(columns, rows):
+    head = "".join(f"<th>{html.escape(c)}</th>" for c in columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def _html_page(title, body):
+    return (
+        '<!DOCTYPE html>\n<html lang="ru"><head><meta charset="utf-8">'
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head>"
+        f"<body><h1>{html.escape(title)}</h1>{body}</body></html>\n"
+    )
+
+
+def write_html(path, title, report, png):
+    """
+    Записывает отчёт одной страницей HTML; графики встраиваются
+    в страницу (data URI), поэтому файл самодостаточен.
+
+    Args:
+        path (str): путь к файлу.
+        title (str): заголовок отчёта.
+        report (dict): отчёт run_analysis.
+        png (bytes): изображение графиков моделей.
+    """
+    corr, summary = report_lines(report)
+    rows = [
+        [html.escape(cell) for cell in table_row(name, m)]
+        for name, m in report["models"].items()
+    ]
+    image = base64.b64encode(png).decode("ascii")
+    body = (
+        "<h2>Корреляционный анализ</h2>"
+        f"<pre>{html.escape(chr(10).join(corr))}</pre>"
+        "<h2>Регрессионный анализ</h2>"
+        + _html_table(REPORT_COLUMNS, rows)
+        + "<h2>Выводы</h2>"
+        f"<pre>{html.escape(chr(10).join(summary))}</pre>"
+        "<h2>Графики</h2>"
+        f'<img src="data:image/png;base64,{image}" alt="Графики моделей">'
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_html_page(title, body))
+
+
+def write_pdf(path, title, report, figure):
+    """
+    Записывает отчёт в PDF: первая страница — корреляция, таблица
+    моделей и выводы, вторая — графики моделей.
+    """
+    corr, summary = report_lines(report)
+    page = Figure(figsize=PAGE_SIZE, dpi=DPI)
+    FigureCanvasAgg(page)
+    page.suptitle(title, fontsize=14)
+    page.text(0.04, 0.9, "\n".join(corr), va="top", family="monospace", fontsize=9)
+    ax = page.add_axes([0.04, 0.45, 0.92, 0.35])
+    ax.axis("off")
+    table = ax.table(
+        cellText=[table_row(name, m) for name, m in report["models"].items()],
+        colLabels=REPORT_COLUMNS,
+        loc="upper center",
+        cellLoc="left",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(7)
+    table.auto_set_column_width(range(len(REPORT_COLUMNS)))
+    page.text(0.04, 0.62, "\n".join(summary), va="top", family="monospace", fontsize=8)
+    with PdfPages(path) as pdf:
+        pdf.savefig(page)
+        pdf.savefig(figure)
+
+
+def write_report(analysis, report, stem, formats=FORMATS, render_mode="auto"):
+    """
+    Экспортирует отчёт по одному набору данных.
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными статистиками.
+        report (dict): отчёт run_analysis.
+        stem (str): путь к файлам без расширения.
+        formats (iterable[str]): подмножество FORMATS.
+        render_mode (str): режим отображения точек (см. prepare_plot_data).
+
+    Returns:
+        list[str]: пути к записанным файлам.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Неизвестные форматы: {', '.join(sorted(unknown))}")
+    title = os.path.basename(stem)
+    figure = render_models(analysis, report, render_mode)
+    files = []
+    png = None
+    if "png" in formats or "html" in formats:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png")
+        png = buffer.getvalue()
+    if "png" in formats:
+        files.append(f"{stem}.png")
+        with open(files[-1], "wb") as f:
+            f.write(png)
+    if "html" in formats:
+        files.append(f"{stem}.html")
+        write_html(files[-1], title, report, png)
+    if "pdf" in formats:
+        files.append(f"{stem}.pdf")
+        write_pdf(files[-1], title, report, figure)
+    return files
+
+
+def export_dataset(path, out_dir, formats=FORMATS, render_mode="auto", **options):
+    """
+    Анализирует набор данных и экспортирует его отчёт в out_dir.
+
+    Выполняется в процессе пула (parallel.iter_datasets); данные графиков
+    в возвращаемый отчёт не попадают.
+
+    Args:
+        path (str): путь к файлу с двумя столбцами X, Y.
+        out_dir (str): каталог для файлов отчёта.
+        formats (iterable[str]): подмножество FORMATS.
+        render_mode (str): режим отображения точек.
+        **options: параметры parallel.load_and_analyze.
+
+    Returns:
+        dict: как parallel.analyze_dataset, плюс files — записанные файлы.
+    """
+    start = time.perf_counter()
+    analysis, report = load_and_analyze(path, **options)
+    stem = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0])
+    files = write_report(analysis, report, stem, formats, render_mode)
+    report.pop("plot_data", None)
+    return dict(
+        path=path,
+        name=os.path.basename(path),
+        n=analysis.n,
+        report=report,
+        files=files,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def write_index(results, out_dir):
+    """
+    Записывает out_dir/index.html — сводную таблицу пакета со ссылками
+    на отчёты наборов данных.
+
+    Returns:
+        str: путь к index.html.
+    """
+    rows = []
+    for result in results:
+        row = [html.escape(cell) for cell in summary_row(result)]
+        links = [
+            f'<a href="{html.escape(os.path.relpath(f, out_dir))}">'
+            f"{html.escape(os.path.splitext(f)[1][1:].upper())}</a>"
+            for f in result.get("files", [])
+        ]
+        rows.append(row + [" ".join(links)])
+    path = os.path.join(out_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            _html_page("Пакетный анализ", _html_table(BATCH_COLUMNS + ["Отчёт"], rows))
+        )
+    return path
@@ -0,0 +1,207 @@
+import math
+
+import numpy as np
+
+from accumulator import PowerSumAccumulator
+from analysis import RegressionAnalysis
+from data_io import BLOCK_SIZE, iter_blocks, load_dataset
+
+# Столбцы таблицы групп: число точек, ΣY, Σ(Y - Ȳгруппы)², число точек
+# с y > 0, Σln y и Σ(ln y)² по этим точкам, наименьший и наибольший Y.
+N_COLUMNS = 8
+COUNT, Y_SUM, Y_M2, LN_COUNT, LN_SUM, LN_SQ, Y_MIN, Y_MAX = range(N_COLUMNS)
+
+
+def aggregate(x, y, block_size=BLOCK_SIZE):
+    """
+    Сжимает точки (x, y) до групп с одинаковым X.
+
+    Данные проходятся один раз поблочно; таблицы групп блоков
+    объединяются, как только их суммарный размер достигает размера
+    уже сжатой таблицы, поэтому память и время объединения
+    определяются числом различных X, а не числом точек.
+    Разброс Y внутри группы хранится как сумма квадратов отклонений
+    от среднего группы и объединяется по формуле Чана, без вычитания
+    больших близких чисел.
+
+    Args:
+        x (array_like): значения X (можно np.memmap).
+        y (array_like): значения Y.
+        block_size (int): число точек в блоке.
+
+    Returns:
+        tuple: (keys, table) — различные X по возрастанию и таблица
+        групп формы (G, N_COLUMNS).
+    """
+    keys, table = np.empty(0), np.empty((0, N_COLUMNS))
+    pending, pending_rows = [], 0
+    for xb, yb in iter_blocks(x, y, block_size=block_size):
+        pending.append(_reduce(xb, _point_table(yb)))
+        pending_rows += len(pending[-1][0])
+        if pending_rows >= len(keys):
+            keys, table = _merge([(keys, table)] + pending)
+            pending, pending_rows = [], 0
+    return _merge([(keys, table)] + pending)
+
+
+def _point_table(y):
+    pos = y > 0
+    ln_y = np.log(np.where(pos, y, 1.0)) * pos
+    table = np.zeros((len(y), N_COLUMNS))
+    table[:, COUNT] = 1.0
+    table[:, Y_SUM] = y
+    table[:, LN_COUNT] = pos
+    table[:, LN_SUM] = ln_y
+    table[:, LN_SQ] = ln_y * ln_y
+    table[:, Y_MIN] = y
+    table[:, Y_MAX] = y
+    return table
+
+
+def _merge(parts):
+    keys = np.concatenate([k for k, _ in parts])
+    table = np.concatenate([t for _, t in parts])
+    return _reduce(keys, table)
+
+
+def _reduce(keys, table):
+    """Объединяет строки таблицы с одинаковыми ключами."""
+    if len(keys) == 0:
+        return keys, table
+    order = np.argsort(keys, kind="stable")
+    keys, table = keys[order], table[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    result = np.empty((len(starts), N_COLUMNS))
+    result[:, COUNT : LN_SQ + 1] = np.add.reduceat(table[:, COUNT : LN_SQ + 1], starts)
+    result[:, Y_MIN] = np.minimum.reduceat(table[:, Y_MIN], starts)
+    result[:, Y_MAX] = np.maximum.reduceat(table[:, Y_MAX], starts)
+    # Σ(y - ȳ)² объединённой группы = Σ M2ᵢ + Σ cᵢ·(ȳᵢ - ȳ)².
+    mean = result[:, Y_SUM] / result[:, COUNT]
+    sizes = np.diff(np.append(starts, len(keys)))
+    dev = table[:, Y_SUM] / table[:, COUNT] - np.repeat(mean, sizes)
+    result[:, Y_M2] = np.add.reduceat(
+        table[:, Y_M2] + table[:, COUNT] * dev * dev, starts
+    )
+    return keys[starts], result
+
+
+class GroupedRegressionAnalysis(RegressionAnalysis):
+    """
+    Регрессионный анализ по данным, сжатым до различных значений X.
+
+    Группа точек с одинаковым X хранится одной строкой таблицы
+    (см. aggregate), и все расчёты идут по группам во взвешенной форме,
+    поэтому их стоимость определяется числом различных X:
+    степенные суммы, коэффициенты моделей, СКО и R² совпадают
+    с расчётом по исходным точкам, а МНК через QR и нелинейный МНК
+    решаются по средним групп с весами, равными числу точек.
+
+    Относительная ошибка (MARE) не вычисляется и равна NaN: она требует
+    отношений |остаток / y| отдельных точек, которые после сжатия
+    недоступны, а по средним групп получилась бы другая величина.
+
+    self.x — различные X по возрастанию, self.y — средние Y групп,
+    self.n — исходное число точек, self.groups — число групп.
+    """
+
+    def __init__(self, keys, table, block_size=BLOCK_SIZE):
+        """
+        Args:
+            keys (array_like): различные значения X.
+            table (array_like): таблица групп формы (G, N_COLUMNS).
+            block_size (int): число групп в блоке обработки.
+        """
+        self.table = np.asarray(table, dtype=np.float64)
+        self.counts = self.table[:, COUNT]
+        super().__init__(keys, self.table[:, Y_SUM] / self.counts, block_size)
+        self.groups = len(self.x)
+        self.n = int(round(self.counts.sum()))
+
+    @classmethod
+    def from_arrays(cls, x, y, block_size=BLOCK_SIZE):
+        """Сжимает массивы x, y (можно np.memmap) и создаёт анализ."""
+        return cls(*aggregate(x, y, block_size), block_size)
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        """Создаёт сжатый анализ по данным обычного RegressionAnalysis."""
+        return cls.from_arrays(analysis.x, analysis.y, analysis.block_size)
+
+    @classmethod
+    def from_file(cls, path, block_size=BLOCK_SIZE, dtype=np.float64):
+        """
+        Загружает X, Y из CSV- или .npy-файла и сжимает их по X.
+
+        Args:
+            path (str): путь к файлу с двумя столбцами X, Y.
+            block_size (int): размер блока обработки.
+            dtype (np.dtype): тип хранения CSV-данных до сжатия.
+
+        Returns:
+            GroupedRegressionAnalysis: анализ сжатых данных.
+        """
+        x, y = load_dataset(path, dtype)
+        return cls.from_arrays(x, y, block_size)
+
+    def iter_groups(self, *arrays):
+        """Перебирает блоки (x, строки таблицы групп, *arrays)."""
+        return iter_blocks(self.x, self.table, *arrays, block_size=self.block_size)
+
+    def _accumulate(self):
+        stats = PowerSumAccumulator(self.MAX_DEGREE)
+        for x, t in self.iter_groups():
+            count, y_sum = t[:, COUNT], t[:, Y_SUM]
+            stats.update_groups(
+                x,
+                count,
+                y_sum,
+                t[:, Y_M2] + y_sum * y_sum / count,
+                t[:, LN_COUNT : LN_SQ + 1],
+                t[:, Y_MIN],
+                t[:, Y_MAX],
+            )
+        return stats
+
+    def _least_squares_blocks(self):
+        # Σ(y - f)² по точкам группы = M2 + c·(ȳ - f)², поэтому задача
+        # по средним групп с весами c имеет то же решение.
+        for x, t in self.iter_groups():
+            yield x, t[:, Y_SUM] / t[:, COUNT], np.sqrt(t[:, COUNT])
+
+    def calculate_errors(self, y_model):
+        """
+        Вычисляет ошибки аппроксимации модели.
+
+        Args:
+            y_model (array_like): значения модели в точках self.x
+                (по одному на группу).
+
+        Returns:
+            tuple: (rmse, mare, r2, ss_res, ss_tot).
+        """
+        y_model = np.broadcast_to(np.asarray(y_model, dtype=np.float64), self.x.shape)
+        return self._group_errors((t, y_m) for _, t, y_m in self.iter_groups(y_model))
+
+    def calculate_model_errors(self, func):
+        """
+        Вычисляет ошибки аппроксимации модели, заданной векторизованной
+        функцией, по одному её значению на группу.
+
+        Returns:
+            tuple: (rmse, mare, r2, ss_res, ss_tot).
+        """
+        return self._group_errors((t, func(x)) for x, t in self.iter_groups())
+
+    def _group_errors(self, pairs):
+        ss_res = ss_tot = 0.0
+        for t, y_model in pairs:
+            c, m2 = t[:, COUNT], t[:, Y_M2]
+            mean = t[:, Y_SUM] / c
+            resid = mean - y_model
+            dev = mean - self.y_mean
+            ss_res += float(m2.sum() + c @ (resid * resid))
+            ss_tot += float(m2.sum() + c @ (dev * dev))
+        rmse = math.sqrt(ss_res / self.n)
+        mare = math.nan
+        r2 = 1 - ss_res / ss_tot if ss_tot != 0 else 0
+        return rmse, mare, r2, ss_res, ss_tot
@@ -1,28 +1,98 @@
-import math
 from PyQt5.QtWidgets import (
     QMainWindow,
+    QFileDialog,
+    QMessageBox,
     QWidget,
     QVBoxLayout,
     QPushButton,
     QTextEdit,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QHeaderView,
+    QLineEdit,
+    QCheckBox,
     QTabWidget,
     QHBoxLayout,
     QLabel,
+    QProgressBar,
+    QComboBox,
+    QSpinBox,
+    QScrollArea,
+    QTableWidget,
+    QTableWidgetItem,
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, QThread
+import os
+
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 from analysis import RegressionAnalysis
+from bootstrap import interval_lines
+from cache import ResultCache
+from correlation import CorrelationMatrix
+from export import FORMATS, export_dataset, write_index, write_report
+from grouped import GroupedRegressionAnalysis
+from multivariate import MultivariateRegression
+from parallel import BATCH_COLUMNS, find_datasets, summary_row
+from pipeline import (
+    best_models,
+    correlation_lines,
+    multivariate_lines,
+    summary_lines,
+)
+from plotting import draw_correlation, prepare_plot_data
 from plot_widget import PlotWidget
+from profiling import Profiler
+from progressive import sample_lines
+from report_model import ReportTableModel
+from worker import (
+    AnalysisWorker,
+    BatchWorker,
+    CorrelationWorker,
+    MultivariateWorker,
+)
+
+
+RENDER_MODES = [
+    ("Авто", "auto"),
+    ("Точки", "scatter"),
+    ("Плотность", "density"),
+    ("Огибающая min/max", "envelope"),
+]
+
+
+class NumericItem(QTableWidgetItem):
+    """Ячейка, сортируемая по числовому значению текста (пустые — в конце)."""
+
+    def __lt__(self, other):
+        try:
+            return float(self.text() or "inf") < float(other.text() or "inf")
+        except ValueError:
+            return super().__lt__(other)
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.analysis = RegressionAnalysis()
-        self.analysis.calculate_basic_stats()
+        # Анализ, по статистикам которого построены показанные модели:
+        # self.analysis или подвыборка прогрессивного анализа.
+        self.shown_analysis = self.analysis
         self.models = {}
+        self.report = None
+        self.cache = ResultCache()
+        self.profiler = Profiler()
+        self.plot_data = None
+        self.worker_thread = None
+        self.worker = None
+        self.mv_thread = None
+        self.mv_worker = None
+        self.corr_thread = None
+        self.corr_worker = None
+        self.batch_thread = None
+        self.batch_worker = None
+        self.batch_results = []
+        self.batch_export_dir = None
         self.initUI()
 
     def initUI(self):
@@ -69,7 +139,7 @@ class MainWindow(QMainWindow):
                 font-family: Consolas, monospace;
                 font-size: 11pt;
             }
-            QTableWidget {
+            QTableView {
                 background: #ffffff;
                 gridline-color: #ccc;
                 font-size: 11pt;
@@ -81,11 +151,14 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.tabs)
 
         self.plot_tab, self.report_tab = QWidget(), QWidget()
+        self.batch_tab = QWidget()
         self.tabs.addTab(self.plot_tab, "📊 Графики")
         self.tabs.addTab(self.report_tab, "📑 Отчёт")
+        self.tabs.addTab(self.batch_tab, "🗂 Пакетный анализ")
 
         self.init_plot_tab()
         self.init_report_tab()
+        self.init_batch_tab()
 
     def init_plot_tab(self):
         layout = QVBoxLayout()
@@ -95,6 +168,63 @@ class MainWindow(QMainWindow):
         self.analyze_btn.clicked.connect(self.perform_analysis)
         btn_layout.addWidget(self.analyze_btn, alignment=Qt.AlignLeft)
 
+        self.load_btn = QPushButton("Загрузить данные")
+        self.load_btn.clicked.connect(self.load_data)
+        btn_layout.addWidget(self.load_btn, alignment=Qt.AlignLeft)
+
+        self.export_btn = QPushButton("Экспорт отчёта")
+        self.export_btn.setToolTip("Сохранить отчёт в HTML, PDF или PNG")
+        self.export_btn.clicked.connect(self.export_report)
+        self.export_btn.setEnabled(False)
+        btn_layout.addWidget(self.export_btn, alignment=Qt.AlignLeft)
+
+        self.cancel_btn = QPushButton("Отмена")
+        self.cancel_btn.clicked.connect(self.cancel_analysis)
+        self.cancel_btn.setEnabled(False)
+        btn_layout.addWidget(self.cancel_btn, alignment=Qt.AlignLeft)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        btn_layout.addWidget(self.progress_bar)
+        btn_layout.addStretch()
+
+        self.nonlinear_check = QCheckBox("Нелинейный МНК")
+        self.nonlinear_check.setToolTip(
+            "Экспоненциальная и степенная модели по методу Левенберга — Марквардта"
+        )
+        btn_layout.addWidget(self.nonlinear_check)
+
+        self.float32_check = QCheckBox("float32")
+        self.float32_check.setToolTip(
+            "Хранить загружаемые данные в float32: вдвое меньше памяти,\n"
+            "суммы по-прежнему считаются в float64"
+        )
+        btn_layout.addWidget(self.float32_check)
+
+        self.aggregate_check = QCheckBox("Сжать повторы X")
+        self.aggregate_check.setToolTip(
+            "Объединить точки с одинаковым X в группы при загрузке;\n"
+            "модели строятся по группам с весами"
+        )
+        btn_layout.addWidget(self.aggregate_check)
+
+        self.intervals_check = QCheckBox("Доверительные интервалы (бутстреп)")
+        btn_layout.addWidget(self.intervals_check)
+
+        self.progressive_check = QCheckBox("Прогрессивный анализ")
+        self.progressive_check.setToolTip(
+            "Для больших данных сначала показать модели по случайной подвыборке\n"
+            "и уточнять их по растущим подвыборкам, пока оценки не перестанут меняться"
+        )
+        btn_layout.addWidget(self.progressive_check)
+
+        btn_layout.addWidget(QLabel("Отображение данных:"))
+        self.render_combo = QComboBox()
+        for title, mode in RENDER_MODES:
+            self.render_combo.addItem(title, mode)
+        self.render_combo.currentIndexChanged.connect(self.on_render_mode_changed)
+        btn_layout.addWidget(self.render_combo)
+
         layout.addLayout(btn_layout)
 
         self.plot_widget = PlotWidget()
@@ -114,7 +244,25 @@ class MainWindow(QMainWindow):
         table_label = QLabel("<h2>Регрессионный анализ</h2>")
         layout.addWidget(table_label)
 
-        self.report_table = QTableWidget()
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Фильтр по модели или уравнению")
+        self.filter_edit.textChanged.connect(self.apply_report_filter)
+        filter_layout.addWidget(self.filter_edit)
+        self.only_sig_check = QCheckBox("Только значимые")
+        self.only_sig_check.toggled.connect(self.apply_report_filter)
+        filter_layout.addWidget(self.only_sig_check)
+        layout.addLayout(filter_layout)
+
+        self.report_model = ReportTableModel(self)
+        self.report_table = QTableView()
+        self.report_table.setModel(self.report_model)
+        self.report_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.report_table.setSortingEnabled(True)
+        self.report_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = self.report_table.horizontalHeader()
+        header.setResizeContentsPrecision(50)
+        header.setStretchLastSection(True)
         layout.addWidget(self.report_table)
 
         summary_label = QLabel("<h2>Выводы</h2>")
@@ -124,208 +272,581 @@ class MainWindow(QMainWindow):
         self.report_summary.setReadOnly(True)
         layout.addWidget(self.report_summary)
 
-        self.report_tab.setLayout(layout)
-
-    def perform_analysis(self):
-        r = self.analysis.correlation_coefficient()
-        is_sig, t_calc = self.analysis.correlation_significance(r)
-
-        self.models.clear()
-
-        a, b = self.analysis.linear_regression()
-        y = [a + b * x for x in self.analysis.x]
-        rmse, mare, r2, _, _ = self.analysis.calculate_errors(y)
-        sig, F = self.analysis.model_significance(r2, 2)
-        self.models["Линейная"] = dict(
-            eq=f"y = {a:.4f} + {b:.4f}x",
-            func=lambda xx, a=a, b=b: a + b * xx,
-            rmse=rmse,
-            mare=mare,
-            r2=r2,
-            F=F,
-            sig=sig,
+        mv_layout = QHBoxLayout()
+        mv_layout.addWidget(QLabel("<h2>Множественная регрессия</h2>"))
+        mv_layout.addStretch()
+        self.mv_btn = QPushButton("Загрузить таблицу X₁…Xₚ, Y")
+        self.mv_btn.clicked.connect(self.load_multivariate)
+        mv_layout.addWidget(self.mv_btn)
+        layout.addLayout(mv_layout)
+
+        self.mv_text = QTextEdit()
+        self.mv_text.setReadOnly(True)
+        layout.addWidget(self.mv_text)
+
+        corr_layout = QHBoxLayout()
+        corr_layout.addWidget(QLabel("<h2>Корреляционная матрица</h2>"))
+        corr_layout.addStretch()
+        self.corr_btn = QPushButton("Загрузить таблицу X₁…Xₖ")
+        self.corr_btn.clicked.connect(self.load_correlation)
+        corr_layout.addWidget(self.corr_btn)
+        layout.addLayout(corr_layout)
+
+        self.corr_figure = Figure(figsize=(8, 6))
+        self.corr_canvas = FigureCanvas(self.corr_figure)
+        self.corr_canvas.setMinimumHeight(500)
+        self.corr_canvas.setVisible(False)
+        layout.addWidget(self.corr_canvas)
+
+        self.corr_text = QTextEdit()
+        self.corr_text.setReadOnly(True)
+        layout.addWidget(self.corr_text)
+
+        perf_layout = QHBoxLayout()
+        perf_layout.addWidget(QLabel("<h2>Производительность</h2>"))
+        perf_layout.addStretch()
+        self.cprofile_check = QCheckBox("cProfile")
+        self.cprofile_check.setToolTip(
+            "Собирать профиль cProfile фонового расчёта (замедляет анализ)"
         )
+        perf_layout.addWidget(self.cprofile_check)
+        self.perf_export_btn = QPushButton("Экспорт в JSON")
+        self.perf_export_btn.clicked.connect(self.export_profile)
+        perf_layout.addWidget(self.perf_export_btn)
+        layout.addLayout(perf_layout)
+
+        self.perf_text = QTextEdit()
+        self.perf_text.setReadOnly(True)
+        layout.addWidget(self.perf_text)
+
+        content = QWidget()
+        content.setLayout(layout)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(content)
+        tab_layout = QVBoxLayout()
+        tab_layout.setContentsMargins(0, 0, 0, 0)
+        tab_layout.addWidget(scroll)
+        self.report_tab.setLayout(tab_layout)
+
+    def init_batch_tab(self):
+        layout = QVBoxLayout()
 
-        a, b, c = self.analysis.quadratic_regression()
-        y = [a + b * x + c * x**2 for x in self.analysis.x]
-        rmse, mare, r2, _, _ = self.analysis.calculate_errors(y)
-        sig, F = self.analysis.model_significance(r2, 3)
-        self.models["Квадратичная"] = dict(
-            eq=f"y = {a:.4f} + {b:.4f}x + {c:.4f}x²",
-            func=lambda xx, a=a, b=b, c=c: a + b * xx + c * xx**2,
-            rmse=rmse,
-            mare=mare,
-            r2=r2,
-            F=F,
-            sig=sig,
+        btn_layout = QHBoxLayout()
+        self.batch_btn = QPushButton("Анализ папки")
+        self.batch_btn.clicked.connect(self.load_batch)
+        btn_layout.addWidget(self.batch_btn, alignment=Qt.AlignLeft)
+
+        self.batch_export_btn = QPushButton("Экспорт отчётов папки")
+        self.batch_export_btn.setToolTip(
+            "Проанализировать папку и сохранить отчёт каждого набора\n"
+            "(HTML, PNG, PDF) и сводку index.html"
         )
+        self.batch_export_btn.clicked.connect(self.export_batch)
+        btn_layout.addWidget(self.batch_export_btn, alignment=Qt.AlignLeft)
+
+        self.batch_cancel_btn = QPushButton("Отмена")
+        self.batch_cancel_btn.clicked.connect(self.cancel_batch)
+        self.batch_cancel_btn.setEnabled(False)
+        btn_layout.addWidget(self.batch_cancel_btn, alignment=Qt.AlignLeft)
+
+        btn_layout.addWidget(QLabel("Процессов:"))
+        self.batch_workers = QSpinBox()
+        self.batch_workers.setRange(1, max(1, os.cpu_count() or 1))
+        self.batch_workers.setValue(self.batch_workers.maximum())
+        btn_layout.addWidget(self.batch_workers)
+
+        self.batch_progress = QProgressBar()
+        self.batch_progress.setVisible(False)
+        btn_layout.addWidget(self.batch_progress)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
 
-        a, b, c, d = self.analysis.cubic_regression()
-        y = [a + b * x + c * x**2 + d * x**3 for x in self.analysis.x]
-        rmse, mare, r2, _, _ = self.analysis.calculate_errors(y)
-        sig, F = self.analysis.model_significance(r2, 4)
-        self.models["Кубическая"] = dict(
-            eq=f"y = {a:.4f} + {b:.4f}x + {c:.4f}x² + {d:.4f}x³",
-            func=lambda xx, a=a, b=b, c=c, d=d: a + b * xx + c * xx**2 + d * xx**3,
-            rmse=rmse,
-            mare=mare,
-            r2=r2,
-            F=F,
-            sig=sig,
+        layout.addWidget(
+            QLabel(
+                "Параметры загрузки и построения моделей — как на вкладке "
+                "«Графики». Двойной щелчок открывает набор данных."
+            )
         )
 
-        a, b = self.analysis.exponential_regression()
-        y = [a * math.exp(b * x) for x in self.analysis.x]
-        rmse, mare, r2, _, _ = self.analysis.calculate_errors(y)
-        sig, F = self.analysis.model_significance(r2, 2)
-        self.models["Экспоненциальная"] = dict(
-            eq=f"y = {a:.4f} * exp({b:.4f}x)",
-            func=lambda xx, a=a, b=b: a * math.exp(b * xx),
-            rmse=rmse,
-            mare=mare,
-            r2=r2,
-            F=F,
-            sig=sig,
+        self.batch_table = QTableWidget(0, len(BATCH_COLUMNS))
+        self.batch_table.setHorizontalHeaderLabels(BATCH_COLUMNS)
+        self.batch_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.batch_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.batch_table.setSortingEnabled(True)
+        self.batch_table.horizontalHeader().setStretchLastSection(True)
+        self.batch_table.cellDoubleClicked.connect(self.open_batch_dataset)
+        layout.addWidget(self.batch_table)
+
+        self.batch_tab.setLayout(layout)
+
+    def storage_dtype(self):
+        return np.float32 if self.float32_check.isChecked() else np.float64
+
+    def load_data(self):
+        """Загружает X, Y из CSV- или .npy-файла и выполняет анализ."""
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Выбор файла данных",
+            "",
+            "Данные (*.csv *.txt *.npy);;Все файлы (*)",
         )
-
-        a, b = self.analysis.power_regression()
-        y = [a * (x**b) if x > 0 else 0 for x in self.analysis.x]
-        rmse, mare, r2, _, _ = self.analysis.calculate_errors(y)
-        sig, F = self.analysis.model_significance(r2, 2)
-        self.models["Степенная"] = dict(
-            eq=f"y = {a:.4f} * x^{b:.4f}",
-            func=lambda xx, a=a, b=b: a * (xx**b) if xx > 0 else 0,
-            rmse=rmse,
-            mare=mare,
-            r2=r2,
-            F=F,
-            sig=sig,
+        if path:
+            self.load_path(path)
+
+    def load_path(self, path):
+        """Загружает X, Y из файла path и выполняет анализ."""
+        profiler = self.new_profiler()
+        try:
+            cls = (
+                GroupedRegressionAnalysis
+                if self.aggregate_check.isChecked()
+                else RegressionAnalysis
+            )
+            with profiler.stage("Загрузка данных"):
+                analysis = cls.from_file(path, dtype=self.storage_dtype())
+            profiler.count("Загружено точек", analysis.n)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные:\n{e}")
+            return
+        self.analysis = analysis
+        self.setWindowTitle(
+            f"Лабораторная работа №1 - Компьютерное моделирование — {path}"
         )
+        self.start_analysis(profiler)
 
-        intro_text = []
-        intro_text.append(f"Коэффициент корреляции r = {r:.4f}")
-        intro_text.append(f"t-статистика = {t_calc:.4f}")
-        intro_text.append(f"Значимость: {'Да' if is_sig else 'Нет'}")
-
-        if abs(r) < 0.3:
-            interp = "слабая"
-        elif abs(r) < 0.7:
-            interp = "умеренная"
-        else:
-            interp = "сильная"
-        direction = "положительная" if r > 0 else "отрицательная"
-        intro_text.append(f"Вывод: связь {interp} {direction}")
-
-        self.report_intro.setText("\n".join(intro_text))
-
-        self.report_table.setRowCount(len(self.models))
-        self.report_table.setColumnCount(7)
-        self.report_table.setHorizontalHeaderLabels(
-            [
-                "Модель",
-                "Уравнение",
-                "СКО",
-                "Относительная ошибка (%)",
-                "Коэф. детерминации (R²)",
-                "F-критерий Фишера",
-                "Значимость",
-            ]
-        )
+    def new_profiler(self):
+        return Profiler(self.cprofile_check.isChecked())
 
-        best_rmse = min(self.models.items(), key=lambda kv: kv[1]["rmse"])
-        best_r2 = max(self.models.items(), key=lambda kv: kv[1]["r2"])
-
-        for i, (name, m) in enumerate(self.models.items()):
-            items = [
-                QTableWidgetItem(name),
-                QTableWidgetItem(m["eq"]),
-                QTableWidgetItem(f"{m['rmse']:.4f}"),
-                QTableWidgetItem(f"{m['mare']:.2f}"),
-                QTableWidgetItem(f"{m['r2']:.4f}"),
-                QTableWidgetItem(f"{m['F']:.2f}"),
-                QTableWidgetItem("Да" if m["sig"] else "Нет"),
-            ]
-
-            if name == best_rmse[0] and name == best_r2[0]:
-                bg_color = Qt.yellow
-            elif name == best_rmse[0]:
-                bg_color = Qt.green
-            elif name == best_r2[0]:
-                bg_color = Qt.cyan
-            else:
-                bg_color = None
-
-            for j, item in enumerate(items):
-                if j == 0:
-                    font = QFont()
-                    font.setBold(True)
-                    item.setFont(font)
-
-                if j == 6:
-                    font = QFont()
-                    font.setBold(True)
-                    item.setFont(font)
-                    if m["sig"]:
-                        item.setForeground(QColor("darkgreen"))
-                    else:
-                        item.setForeground(QColor("red"))
-
-                if bg_color:
-                    item.setBackground(bg_color)
-
-                self.report_table.setItem(i, j, item)
-
-        self.report_table.resizeColumnsToContents()
-        self.report_table.horizontalHeader().setStretchLastSection(True)
-
-        summary = []
-        summary.append(
-            f"Лучшая модель по среднеквадратичной ошибке: {best_rmse[0]} ({best_rmse[1]['eq']})"
+    def perform_analysis(self):
+        """Запускает построение моделей в фоновом потоке."""
+        self.start_analysis(self.new_profiler())
+
+    def start_analysis(self, profiler):
+        """
+        Запускает построение моделей в фоновом потоке.
+
+        Args:
+            profiler (Profiler): замер времени этапов этого запуска.
+        """
+        if self.worker_thread is not None:
+            return
+        self.profiler = profiler
+        self.perf_text.clear()
+        self.models = {}
+        self.report = None
+        self.shown_analysis = self.analysis
+        self.report_intro.clear()
+        self.report_summary.clear()
+        self.report_model.clear()
+        self.apply_report_filter()
+
+        self.worker_thread = QThread(self)
+        self.worker = AnalysisWorker(
+            self.analysis,
+            self.render_combo.currentData(),
+            self.intervals_check.isChecked(),
+            self.nonlinear_check.isChecked(),
+            self.cache,
+            profiler,
+            self.progressive_check.isChecked(),
         )
-        summary.append(
-            f"Лучшая модель по коэффициенту детерминации R²: {best_r2[0]} ({best_r2[1]['eq']})"
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.correlation_ready.connect(self.on_correlation_ready)
+        self.worker.model_ready.connect(self.on_model_ready)
+        self.worker.refined.connect(self.on_refined)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_analysis_finished)
+        self.worker.cancelled.connect(self.on_analysis_stopped)
+        self.worker.failed.connect(self.on_analysis_failed)
+
+        self.set_running(True)
+        self.worker_thread.start()
+
+    def load_multivariate(self):
+        """Загружает таблицу (последний столбец — Y) и строит множественную регрессию."""
+        if self.mv_thread is not None:
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Выбор таблицы данных",
+            "",
+            "Данные (*.csv *.txt *.npy);;Все файлы (*)",
+        )
+        if not path:
+            return
+        try:
+            mv = MultivariateRegression.from_file(path, dtype=self.storage_dtype())
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные:\n{e}")
+            return
+        self.mv_text.setText(f"Расчёт: n = {mv.n}, p = {mv.p}…")
+        self.mv_btn.setEnabled(False)
+
+        self.mv_thread = QThread(self)
+        self.mv_worker = MultivariateWorker(mv)
+        self.mv_worker.moveToThread(self.mv_thread)
+        self.mv_thread.started.connect(self.mv_worker.run)
+        self.mv_worker.finished.connect(self.on_multivariate_finished)
+        self.mv_worker.failed.connect(self.on_multivariate_failed)
+        self.mv_thread.start()
+
+    def stop_multivariate(self):
+        if self.mv_thread is None:
+            return
+        self.mv_thread.quit()
+        self.mv_thread.wait()
+        self.mv_worker.deleteLater()
+        self.mv_thread.deleteLater()
+        self.mv_thread = None
+        self.mv_btn.setEnabled(True)
+
+    def on_multivariate_finished(self, name, m):
+        names = self.mv_worker.mv.names
+        self.stop_multivariate()
+        self.report_model.append_row(name, m)
+        self.mv_text.setText("\n".join(multivariate_lines(names, m.coefs)))
+
+    def on_multivariate_failed(self, message):
+        self.stop_multivariate()
+        self.mv_text.clear()
+        QMessageBox.critical(self, "Ошибка", f"Ошибка анализа:\n{message}")
+
+    def load_correlation(self):
+        """Загружает таблицу и строит матрицу корреляций всех её столбцов."""
+        if self.corr_thread is not None:
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Выбор таблицы данных",
+            "",
+            "Данные (*.csv *.txt *.npy);;Все файлы (*)",
+        )
+        if not path:
+            return
+        try:
+            corr = CorrelationMatrix.from_file(path, dtype=self.storage_dtype())
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные:\n{e}")
+            return
+        self.corr_text.setText(f"Расчёт: n = {corr.n}, столбцов: {corr.k}…")
+        self.corr_btn.setEnabled(False)
+
+        self.corr_thread = QThread(self)
+        self.corr_worker = CorrelationWorker(corr)
+        self.corr_worker.moveToThread(self.corr_thread)
+        self.corr_thread.started.connect(self.corr_worker.run)
+        self.corr_worker.finished.connect(self.on_correlation_matrix_ready)
+        self.corr_worker.failed.connect(self.on_correlation_matrix_failed)
+        self.corr_thread.start()
+
+    def stop_correlation(self):
+        if self.corr_thread is None:
+            return
+        self.corr_thread.quit()
+        self.corr_thread.wait()
+        self.corr_worker.deleteLater()
+        self.corr_thread.deleteLater()
+        self.corr_thread = None
+        self.corr_btn.setEnabled(True)
+
+    def on_correlation_matrix_ready(self, corr):
+        self.stop_correlation()
+        self.corr_text.setText("\n".join(corr.lines()))
+        draw_correlation(self.corr_figure, corr)
+        self.corr_canvas.setVisible(True)
+        self.corr_canvas.draw_idle()
+
+    def on_correlation_matrix_failed(self, message):
+        self.stop_correlation()
+        self.corr_text.clear()
+        QMessageBox.critical(self, "Ошибка", f"Ошибка анализа:\n{message}")
+
+    def cancel_analysis(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def set_running(self, running):
+        self.analyze_btn.setEnabled(not running)
+        self.load_btn.setEnabled(not running)
+        self.export_btn.setEnabled(not running and self.report is not None)
+        self.cancel_btn.setEnabled(running)
+        self.progress_bar.setVisible(running)
+        self.progress_bar.setValue(0)
+
+    def stop_worker(self):
+        if self.worker_thread is None:
+            return
+        self.worker.cancel()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        self.worker.deleteLater()
+        self.worker_thread.deleteLater()
+        self.worker_thread = None
+        self.worker = None
+        self.set_running(False)
+
+    def on_progress(self, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+
+    def on_correlation_ready(self, corr):
+        self.report_intro.setText("\n".join(correlation_lines(corr)))
+
+    def on_model_ready(self, name, m):
+        with self.profiler.stage("Заполнение таблицы"):
+            self.models[name] = m
+            self.report_model.set_row(name, m)
+            if self.report_model.rowCount() <= 50:
+                self.report_table.resizeColumnsToContents()
+
+    def on_refined(self, step):
+        """Показывает предварительные модели этапа прогрессивного анализа."""
+        self.shown_analysis = step["analysis"]
+        self.report_model.set_best(*best_models(step["models"]))
+        self.report_summary.setText("\n".join(sample_lines(step)))
+        with self.profiler.stage("Отрисовка графиков"):
+            self.plot_widget.show_models(
+                step["analysis"], step["models"], step["plot_data"]
+            )
+        self.show_profile()
+
+    def apply_report_filter(self):
+        self.report_model.set_filter(
+            self.filter_edit.text(), self.only_sig_check.isChecked()
         )
-        summary.append(f"Рекомендуемая модель: {best_rmse[0]}")
 
-        self.report_summary.setText("\n".join(summary))
+    def on_analysis_finished(self, report):
+        self.report = report
+        self.stop_worker()
+        self.models = report["models"]
+        self.plot_data = report["plot_data"]
+        sample = report.get("sample")
+        self.shown_analysis = self.analysis if sample is None else sample["analysis"]
+        best_rmse, best_r2 = best_models(self.models)
+
+        self.report_model.set_best(best_rmse, best_r2)
+
+        lines = summary_lines(self.models, report["cv"])
+        if "intervals" in report:
+            lines += [""] + interval_lines(report["intervals"])
+        if sample is not None:
+            lines += [""] + sample_lines(sample)
+        self.report_summary.setText("\n".join(lines))
 
         self.plot_results()
 
-    def plot_results(self):
-        self.plot_widget.figure.clear()
-        for i, (name, m) in enumerate(self.models.items()):
-            ax = self.plot_widget.figure.add_subplot(2, 3, i + 1)
-            ax.scatter(
-                self.analysis.x,
-                self.analysis.y,
-                color="red",
-                s=50,
-                label="Данные",
-                zorder=3,
-            )
-            ax.axhline(
-                self.analysis.y_mean,
-                color="blue",
-                linestyle="--",
-                alpha=0.5,
-                label=f"Среднее Y",
+    def on_analysis_stopped(self):
+        self.stop_worker()
+        self.report_summary.setText("Анализ прерван пользователем")
+        self.show_profile()
+
+    def on_analysis_failed(self, message):
+        self.stop_worker()
+        QMessageBox.critical(self, "Ошибка", f"Ошибка анализа:\n{message}")
+
+    def export_report(self):
+        """Сохраняет отчёт текущего анализа в HTML, PDF или PNG."""
+        if self.report is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Экспорт отчёта",
+            "report.html",
+            "HTML (*.html);;PDF (*.pdf);;PNG (*.png)",
+        )
+        if not path:
+            return
+        stem, ext = os.path.splitext(path)
+        fmt = ext[1:].lower()
+        if fmt not in FORMATS:
+            stem, fmt = path, "html"
+        report = dict(self.report, plot_data=self.plot_data)
+        try:
+            write_report(
+                self.shown_analysis,
+                report,
+                stem,
+                [fmt],
+                self.render_combo.currentData(),
             )
-            ax.axvline(
-                self.analysis.x_mean,
-                color="green",
-                linestyle="--",
-                alpha=0.5,
-                label=f"Среднее X",
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{e}")
+
+    def choose_datasets(self):
+        """
+        Returns:
+            list[str]: файлы данных выбранной папки (пустой при отказе).
+        """
+        folder = QFileDialog.getExistingDirectory(self, "Выбор папки с данными")
+        if not folder:
+            return []
+        paths = find_datasets(folder)
+        if not paths:
+            QMessageBox.information(
+                self, "Пакетный анализ", "В папке нет файлов CSV, TXT или .npy"
             )
-            x_new = [
-                min(self.analysis.x)
-                + j * (max(self.analysis.x) - min(self.analysis.x)) / 200
-                for j in range(201)
-            ]
-            y_new = [m["func"](xx) for xx in x_new]
-            ax.plot(x_new, y_new, label=f"Модель: {name}", color="black")
-            ax.set_title(name)
-            ax.grid(True, alpha=0.3)
-            ax.legend(fontsize=8, loc="best")
-        self.plot_widget.figure.tight_layout()
-        self.plot_widget.canvas.draw()
+        return paths
+
+    def load_batch(self):
+        """Анализирует все наборы данных выбранной папки в пуле процессов."""
+        if self.batch_thread is not None:
+            return
+        paths = self.choose_datasets()
+        if paths:
+            self.start_batch(paths)
+
+    def export_batch(self):
+        """Анализирует папку и сохраняет отчёт каждого набора в другую папку."""
+        if self.batch_thread is not None:
+            return
+        paths = self.choose_datasets()
+        if not paths:
+            return
+        out_dir = QFileDialog.getExistingDirectory(self, "Папка для отчётов")
+        if not out_dir:
+            return
+        self.start_batch(
+            paths,
+            out_dir,
+            task=export_dataset,
+            out_dir=out_dir,
+            render_mode=self.render_combo.currentData(),
+        )
+
+    def start_batch(self, paths, export_dir=None, **options):
+        """
+        Запускает BatchWorker.
+
+        Args:
+            paths (list[str]): файлы данных.
+            export_dir (str | None): папка отчётов, в которую по окончании
+                записывается index.html.
+            **options: дополнительные параметры BatchWorker.
+        """
+        self.batch_table.setSortingEnabled(False)
+        self.batch_table.setRowCount(0)
+        self.batch_results = []
+        self.batch_export_dir = export_dir
+
+        self.batch_thread = QThread(self)
+        self.batch_worker = BatchWorker(
+            paths,
+            self.batch_workers.value(),
+            nonlinear=self.nonlinear_check.isChecked(),
+            aggregate=self.aggregate_check.isChecked(),
+            dtype=self.storage_dtype(),
+            cache_dir=self.cache.directory,
+            **options,
+        )
+        self.batch_worker.moveToThread(self.batch_thread)
+        self.batch_thread.started.connect(self.batch_worker.run)
+        self.batch_worker.dataset_ready.connect(self.on_dataset_ready)
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.finished.connect(self.on_batch_finished)
+        self.batch_worker.failed.connect(self.on_batch_failed)
+
+        self.set_batch_running(True)
+        self.batch_thread.start()
+
+    def cancel_batch(self):
+        if self.batch_worker is not None:
+            self.batch_worker.cancel()
+
+    def set_batch_running(self, running):
+        self.batch_btn.setEnabled(not running)
+        self.batch_export_btn.setEnabled(not running)
+        self.batch_cancel_btn.setEnabled(running)
+        self.batch_progress.setVisible(running)
+        self.batch_progress.setValue(0)
+
+    def stop_batch(self):
+        if self.batch_thread is None:
+            return
+        self.batch_worker.cancel()
+        self.batch_thread.quit()
+        self.batch_thread.wait()
+        self.batch_worker.deleteLater()
+        self.batch_thread.deleteLater()
+        self.batch_thread = None
+        self.batch_worker = None
+        self.set_batch_running(False)
+        self.batch_table.setSortingEnabled(True)
+        self.batch_table.resizeColumnsToContents()
+
+    def on_batch_progress(self, done, total):
+        self.batch_progress.setMaximum(total)
+        self.batch_progress.setValue(done)
+
+    def on_batch_finished(self):
+        self.stop_batch()
+        if self.batch_export_dir is not None:
+            self.batch_results.sort(key=lambda result: result["path"])
+            try:
+                write_index(self.batch_results, self.batch_export_dir)
+            except OSError as e:
+                QMessageBox.critical(
+                    self, "Ошибка", f"Не удалось сохранить сводку:\n{e}"
+                )
+
+    def on_dataset_ready(self, result):
+        self.batch_results.append(result)
+        row = self.batch_table.rowCount()
+        self.batch_table.insertRow(row)
+        for column, text in enumerate(summary_row(result)):
+            if column == 0:
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, result["path"])
+            else:
+                item = NumericItem(text)
+            self.batch_table.setItem(row, column, item)
+
+    def on_batch_failed(self, message):
+        self.stop_batch()
+        QMessageBox.critical(self, "Ошибка", f"Ошибка пакетного анализа:\n{message}")
+
+    def open_batch_dataset(self, row, column):
+        """Открывает набор данных строки на вкладке «Графики»."""
+        if self.worker_thread is not None:
+            return
+        self.load_path(self.batch_table.item(row, 0).data(Qt.UserRole))
+        self.tabs.setCurrentWidget(self.plot_tab)
+
+    def closeEvent(self, event):
+        self.stop_worker()
+        self.stop_multivariate()
+        self.stop_correlation()
+        self.stop_batch()
+        super().closeEvent(event)
+
+    def on_render_mode_changed(self):
+        if self.models and self.worker_thread is None:
+            self.plot_data = None
+            self.plot_results()
+
+    def plot_results(self):
+        analysis = self.shown_analysis
+        if self.plot_data is None:
+            with self.profiler.stage("Данные графика", len(analysis.x)):
+                self.plot_data = prepare_plot_data(
+                    analysis, self.render_combo.currentData()
+                )
+        with self.profiler.stage("Отрисовка графиков"):
+            self.plot_widget.show_models(analysis, self.models, self.plot_data)
+        self.show_profile()
+
+    def show_profile(self):
+        self.perf_text.setText("\n".join(self.profiler.lines()))
+
+    def export_profile(self):
+        """Сохраняет результаты раздела «Производительность» в JSON."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт профиля", "profile.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.profiler.save_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{e}")
@@ -0,0 +1,282 @@
+import abc
+import math
+import struct
+
+import numpy as np
+
+from analysis import power_curve
+
+# Двоичный формат модели: заголовок (метка, вид модели, признак
+# значимости, число коэффициентов), четыре метрики float64 (NaN — не
+# вычислена), коэффициенты float64 и дополнительные данные вида модели.
+_MAGIC = b"LRM1"
+_HEADER = struct.Struct("<4sBBH4d")
+# Файл набора моделей: метка и число моделей, затем для каждой модели
+# длина и UTF-8 имени, длина и байты модели.
+_SET_MAGIC = b"LRMS"
+_COUNT = struct.Struct("<I")
+
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+class FittedModel(abc.ABC):
+    """
+    Построенная модель регрессии: коэффициенты, векторизованный прогноз
+    и показатели качества (rmse, mare, r2, F, sig), заполняемые evaluate.
+
+    Экземпляр вызывается как функция (model(x) == model.predict(x)),
+    поэтому его можно передавать туда, где ожидается функция модели.
+    Подкласс обязан определить predict и eq, иначе его экземпляр
+    не создаётся.
+    """
+
+    __slots__ = ("coefs", "rmse", "mare", "r2", "F", "sig")
+    KIND = None
+
+    def __init__(self, coefs):
+        """
+        Args:
+            coefs (array_like): коэффициенты модели.
+        """
+        self.coefs = np.array(coefs, dtype=np.float64).ravel()
+        self.rmse = self.mare = self.r2 = self.F = None
+        self.sig = False
+
+    @abc.abstractmethod
+    def predict(self, x):
+        """
+        Вычисляет значения модели.
+
+        Args:
+            x (array_like): значения X.
+
+        Returns:
+            np.ndarray: значения модели той же формы.
+        """
+
+    def __call__(self, x):
+        return self.predict(x)
+
+    @property
+    def n_params(self):
+        return len(self.coefs)
+
+    @property
+    @abc.abstractmethod
+    def eq(self):
+        """Уравнение модели с коэффициентами (4 знака после запятой)."""
+
+    def evaluate(self, analysis):
+        """
+        Вычисляет ошибки аппроксимации и значимость модели по данным анализа.
+
+        Args:
+            analysis (RegressionAnalysis): анализ с вычисленными базовыми
+                статистиками.
+
+        Returns:
+            FittedModel: self.
+        """
+        self.rmse, self.mare, self.r2, _, _ = analysis.calculate_model_errors(
+            self.predict
+        )
+        self.sig, self.F = analysis.model_significance(self.r2, self.n_params)
+        return self
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.eq!r})"
+
+    def to_bytes(self):
+        """Сериализует модель в компактный двоичный вид."""
+        metrics = [math.nan if v is None else v for v in self._metrics()]
+        header = _HEADER.pack(
+            _MAGIC, self.KIND, bool(self.sig), self.n_params, *metrics
+        )
+        return header + self.coefs.astype("<f8").tobytes() + self._payload()
+
+    def _metrics(self):
+        return self.rmse, self.mare, self.r2, self.F
+
+    def _payload(self):
+        return b""
+
+    @classmethod
+    def _from_payload(cls, coefs, payload):
+        return cls(coefs)
+
+    @staticmethod
+    def from_bytes(data):
+        """
+        Восстанавливает модель, сериализованную to_bytes.
+
+        Returns:
+            FittedModel: модель того же класса.
+        """
+        magic, kind, sig, size, *metrics = _HEADER.unpack_from(data)
+        if magic != _MAGIC or kind not in _KINDS:
+            raise ValueError("Неизвестный формат модели")
+        start = _HEADER.size
+        stop = start + 8 * size
+        coefs = np.frombuffer(data[start:stop], dtype="<f8")
+        model = _KINDS[kind]._from_payload(coefs, data[stop:])
+        model.rmse, model.mare, model.r2, model.F = (
+            None if math.isnan(v) else v for v in metrics
+        )
+        model.sig = bool(sig)
+        return model
+
+    def save(self, path):
+        """Сохраняет модель в двоичный файл."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path):
+        """Загружает модель, сохранённую save."""
+        with open(path, "rb") as f:
+            return FittedModel.from_bytes(f.read())
+
+
+class PolynomialModel(FittedModel):
+    """Полиномиальная модель y = c0 + c1·x + ... + c_d·x^d."""
+
+    __slots__ = ()
+    KIND = 1
+
+    @property
+    def degree(self):
+        return self.n_params - 1
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        result = np.full_like(x, self.coefs[-1])
+        for c in self.coefs[-2::-1]:
+            result *= x
+            result += c
+        return result
+
+    @property
+    def eq(self):
+        terms = [f"{self.coefs[0]:.4f}"]
+        for k, c in enumerate(self.coefs[1:], start=1):
+            power = str(k).translate(_SUPERSCRIPTS) if k > 1 else ""
+            terms.append(f"{c:.4f}x{power}")
+        return "y = " + " + ".join(terms)
+
+
+class ExponentialModel(FittedModel):
+    """Экспоненциальная модель y = a * exp(bx)."""
+
+    __slots__ = ()
+    KIND = 2
+
+    def predict(self, x):
+        a, b = self.coefs
+        return a * np.exp(b * np.asarray(x, dtype=np.float64))
+
+    @property
+    def eq(self):
+        a, b = self.coefs
+        return f"y = {a:.4f} * exp({b:.4f}x)"
+
+
+class PowerModel(FittedModel):
+    """Степенная модель y = a * x^b (y = 0 при x <= 0)."""
+
+    __slots__ = ()
+    KIND = 3
+
+    def predict(self, x):
+        a, b = self.coefs
+        return power_curve(x, a, b)
+
+    @property
+    def eq(self):
+        a, b = self.coefs
+        return f"y = {a:.4f} * x^{b:.4f}"
+
+
+class MultivariateModel(FittedModel):
+    """Множественная линейная модель y = b0 + b1·x1 + ... + bp·xp."""
+
+    __slots__ = ("names",)
+    KIND = 4
+    MAX_TERMS = 4
+
+    def __init__(self, coefs, names=None):
+        """
+        Args:
+            coefs (array_like): коэффициенты (b0, b1, ..., bp).
+            names (list[str] | None): имена переменных x1..xp.
+        """
+        super().__init__(coefs)
+        p = self.n_params - 1
+        self.names = list(names) if names else [f"x{i + 1}" for i in range(p)]
+
+    def predict(self, X):
+        """Вычисляет значения модели для блока X формы (m, p)."""
+        return self.coefs[0] + np.asarray(X, dtype=np.float64) @ self.coefs[1:]
+
+    @property
+    def eq(self):
+        """Уравнение модели; при p > MAX_TERMS слагаемые сворачиваются в Σ."""
+        b0 = self.coefs[0]
+        if len(self.names) > self.MAX_TERMS:
+            return f"y = {b0:.4f} + Σ bᵢ·xᵢ (p = {len(self.names)})"
+        terms = " + ".join(
+            f"{c:.4f}·{name}" for name, c in zip(self.names, self.coefs[1:])
+        )
+        return f"y = {b0:.4f} + {terms}"
+
+    def _payload(self):
+        return "\n".join(self.names).encode("utf-8")
+
+    @classmethod
+    def _from_payload(cls, coefs, payload):
+        names = payload.decode("utf-8").split("\n") if payload else None
+        return cls(coefs, names)
+
+
+_KINDS = {
+    cls.KIND: cls
+    for cls in (PolynomialModel, ExponentialModel, PowerModel, MultivariateModel)
+}
+
+
+def save_models(models, path):
+    """
+    Сохраняет набор именованных моделей в один двоичный файл.
+
+    Args:
+        models (dict): {имя модели: FittedModel}.
+        path (str): путь к файлу.
+    """
+    with open(path, "wb") as f:
+        f.write(_SET_MAGIC + _COUNT.pack(len(models)))
+        for name, model in models.items():
+            for chunk in (name.encode("utf-8"), model.to_bytes()):
+                f.write(_COUNT.pack(len(chunk)) + chunk)
+
+
+def load_models(path):
+    """
+    Загружает набор моделей, сохранённый save_models.
+
+    Returns:
+        dict: {имя модели: FittedModel} в исходном порядке.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != _SET_MAGIC:
+        raise ValueError(f"Файл {path} не является набором моделей")
+    (count,), offset = _COUNT.unpack_from(data, 4), 4 + _COUNT.size
+    chunks = []
+    for _ in range(2 * count):
+        (size,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        chunks.append(data[offset : offset + size])
+        offset += size
+    return {
+        name.decode("utf-8"): FittedModel.from_bytes(chunk)
+        for name, chunk in zip(chunks[::2], chunks[1::2])
+    }
@@ -0,0 +1,165 @@
+import math
+
+import numpy as np
+
+from analysis import approximation_errors
+from correlation import centered_gram
+from data_io import BLOCK_SIZE, iter_blocks, load_table
+
+
+class MultivariateRegression:
+    """
+    Множественная линейная регрессия y = b0 + b1·x1 + ... + bp·xp.
+
+    Данные обрабатываются блоками строк, поэтому матрица X может быть
+    np.memmap любого размера: в памяти находятся только текущий блок
+    и матрицы размера (p + 1) × (p + 1). Ошибки аппроксимации считаются
+    так же, как в RegressionAnalysis (analysis.approximation_errors).
+    """
+
+    def __init__(self, X, y, names=None, block_size=BLOCK_SIZE, columns=None):
+        """
+        Args:
+            X (array_like): объясняющие переменные формы (n, p).
+            y (array_like): значения Y формы (n,).
+            names (list[str] | None): имена столбцов X.
+            block_size (int): наибольшее число элементов в блоке;
+                число строк блока равно block_size // (p + 1).
+            columns (list[int] | None): номера используемых столбцов X;
+                выбираются в каждом блоке, поэтому memmap не копируется.
+        """
+        self.x = X if isinstance(X, np.ndarray) else np.asarray(X, dtype=np.float64)
+        if self.x.ndim != 2:
+            raise ValueError(
+                f"Ожидалась матрица X формы (n, p), получена {self.x.shape}"
+            )
+        self.y = y if isinstance(y, np.ndarray) else np.asarray(y, dtype=np.float64)
+        self.columns = columns
+        self.n = len(self.x)
+        self.p = self.x.shape[1] if columns is None else len(columns)
+        self.names = list(names) if names else [f"x{i + 1}" for i in range(self.p)]
+        self.block_rows = max(1, block_size // (self.p + 1))
+        self.means = None
+
+    @classmethod
+    def from_file(cls, path, target=-1, block_size=BLOCK_SIZE, dtype=np.float64):
+        """
+        Создаёт анализ по таблице из CSV- или .npy-файла (через np.memmap).
+
+        Args:
+            path (str): путь к файлу.
+            target (int): номер столбца Y; остальные столбцы — X.
+            block_size (int): размер блока обработки.
+            dtype (np.dtype): тип хранения CSV-данных (float64 или float32).
+
+        Returns:
+            MultivariateRegression: анализ с данными файла.
+        """
+        data, names = load_table(path, dtype)
+        cols = data.shape[1]
+        if cols < 2:
+            raise ValueError("Нужны хотя бы один столбец X и столбец Y")
+        target %= cols
+        features = [i for i in range(cols) if i != target]
+        names = [names[i] for i in features] if names else None
+        return cls(data, data[:, target], names, block_size, features)
+
+    def iter_blocks(self, *arrays):
+        """Перебирает блоки строк (X, y, *arrays)."""
+        blocks = iter_blocks(self.x, self.y, *arrays, block_size=self.block_rows)
+        if self.columns is None:
+            return blocks
+        return ((X[:, self.columns], *rest) for X, *rest in blocks)
+
+    def calculate_basic_stats(self):
+        """
+        Вычисляет средние и центрированную матрицу [X y]ᵀ[X y] за один
+        проход (см. correlation.centered_gram).
+        """
+        blocks = (np.column_stack((X, y)) for X, y in self.iter_blocks())
+        self.means, self.gram = centered_gram(blocks, self.n)
+        self.x_mean = self.means[:-1]
+        self.y_mean = float(self.means[-1])
+
+    def regression(self, method="cholesky"):
+        """
+        Строит модель по методу наименьших квадратов.
+
+        Args:
+            method (str): "cholesky" — разложение Холецкого центрированной
+                и масштабированной по диагонали матрицы XᵀX; "qr" — поблочное
+                QR-разложение (TSQR) центрированной матрицы [X y], устойчивее
+                при почти коллинеарных столбцах, но требует второго прохода.
+
+        Returns:
+            np.ndarray: коэффициенты (b0, b1, ..., bp).
+        """
+        if method == "cholesky":
+            beta = self._solve_cholesky()
+        elif method == "qr":
+            beta = self._solve_qr()
+        else:
+            raise ValueError(f"Неизвестный метод: {method}")
+        return np.concatenate(([self.y_mean - self.x_mean @ beta], beta))
+
+    def _solve_cholesky(self):
+        from scipy import linalg
+
+        sxx = self.gram[:-1, :-1]
+        sxy = self.gram[:-1, -1]
+        diag = np.diagonal(sxx)
+        d = np.where(diag > 0, 1 / np.sqrt(np.where(diag > 0, diag, 1)), 1.0)
+        scaled = sxx * d[:, None] * d[None, :]
+        try:
+            factor = linalg.cho_factor(scaled)
+            return linalg.cho_solve(factor, sxy * d) * d
+        except linalg.LinAlgError:
+            # Вырожденная матрица (например, постоянный столбец):
+            # решение с наименьшей нормой.
+            return np.linalg.lstsq(scaled, sxy * d, rcond=None)[0] * d
+
+    def _solve_qr(self):
+        from scipy import linalg
+
+        k = self.p + 1
+        R_aug = np.zeros((0, k))
+        for X, y in self.iter_blocks():
+            block = np.column_stack((X, y)) - self.means
+            R_aug = np.linalg.qr(np.vstack((R_aug, block)), mode="r")
+        R = R_aug[: self.p, : self.p]
+        qty = R_aug[: self.p, self.p]
+        try:
+            return linalg.solve_triangular(R, qty)
+        except linalg.LinAlgError:
+            return np.linalg.lstsq(R, qty, rcond=None)[0]
+
+    def calculate_model_errors(self, func):
+        """
+        Вычисляет ошибки аппроксимации модели поблочно.
+
+        Args:
+            func (callable): функция блока X формы (m, p) -> значения модели.
+
+        Returns:
+            tuple: (rmse, mare, r2, ss_res, ss_tot).
+        """
+        return approximation_errors(
+            ((y, func(X)) for X, y in self.iter_blocks()), self.n, self.y_mean
+        )
+
+    def model_significance(self, r2, k, alpha=0.05):
+        """
+        Проверяет значимость модели по F-критерию Фишера с критическим
+        значением для фактических степеней свободы (k - 1, n - k).
+
+        Returns:
+            tuple: (is_significant (bool), F (float)).
+        """
+        from scipy import special
+
+        df1 = k - 1
+        df2 = self.n - k
+        if df2 <= 0 or df1 <= 0:
+            return False, 0
+        F = (r2 / df1) / ((1 - r2) / df2) if r2 < 1 else math.inf
+        return bool(F > special.fdtri(df1, df2, 1 - alpha)), F
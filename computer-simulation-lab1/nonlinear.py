@@ -0,0 +1,197 @@
+import numpy as np
+
+from data_io import BLOCK_SIZE
+
+
+class CurveModel:
+    """
+    Нелинейная модель y = f(x; p) для метода Левенберга — Марквардта.
+
+    Функции модели работают сразу с пакетом рядов: x имеет форму (S, m),
+    параметры p — (S, P); func возвращает (S, m), jacobian — (S, m, P).
+    Если якобиан не задан, он оценивается конечными разностями.
+    """
+
+    def __init__(self, func, jacobian=None, n_params=2):
+        """
+        Args:
+            func (callable): f(x, p) -> значения модели.
+            jacobian (callable | None): J(x, p) -> частные производные
+                по параметрам.
+            n_params (int): число параметров модели.
+        """
+        self.func = func
+        self.jacobian = jacobian or self._numeric_jacobian
+        self.n_params = n_params
+
+    def _numeric_jacobian(self, x, p):
+        h = np.sqrt(np.finfo(np.float64).eps) * np.maximum(np.abs(p), 1.0)
+        f0 = self.func(x, p)
+        jac = np.empty(f0.shape + (p.shape[-1],))
+        for j in range(p.shape[-1]):
+            step = np.zeros_like(p)
+            step[:, j] = h[:, j]
+            jac[..., j] = (self.func(x, p + step) - f0) / h[:, j, None]
+        return jac
+
+
+def _exp_func(x, p):
+    return p[:, :1] * np.exp(p[:, 1:] * x)
+
+
+def _exp_jacobian(x, p):
+    e = np.exp(p[:, 1:] * x)
+    return np.stack((e, p[:, :1] * x * e), axis=-1)
+
+
+def _power_terms(x, b):
+    pos = x > 0
+    ln_x = np.log(np.where(pos, x, 1.0))
+    return np.where(pos, np.exp(b * ln_x), 0.0), ln_x
+
+
+def _power_func(x, p):
+    return p[:, :1] * _power_terms(x, p[:, 1:])[0]
+
+
+def _power_jacobian(x, p):
+    xb, ln_x = _power_terms(x, p[:, 1:])
+    return np.stack((xb, p[:, :1] * xb * ln_x), axis=-1)
+
+
+EXPONENTIAL = CurveModel(_exp_func, _exp_jacobian)
+POWER = CurveModel(_power_func, _power_jacobian)
+
+
+def levenberg_marquardt(model, blocks, p0, max_iter=100, xtol=1.5e-8, ftol=1.5e-8):
+    """
+    Минимизирует сумму квадратов остатков методом Левенберга — Марквардта.
+
+    За итерацию данные проходятся один раз: в пробной точке сразу
+    вычисляются и сумма квадратов, и нормальная система JᵀJ, Jᵀr,
+    которая используется на следующем шаге, если шаг принят.
+    Все ряды пакета решаются одновременно, у каждого свой параметр
+    затухания λ и признак сходимости.
+
+    Args:
+        model (CurveModel): модель.
+        blocks (callable): функция без аргументов, возвращающая итератор
+            блоков (x, y, w) формы (S, m); w — веса точек или None.
+        p0 (array_like): начальные параметры формы (S, P).
+        max_iter (int): наибольшее число итераций.
+        xtol (float): порог относительного изменения параметров.
+        ftol (float): порог относительного уменьшения суммы квадратов.
+
+    Returns:
+        tuple: (params, sse, converged, iterations) — параметры (S, P),
+        суммы квадратов остатков (S,), признаки сходимости (S,) и число
+        выполненных итераций.
+    """
+    p = np.array(p0, dtype=np.float64, ndmin=2)
+    sse, A, g = _normal_equations(model, blocks, p)
+    lam = np.full(len(p), 1e-3)
+    active = np.isfinite(sse)
+    converged = np.zeros(len(p), dtype=bool)
+    eye = np.eye(p.shape[1])
+
+    iteration = 0
+    while active.any() and iteration < max_iter:
+        iteration += 1
+        diag = np.diagonal(A, axis1=-2, axis2=-1)
+        damped = A + lam[:, None, None] * (diag[:, :, None] * eye + 1e-12 * eye)
+        try:
+            delta = np.linalg.solve(damped, g[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            delta = (np.linalg.pinv(damped) @ g[..., None])[..., 0]
+        delta[~active] = 0.0
+        candidate = p + delta
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            sse_c, A_c, g_c = _normal_equations(model, blocks, candidate)
+            accepted = active & (sse_c <= sse)
+            small_step = np.all(np.abs(delta) <= xtol * (np.abs(p) + xtol), axis=1)
+            small_gain = sse - sse_c <= ftol * sse
+
+        p[accepted] = candidate[accepted]
+        A[accepted], g[accepted] = A_c[accepted], g_c[accepted]
+        done = accepted & (small_step | small_gain)
+        sse[accepted] = sse_c[accepted]
+        lam = np.where(accepted, lam / 10, lam * 10)
+
+        converged |= done | (active & small_step)
+        active &= ~converged & (lam < 1e16)
+    return p, sse, converged, iteration
+
+
+def _normal_equations(model, blocks, p):
+    n_params = p.shape[1]
+    sse = np.zeros(len(p))
+    A = np.zeros((len(p), n_params, n_params))
+    g = np.zeros((len(p), n_params))
+    for x, y, w in blocks():
+        r = y - model.func(x, p)
+        J = model.jacobian(x, p)
+        if w is not None:
+            r = r * w
+            J = J * w[..., None]
+        Jt = J.transpose(0, 2, 1)
+        sse += np.einsum("sm,sm->s", r, r)
+        A += Jt @ J
+        g += (Jt @ r[..., None])[..., 0]
+    return sse, A, g
+
+
+def array_blocks(x, y, mask=None, block_size=BLOCK_SIZE):
+    """
+    Готовит источник блоков для levenberg_marquardt из массивов в памяти.
+
+    Args:
+        x (array_like): значения X формы (N,) или (S, N).
+        y (array_like): значения Y той же формы.
+        mask (array_like | None): маска допустимых точек.
+        block_size (int): наибольшее число элементов S·m в блоке.
+
+    Returns:
+        callable: функция, возвращающая итератор блоков (x, y, w).
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    valid = np.isfinite(x) & np.isfinite(y)
+    if mask is not None:
+        valid &= np.atleast_2d(np.asarray(mask, dtype=bool))
+    w = None if valid.all() else valid.astype(np.float64)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+    step = max(1, block_size // len(x))
+
+    def blocks():
+        for start in range(0, x.shape[1], step):
+            part = slice(start, start + step)
+            yield x[:, part], y[:, part], None if w is None else w[:, part]
+
+    return blocks
+
+
+def fit_curve(model, x, y, p0, mask=None, **options):
+    """
+    Строит нелинейную модель методом наименьших квадратов для одного
+    ряда (x, y формы (N,)) или пакета рядов (формы (S, N)).
+
+    Args:
+        model (CurveModel): модель.
+        x (array_like): значения X.
+        y (array_like): значения Y.
+        p0 (array_like): начальные параметры формы (P,) или (S, P).
+        mask (array_like | None): маска допустимых точек.
+        **options: параметры levenberg_marquardt.
+
+    Returns:
+        tuple: (params, sse, converged) — для одного ряда параметры
+        имеют форму (P,), а sse и converged — скаляры.
+    """
+    single = np.ndim(x) == 1
+    p, sse, converged, _ = levenberg_marquardt(
+        model, array_blocks(x, y, mask), p0, **options
+    )
+    if single:
+        return p[0], float(sse[0]), bool(converged[0])
+    return p, sse, converged
@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from analysis import RegressionAnalysis
+from cache import ResultCache
+from grouped import GroupedRegressionAnalysis
+from pipeline import run_analysis
+
+DATA_SUFFIXES = (".csv", ".txt", ".npy")
+
+BATCH_COLUMNS = [
+    "Набор данных",
+    "Точек",
+    "Лучшая модель",
+    "Коэф. детерминации (R²)",
+    "СКО",
+    "Время, с",
+]
+
+
+def find_datasets(folder):
+    """
+    Returns:
+        list[str]: пути к файлам данных (CSV, TXT, .npy) в каталоге
+        folder в алфавитном порядке.
+    """
+    return sorted(
+        entry.path
+        for entry in os.scandir(folder)
+        if entry.is_file() and entry.name.lower().endswith(DATA_SUFFIXES)
+    )
+
+
+def load_and_analyze(
+    path, nonlinear=False, aggregate=False, dtype=np.float64, cache_dir=None
+):
+    """
+    Загружает один набор данных и строит все модели (run_analysis).
+
+    Args:
+        path (str): путь к файлу с двумя столбцами X, Y.
+        nonlinear (bool): см. pipeline.iter_models.
+        aggregate (bool): сжать повторы X (GroupedRegressionAnalysis).
+        dtype (np.dtype): тип хранения данных.
+        cache_dir (str | None): каталог ResultCache; None — без кеша.
+
+    Returns:
+        tuple: (analysis, report) — анализ с вычисленными статистиками
+        и отчёт run_analysis.
+    """
+    cls = GroupedRegressionAnalysis if aggregate else RegressionAnalysis
+    analysis = cls.from_file(path, dtype=dtype)
+    report = None
+    if cache_dir is not None:
+        cache = ResultCache(cache_dir)
+        key = cache.key(analysis, nonlinear=nonlinear, intervals=None)
+        report = cache.load(key, analysis)
+    if report is None:
+        analysis.calculate_basic_stats()
+        report = run_analysis(analysis, nonlinear)
+        if cache_dir is not None:
+            cache.store(key, analysis, report)
+    return analysis, report
+
+
+def analyze_dataset(path, **options):
+    """
+    Анализирует один набор данных (load_and_analyze).
+
+    Выполняется в процессе пула, поэтому принимает путь к файлу, а не
+    массивы, и возвращает только отчёт без данных.
+
+    Args:
+        path (str): путь к файлу с двумя столбцами X, Y.
+        **options: параметры load_and_analyze.
+
+    Returns:
+        dict: path, name, n, report (отчёт run_analysis) и seconds.
+    """
+    start = time.perf_counter()
+    analysis, report = load_and_analyze(path, **options)
+    return dict(
+        path=path,
+        name=os.path.basename(path),
+        n=analysis.n,
+        report=report,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def iter_datasets(paths, workers=None, task=analyze_dataset, **options):
+    """
+    Анализирует наборы данных параллельно в пуле процессов.
+
+    Каждый набор обрабатывается целиком в одном процессе, поэтому время
+    обработки многих наборов сокращается пропорционально числу ядер.
+    Процессы запускаются методом spawn: в окне приложения пул создаётся
+    из фонового потока, а fork многопоточного процесса небезопасен.
+    Если перебор прерван (генератор закрыт), ещё не начатые наборы
+    отменяются.
+
+    Args:
+        paths (list[str]): пути к файлам данных.
+        workers (int | None): число процессов; по умолчанию число ядер.
+        task (callable): функция верхнего уровня модуля, вызываемая
+            в процессе как task(path, **options); по умолчанию
+            analyze_dataset.
+        **options: параметры task.
+
+    Yields:
+        dict: результат task по мере готовности (в порядке завершения);
+        при ошибке — path, name и error.
+    """
+    workers = min(workers or os.cpu_count() or 1, max(1, len(paths)))
+    executor = ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        futures = {executor.submit(task, path, **options): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield dict(path=path, name=os.path.basename(path), error=str(e))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def summary_row(result):
+    """Строка сводной таблицы в порядке BATCH_COLUMNS."""
+    if "error" in result:
+        return [result["name"], "", f"Ошибка: {result['error']}", "", "", ""]
+    report = result["report"]
+    best = report["best"]["recommended"]
+    m = report["models"][best]
+    return [
+        result["name"],
+        str(result["n"]),
+        best,
+        f"{m.r2:.4f}",
+        f"{m.rmse:.4f}",
+        f"{result['seconds']:.2f}",
+    ]
+
+
+def summary_to_dict(result):
+    """Результат analyze_dataset в виде, пригодном для JSON."""
+    if "error" in result:
+        return dict(path=result["path"], error=result["error"])
+    report = result["report"]
+    best = report["best"]["recommended"]
+    m = report["models"][best]
+    return dict(
+        path=result["path"],
+        n=int(result["n"]),
+        best=best,
+        equation=m.eq,
+        r2=float(m.r2),
+        rmse=float(m.rmse),
+        seconds=result["seconds"],
+    )
@@ -0,0 +1,282 @@
+import math
+
+from cross_validation import cross_validate
+from models import ExponentialModel, MultivariateModel, PolynomialModel, PowerModel
+from profiling import NULL_PROFILER
+
+MODEL_NAMES = [
+    "Линейная",
+    "Квадратичная",
+    "Кубическая",
+    "Экспоненциальная",
+    "Степенная",
+]
+
+REPORT_COLUMNS = [
+    "Модель",
+    "Уравнение",
+    "СКО",
+    "Относительная ошибка (%)",
+    "Коэф. детерминации (R²)",
+    "F-критерий Фишера",
+    "Значимость",
+]
+
+
+def iter_models(analysis, nonlinear=False, profiler=NULL_PROFILER):
+    """
+    Строит модели по очереди и возвращает каждую сразу после расчёта.
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        nonlinear (bool): строить экспоненциальную и степенную модели
+            нелинейным МНК (Левенберг — Марквардт) вместо линеаризации
+            логарифмированием.
+        profiler (Profiler): замер времени построения («Построение: …»)
+            и расчёта ошибок («Ошибки: …») каждой модели; три полинома
+            строятся вместе («Построение: полиномы»).
+
+    Yields:
+        tuple: (имя модели, FittedModel с вычисленными ошибками).
+    """
+    if nonlinear:
+        exponential = analysis.exponential_regression_nls
+        power = analysis.power_regression_nls
+    else:
+        exponential = analysis.exponential_regression
+        power = analysis.power_regression
+    # Одно QR-разложение (один проход TSQR) на все три полинома.
+    with profiler.stage("Построение: полиномы", len(analysis.x)):
+        polynomials = analysis.polynomial_sweep([1, 2, 3])
+    families = (
+        ("Линейная", PolynomialModel, lambda: polynomials[1]),
+        ("Квадратичная", PolynomialModel, lambda: polynomials[2]),
+        ("Кубическая", PolynomialModel, lambda: polynomials[3]),
+        ("Экспоненциальная", ExponentialModel, exponential),
+        ("Степенная", PowerModel, power),
+    )
+    for name, cls, fit in families:
+        with profiler.stage(f"Построение: {name}"):
+            model = cls(fit())
+        with profiler.stage(f"Ошибки: {name}", len(analysis.x)):
+            model.evaluate(analysis)
+        yield name, model
+
+
+def multivariate_model(mv, method="cholesky"):
+    """
+    Строит множественную регрессию и оценивает её теми же метриками,
+    что и модели одной переменной.
+
+    Args:
+        mv (MultivariateRegression): анализ с вычисленными базовыми
+            статистиками.
+        method (str): "cholesky" или "qr".
+
+    Returns:
+        tuple: (имя модели, MultivariateModel с вычисленными ошибками).
+    """
+    model = MultivariateModel(mv.regression(method), mv.names)
+    return f"Множественная (p = {mv.p})", model.evaluate(mv)
+
+
+def multivariate_lines(names, coefs):
+    """Коэффициенты множественной регрессии построчно."""
+    lines = [f"Свободный член b0 = {coefs[0]:.6g}"]
+    lines += [f"{name}: {c:.6g}" for name, c in zip(names, coefs[1:])]
+    return lines
+
+
+def correlation_report(analysis):
+    """
+    Returns:
+        dict: r, t, p (двусторонний p-уровень), sig и словесная
+        интерпретация связи (interp, direction).
+    """
+    from correlation import correlation_test
+
+    r = analysis.correlation_coefficient()
+    is_sig, t_calc = analysis.correlation_significance(r)
+    _, _, p = correlation_test(r, analysis.n)
+    if abs(r) < 0.3:
+        interp = "слабая"
+    elif abs(r) < 0.7:
+        interp = "умеренная"
+    else:
+        interp = "сильная"
+    direction = "положительная" if r > 0 else "отрицательная"
+    return dict(
+        r=r, t=t_calc, p=float(p), sig=is_sig, interp=interp, direction=direction
+    )
+
+
+def correlation_lines(corr):
+    """Текст блока «Корреляционный анализ» построчно."""
+    return [
+        f"Коэффициент корреляции r = {corr['r']:.4f}",
+        f"t-статистика = {corr['t']:.4f} (p = {corr['p']:.3g})",
+        f"Значимость: {'Да' if corr['sig'] else 'Нет'}",
+        f"Вывод: связь {corr['interp']} {corr['direction']}",
+    ]
+
+
+def best_models(models):
+    """
+    Returns:
+        tuple: (имя лучшей модели по СКО, имя лучшей модели по R²).
+    """
+    best_rmse = min(models.items(), key=lambda kv: kv[1].rmse)[0]
+    best_r2 = max(models.items(), key=lambda kv: kv[1].r2)[0]
+    return best_rmse, best_r2
+
+
+def summary_lines(models, cv=None):
+    """
+    Текст блока «Выводы» построчно.
+
+    Args:
+        models (dict): построенные модели.
+        cv (dict | None): результат cross_validate; если задан, модель
+            рекомендуется по ошибке на отложенных данных.
+    """
+    best_rmse, best_r2 = best_models(models)
+    lines = [
+        f"Лучшая модель по среднеквадратичной ошибке: {best_rmse} ({models[best_rmse].eq})",
+        f"Лучшая модель по коэффициенту детерминации R²: {best_r2} ({models[best_r2].eq})",
+    ]
+    if cv is None:
+        return lines + [f"Рекомендуемая модель: {best_rmse}"]
+    title = "LOO" if cv["method"] == "loo" else f"{cv['folds']} блоков"
+    lines.append(f"СКО перекрёстной проверки ({title}):")
+    lines += [f"  {name}: {rmse:.4f}" for name, rmse in cv["rmse"].items()]
+    lines.append(f"Рекомендуемая модель (по перекрёстной проверке): {cv['best']}")
+    return lines
+
+
+def format_number(value, spec):
+    """
+    Число ячейки таблицы моделей; недоступный показатель (NaN или None,
+    как после FittedModel.from_bytes) — прочерк.
+    """
+    return "—" if _missing(value) else format(value, spec)
+
+
+def _missing(value):
+    return value is None or math.isnan(value)
+
+
+def table_row(name, m):
+    """Строка таблицы моделей в порядке REPORT_COLUMNS."""
+    return [
+        name,
+        m.eq,
+        format_number(m.rmse, ".4f"),
+        format_number(m.mare, ".2f"),
+        format_number(m.r2, ".4f"),
+        format_number(m.F, ".2f"),
+        "Да" if m.sig else "Нет",
+    ]
+
+
+def run_analysis(analysis, nonlinear=False, profiler=NULL_PROFILER):
+    """
+    Выполняет полный анализ: корреляцию, все модели и выбор лучшей.
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        nonlinear (bool): см. iter_models.
+        profiler (Profiler): замер времени этапов.
+
+    Returns:
+        dict: correlation, models, cv (перекрёстная проверка) и best.
+    """
+    with profiler.stage("Корреляция"):
+        corr = correlation_report(analysis)
+    models = dict(iter_models(analysis, nonlinear, profiler))
+    with profiler.stage("Перекрёстная проверка", len(analysis.x)):
+        cv = cross_validate(analysis, nonlinear=nonlinear)
+    return make_report(corr, models, cv)
+
+
+def make_report(corr, models, cv=None):
+    """
+    Собирает отчёт из блока корреляции и построенных моделей.
+
+    Рекомендуемая модель — лучшая по перекрёстной проверке, если она
+    выполнена, иначе лучшая по СКО на обучающих данных.
+
+    Returns:
+        dict: correlation, models, cv и best (лучшие модели по СКО, R²
+        и рекомендуемая).
+    """
+    best_rmse, best_r2 = best_models(models)
+    recommended = best_rmse if cv is None else cv["best"]
+    return dict(
+        correlation=corr,
+        models=models,
+        cv=cv,
+        best=dict(rmse=best_rmse, r2=best_r2, recommended=recommended),
+    )
+
+
+def report_to_dict(report):
+    """
+    Преобразует результат run_analysis в структуру, пригодную для JSON.
+
+    Returns:
+        dict: correlation, models (список строк таблицы), best,
+        cross_validation (если выполнена) и sample (если отчёт построен
+        по подвыборке прогрессивного анализа).
+    """
+    corr = report["correlation"]
+    cv = report.get("cv")
+    result = dict(
+        correlation=dict(
+            r=float(corr["r"]),
+            t=float(corr["t"]),
+            p=float(corr["p"]),
+            significant=bool(corr["sig"]),
+            interpretation=f"{corr['interp']} {corr['direction']}",
+        ),
+        models=[
+            dict(
+                name=name,
+                equation=m.eq,
+                coefficients=m.coefs.tolist(),
+                rmse=float(m.rmse),
+                mare=None if _missing(m.mare) else float(m.mare),
+                r2=float(m.r2),
+                F=float(m.F),
+                significant=bool(m.sig),
+            )
+            for name, m in report["models"].items()
+        ],
+        best=dict(report["best"]),
+    )
+    if "multivariate" in report:
+        name, m, names = report["multivariate"]
+        result["multivariate"] = dict(
+            name=name,
+            equation=m.eq,
+            coefficients=dict(zip(["b0"] + list(names), m.coefs.tolist())),
+            rmse=float(m.rmse),
+            mare=float(m.mare),
+            r2=float(m.r2),
+            F=float(m.F),
+            significant=bool(m.sig),
+        )
+    if cv is not None:
+        result["cross_validation"] = dict(
+            method=cv["method"], folds=cv["folds"], rmse=dict(cv["rmse"])
+        )
+    if "sample" in report:
+        sample = report["sample"]
+        result["sample"] = dict(
+            n=int(sample["n"]),
+            total=int(sample["total"]),
+            change=float(sample["change"]),
+            tolerance=float(sample["tolerance"]),
+        )
+    return result
@@ -2,8 +2,19 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from plotting import create_model_axes, update_model_axes
+
 
 class PlotWidget(QWidget):
+    """
+    Холст с графиками моделей, который сохраняет оси и объекты между
+    запусками анализа.
+
+    Повторный анализ обновляет данные на месте (set_data / set_offsets);
+    если изменились только кривые моделей, перерисовываются лишь они
+    поверх сохранённого фона (blitting), без компоновки и полной отрисовки.
+    """
+
     def __init__(self):
         super().__init__()
         self.figure = Figure(figsize=(12, 8))
@@ -11,3 +22,69 @@ class PlotWidget(QWidget):
         layout = QVBoxLayout()
         layout.addWidget(self.canvas)
         self.setLayout(layout)
+
+        self.axes = {}
+        self.artists = {}
+        self.plot_data = None
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def show_models(self, analysis, models, plot_data):
+        """
+        Показывает модели, по возможности обновляя существующие графики.
+
+        Args:
+            analysis (RegressionAnalysis): анализ с базовыми статистиками.
+            models (dict): {имя: FittedModel}, см. pipeline.iter_models.
+            plot_data (dict): результат plotting.prepare_plot_data.
+        """
+        same_layout = (
+            list(models) == list(self.axes)
+            and self.plot_data is not None
+            and plot_data["mode"] == self.plot_data["mode"]
+        )
+        if not same_layout:
+            self.rebuild(analysis, models, plot_data)
+            return
+
+        new_data = plot_data if plot_data is not self.plot_data else None
+        self.plot_data = plot_data
+        full_redraw = False
+        for name, m in models.items():
+            full_redraw |= update_model_axes(
+                self.axes[name], self.artists[name], m, analysis, new_data
+            )
+        if full_redraw or self.background is None:
+            self.canvas.draw_idle()
+        else:
+            self.blit_curves()
+
+    def rebuild(self, analysis, models, plot_data):
+        """Полностью пересоздаёт оси (при смене набора моделей или режима)."""
+        self.figure.clear()
+        self.axes.clear()
+        self.artists.clear()
+        self.background = None
+        self.plot_data = plot_data
+        for i, (name, m) in enumerate(models.items()):
+            ax = self.figure.add_subplot(2, 3, i + 1)
+            self.axes[name] = ax
+            self.artists[name] = create_model_axes(
+                ax, name, m, analysis, plot_data, animated=True
+            )
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def on_draw(self, event):
+        """Сохраняет фон без кривых и дорисовывает кривые поверх него."""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_curves()
+
+    def draw_curves(self):
+        for name, artists in self.artists.items():
+            self.axes[name].draw_artist(artists["curve"])
+
+    def blit_curves(self):
+        self.canvas.restore_region(self.background)
+        self.draw_curves()
+        self.canvas.blit(self.figure.bbox)
@@ -0,0 +1,275 @@
+import numpy as np
+
+SCATTER_LIMIT = 10_000
+DENSITY_BINS = (300, 200)
+ENVELOPE_BINS = 1000
+CURVE_POINTS = 201
+HEATMAP_LABELS = 40
+HEATMAP_ANNOTATE = 12
+
+
+def resolve_mode(analysis, mode="auto"):
+    """Режим отображения, который prepare_plot_data выберет для mode."""
+    if mode == "auto":
+        return "scatter" if analysis.n <= SCATTER_LIMIT else "density"
+    return mode
+
+
+def prepare_plot_data(analysis, mode="auto"):
+    """
+    Подготавливает данные для отображения точек.
+
+    Стоимость рисования не зависит от объёма данных: при числе точек
+    больше SCATTER_LIMIT вместо диаграммы рассеяния строится
+    2-D гистограмма плотности или огибающая min/max по интервалам X.
+    Данные при этом проходятся один раз поблочно.
+
+    Args:
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        mode (str): "auto", "scatter", "density" или "envelope";
+            "auto" выбирает "scatter" для небольших данных и "density"
+            для остальных.
+
+    Returns:
+        dict: mode и массивы для выбранного режима.
+    """
+    mode = resolve_mode(analysis, mode)
+    stats = analysis.stats
+    if mode == "scatter":
+        return dict(mode=mode, x=np.asarray(analysis.x), y=np.asarray(analysis.y))
+    if mode == "density":
+        x_edges = np.linspace(stats.x_min, stats.x_max, DENSITY_BINS[0] + 1)
+        y_edges = np.linspace(stats.y_min, stats.y_max, DENSITY_BINS[1] + 1)
+        counts = np.zeros(DENSITY_BINS)
+        for x, y in analysis.iter_blocks():
+            counts += np.histogram2d(x, y, bins=(x_edges, y_edges))[0]
+        return dict(mode=mode, counts=counts, x_edges=x_edges, y_edges=y_edges)
+    if mode == "envelope":
+        edges = np.linspace(stats.x_min, stats.x_max, ENVELOPE_BINS + 1)
+        y_low = np.full(ENVELOPE_BINS, np.inf)
+        y_high = np.full(ENVELOPE_BINS, -np.inf)
+        for x, y in analysis.iter_blocks():
+            idx = np.clip(
+                np.searchsorted(edges, x, side="right") - 1, 0, ENVELOPE_BINS - 1
+            )
+            np.minimum.at(y_low, idx, y)
+            np.maximum.at(y_high, idx, y)
+        filled = np.isfinite(y_low)
+        centers = (edges[:-1] + edges[1:]) / 2
+        return dict(
+            mode=mode, x=centers[filled], y_low=y_low[filled], y_high=y_high[filled]
+        )
+    raise ValueError(f"Неизвестный режим отображения: {mode}")
+
+
+def draw_data(ax, plot_data):
+    """
+    Рисует точки данных на осях в подготовленном режиме.
+
+    Returns:
+        matplotlib.artist.Artist: созданный объект (для обновления на месте).
+    """
+    mode = plot_data["mode"]
+    if mode == "scatter":
+        return ax.scatter(
+            plot_data["x"],
+            plot_data["y"],
+            color="red",
+            s=50,
+            label="Данные",
+            zorder=3,
+        )
+    if mode == "density":
+        from matplotlib.colors import LogNorm
+
+        x_edges, y_edges = plot_data["x_edges"], plot_data["y_edges"]
+        return ax.imshow(
+            _density_image(plot_data),
+            origin="lower",
+            aspect="auto",
+            extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+            cmap="Reds",
+            norm=LogNorm(),
+            interpolation="nearest",
+            label="Данные",
+        )
+    return ax.fill_between(
+        plot_data["x"],
+        plot_data["y_low"],
+        plot_data["y_high"],
+        color="red",
+        alpha=0.4,
+        step="mid",
+        label="Данные (min/max)",
+    )
+
+
+def _density_image(plot_data):
+    counts = plot_data["counts"]
+    return np.where(counts > 0, counts, np.nan).T
+
+
+def update_data(artist, plot_data):
+    """Заменяет данные объекта, созданного draw_data, без пересоздания."""
+    mode = plot_data["mode"]
+    if mode == "scatter":
+        artist.set_offsets(np.column_stack((plot_data["x"], plot_data["y"])))
+    elif mode == "density":
+        x_edges, y_edges = plot_data["x_edges"], plot_data["y_edges"]
+        artist.set_data(_density_image(plot_data))
+        artist.set_extent((x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+        artist.autoscale()
+    else:
+        artist.set_data(plot_data["x"], plot_data["y_low"], plot_data["y_high"])
+
+
+def curve_points(analysis, func, num=CURVE_POINTS):
+    """Вычисляет кривую модели на равномерной сетке одним векторным вызовом."""
+    x_new = np.linspace(analysis.stats.x_min, analysis.stats.x_max, num)
+    return x_new, np.broadcast_to(func(x_new), x_new.shape)
+
+
+def axes_limits(analysis, y_curve, margin=0.05):
+    """
+    Returns:
+        tuple: (xlim, ylim) — пределы осей по данным и кривой модели.
+    """
+    stats = analysis.stats
+    finite = y_curve[np.isfinite(y_curve)]
+    y_low = min(stats.y_min, finite.min()) if len(finite) else stats.y_min
+    y_high = max(stats.y_max, finite.max()) if len(finite) else stats.y_max
+    dx = (stats.x_max - stats.x_min) * margin or 1.0
+    dy = (y_high - y_low) * margin or 1.0
+    return (stats.x_min - dx, stats.x_max + dx), (y_low - dy, y_high + dy)
+
+
+def create_model_axes(ax, name, m, analysis, plot_data, animated=False):
+    """
+    Создаёт на осях все объекты графика одной модели.
+
+    Args:
+        animated (bool): исключить кривую модели из обычной отрисовки,
+            чтобы перерисовывать её через blitting.
+
+    Returns:
+        dict: объекты data, y_mean, x_mean, curve для обновления на месте.
+    """
+    artists = dict(data=draw_data(ax, plot_data))
+    artists["y_mean"] = ax.axhline(
+        analysis.y_mean,
+        color="blue",
+        linestyle="--",
+        alpha=0.5,
+        label=f"Среднее Y",
+    )
+    artists["x_mean"] = ax.axvline(
+        analysis.x_mean,
+        color="green",
+        linestyle="--",
+        alpha=0.5,
+        label=f"Среднее X",
+    )
+    x_new, y_new = curve_points(analysis, m.predict)
+    (artists["curve"],) = ax.plot(
+        x_new, y_new, label=f"Модель: {name}", color="black", animated=animated
+    )
+    xlim, ylim = axes_limits(analysis, y_new)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    ax.set_title(name)
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize=8, loc="best")
+    return artists
+
+
+def update_model_axes(ax, artists, m, analysis, plot_data=None):
+    """
+    Обновляет объекты графика модели на месте.
+
+    Args:
+        plot_data (dict | None): новые данные для точек; None — точки
+            и средние не менялись.
+
+    Returns:
+        bool: True, если изменились точки или пределы осей и нужна
+        полная перерисовка; False — достаточно перерисовать кривую.
+    """
+    if plot_data is not None:
+        update_data(artists["data"], plot_data)
+        artists["y_mean"].set_ydata([analysis.y_mean, analysis.y_mean])
+        artists["x_mean"].set_xdata([analysis.x_mean, analysis.x_mean])
+    x_new, y_new = curve_points(analysis, m.predict)
+    artists["curve"].set_data(x_new, y_new)
+    xlim, ylim = axes_limits(analysis, y_new)
+    if plot_data is None and xlim == ax.get_xlim() and ylim == ax.get_ylim():
+        return False
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    return True
+
+
+def draw_models(figure, analysis, models, plot_data=None):
+    """
+    Рисует данные и кривые всех моделей на фигуре matplotlib.
+
+    Функция не зависит от Qt и используется как окном приложения,
+    так и консольным запуском.
+
+    Args:
+        figure (matplotlib.figure.Figure): фигура для рисования.
+        analysis (RegressionAnalysis): анализ с вычисленными базовыми
+            статистиками.
+        models (dict): {имя: FittedModel}, см. pipeline.iter_models.
+        plot_data (dict | None): результат prepare_plot_data;
+            по умолчанию готовится в режиме "auto".
+    """
+    if plot_data is None:
+        plot_data = prepare_plot_data(analysis)
+    figure.clear()
+    for i, (name, m) in enumerate(models.items()):
+        ax = figure.add_subplot(2, 3, i + 1)
+        create_model_axes(ax, name, m, analysis, plot_data)
+    figure.tight_layout()
+
+
+def draw_correlation(figure, corr):
+    """
+    Рисует матрицу корреляций тепловой картой.
+
+    Подписи столбцов выводятся при k <= HEATMAP_LABELS, значения r
+    в ячейках — при k <= HEATMAP_ANNOTATE (незначимые серым).
+
+    Args:
+        figure (matplotlib.figure.Figure): фигура для рисования.
+        corr (CorrelationMatrix): матрица с вычисленными коэффициентами.
+    """
+    figure.clear()
+    ax = figure.add_subplot(1, 1, 1)
+    image = ax.imshow(
+        np.ma.masked_invalid(corr.r),
+        cmap="RdBu_r",
+        vmin=-1,
+        vmax=1,
+        interpolation="nearest",
+    )
+    figure.colorbar(image, ax=ax, label="r")
+    ax.set_title(f"Корреляции Пирсона (n = {corr.n})")
+    k = corr.k
+    if k <= HEATMAP_LABELS:
+        ax.set_xticks(range(k), corr.names, rotation=90)
+        ax.set_yticks(range(k), corr.names)
+    if k <= HEATMAP_ANNOTATE:
+        for i in range(k):
+            for j in range(k):
+                if i != j and np.isfinite(corr.r[i, j]):
+                    ax.text(
+                        j,
+                        i,
+                        f"{corr.r[i, j]:.2f}",
+                        ha="center",
+                        va="center",
+                        fontsize=8,
+                        color="black" if corr.significant[i, j] else "gray",
+                    )
+    figure.tight_layout()
@@ -0,0 +1,168 @@
+import cProfile
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_TOP = 25
+POINTS = "Обработано точек (сумма по этапам)"
+
+
+class Profiler:
+    """
+    Сборщик времени этапов анализа и счётчиков обработанных точек.
+
+    Этапы замеряются контекстным менеджером stage; повторные замеры
+    одного этапа суммируются. Методы можно вызывать из нескольких
+    потоков (фоновый расчёт и окно приложения пишут в один профиль).
+    При cprofile=True capture дополнительно собирает профиль cProfile
+    потока, в котором вызван.
+    """
+
+    def __init__(self, cprofile=False):
+        """
+        Args:
+            cprofile (bool): собирать профиль cProfile в capture.
+        """
+        self.cprofile = cprofile
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Очищает собранные замеры."""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.profile = None
+            self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, points=0):
+        """
+        Замеряет время этапа.
+
+        Args:
+            name (str): имя этапа.
+            points (int): число точек, обработанных этапом (для скорости
+                обработки и счётчика POINTS).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(
+                    name, dict(seconds=0.0, calls=0, points=0)
+                )
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+                entry["points"] += int(points)
+                self.counters[POINTS] = self.counters.get(POINTS, 0) + int(points)
+
+    def count(self, name, value=1):
+        """Увеличивает счётчик name на value."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def capture(self):
+        """Собирает профиль cProfile текущего потока, если включён cprofile."""
+        if not self.cprofile:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                if self.profile is None:
+                    self.profile = pstats.Stats(profile)
+                else:
+                    self.profile.add(profile)
+
+    def profile_rows(self, top=PROFILE_TOP):
+        """
+        Returns:
+            list[dict]: функции с наибольшим накопленным временем
+            (function, calls, tottime, cumtime).
+        """
+        if self.profile is None:
+            return []
+        rows = []
+        for (path, line, func), values in self.profile.stats.items():
+            _, calls, tottime, cumtime, _ = values
+            rows.append(
+                dict(
+                    function=f"{path}:{line}({func})",
+                    calls=calls,
+                    tottime=tottime,
+                    cumtime=cumtime,
+                )
+            )
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:top]
+
+    def to_dict(self):
+        """Результаты профилирования в виде, пригодном для JSON."""
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+            counters = dict(self.counters)
+            elapsed = time.perf_counter() - self._started
+        return dict(
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            elapsed=elapsed,
+            stages=stages,
+            counters=counters,
+            profile=self.profile_rows(),
+        )
+
+    def lines(self):
+        """Текст раздела «Производительность» построчно."""
+        data = self.to_dict()
+        lines = []
+        for name, entry in data["stages"].items():
+            line = f"{name}: {entry['seconds'] * 1000:.1f} мс"
+            if entry["calls"] > 1:
+                line += f" ({entry['calls']} вызовов)"
+            if entry["points"] and entry["seconds"] > 0:
+                rate = entry["points"] / entry["seconds"]
+                line += f", {entry['points']} точек, {rate:,.0f} точек/с"
+            lines.append(line)
+        total = sum(entry["seconds"] for entry in data["stages"].values())
+        lines.append(f"Всего по этапам: {total * 1000:.1f} мс")
+        lines += [f"{name}: {value}" for name, value in data["counters"].items()]
+        if data["profile"]:
+            lines += ["", "cProfile (по накопленному времени):"]
+            lines += [
+                f"  {row['cumtime'] * 1000:9.1f} мс  {row['calls']:>8}  "
+                f"{row['function']}"
+                for row in data["profile"]
+            ]
+        return lines
+
+    def save_json(self, path):
+        """Записывает результаты профилирования в JSON-файл."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+class NullProfiler:
+    """Профилировщик, который ничего не замеряет (по умолчанию)."""
+
+    cprofile = False
+
+    def stage(self, name, points=0):
+        return nullcontext()
+
+    def count(self, name, value=1):
+        pass
+
+    def capture(self):
+        return nullcontext()
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,202 @@
+"""
+Прогрессивный анализ больших наборов данных: модели сначала строятся
+по небольшой случайной подвыборке, затем по подвыборкам растущего
+размера, пока оценки не перестанут меняться или не останется только
+полный проход по данным.
+"""
+
+import math
+
+import numpy as np
+
+from analysis import RegressionAnalysis
+from cross_validation import cross_validate
+from grouped import GroupedRegressionAnalysis
+from pipeline import correlation_report, iter_models, make_report
+from plotting import CURVE_POINTS, prepare_plot_data
+from profiling import NULL_PROFILER
+
+PROGRESSIVE_MIN = 10**6
+START_SIZE = 10**5
+GROWTH = 4
+# Допуск изменения кривых моделей между этапами — 1 % СКО Y.
+TOLERANCE = 1e-2
+
+
+def applies(analysis):
+    """
+    Прогрессивный анализ выполняется для точечных данных
+    (не GroupedRegressionAnalysis) не меньше PROGRESSIVE_MIN точек.
+    """
+    return (
+        not isinstance(analysis, GroupedRegressionAnalysis)
+        and analysis.n >= PROGRESSIVE_MIN
+    )
+
+
+def sample_sizes(n, start=START_SIZE, growth=GROWTH):
+    """
+    Размеры подвыборок: start, start·growth, … пока следующий этап
+    (полные данные) не больше последнего в growth раз.
+
+    Returns:
+        list[int]: размеры по возрастанию.
+    """
+    sizes = []
+    m = start
+    while m * growth <= n:
+        sizes.append(m)
+        m *= growth
+    return sizes
+
+
+def subsample(analysis, m, rng):
+    """
+    Случайная подвыборка без повторений в среднем из m точек: каждая
+    точка входит в неё независимо с вероятностью m / n.
+
+    Маска строится по блокам block_size за один проход по данным,
+    поэтому np.memmap читается в одном направлении по файлу, а кроме
+    самой подвыборки в памяти держится только маска текущего блока.
+
+    Returns:
+        RegressionAnalysis: анализ подвыборки (в памяти).
+    """
+    p = m / analysis.n
+    xs, ys = [], []
+    for start in range(0, analysis.n, analysis.block_size):
+        stop = min(start + analysis.block_size, analysis.n)
+        keep = np.flatnonzero(rng.random(stop - start) < p)
+        xs.append(analysis.x[start:stop][keep])
+        ys.append(analysis.y[start:stop][keep])
+    return RegressionAnalysis(
+        np.concatenate(xs), np.concatenate(ys), analysis.block_size, analysis.dtype
+    )
+
+
+def curve_change(previous, models, analysis):
+    """
+    Наибольшее изменение кривых моделей между двумя этапами на сетке
+    из CURVE_POINTS точек, в долях стандартного отклонения Y.
+
+    Args:
+        previous (dict): модели прошлого этапа.
+        models (dict): модели текущего этапа.
+        analysis (RegressionAnalysis): анализ текущего этапа
+            с вычисленными базовыми статистиками.
+
+    Returns:
+        float: изменение (NaN, если кривая не определена).
+    """
+    stats = analysis.stats
+    x = np.linspace(stats.x_min, stats.x_max, CURVE_POINTS)
+    y_std = math.sqrt(max(analysis.sum_y2 / analysis.n - analysis.y_mean**2, 0.0))
+    with np.errstate(all="ignore"):
+        diff = [
+            np.max(np.abs(m.predict(x) - previous[name].predict(x)))
+            for name, m in models.items()
+        ]
+    return float(np.max(diff)) / (y_std or 1.0)
+
+
+def iter_refinements(
+    analysis,
+    nonlinear=False,
+    tolerance=TOLERANCE,
+    render_mode=None,
+    seed=None,
+    profiler=NULL_PROFILER,
+):
+    """
+    Строит все модели по подвыборкам растущего размера (sample_sizes).
+
+    Перебор заканчивается, когда кривые моделей изменились меньше чем
+    на tolerance (см. curve_change), или после наибольшей подвыборки;
+    во втором случае уточнять дальше можно только по полным данным.
+
+    Args:
+        analysis (RegressionAnalysis): полный анализ (можно np.memmap).
+        nonlinear (bool): см. pipeline.iter_models.
+        tolerance (float): допуск изменения кривых в долях СКО Y.
+        render_mode (str | None): режим prepare_plot_data для данных
+            графика этапа; None — без данных графика.
+        seed (int | None): зерно генератора подвыборок.
+        profiler (Profiler): замер времени этапов.
+
+    Yields:
+        dict: analysis (анализ подвыборки), n (размер), total (размер
+        полных данных), correlation, models, plot_data, change
+        (None на первом этапе), tolerance и converged.
+    """
+    rng = np.random.default_rng(seed)
+    previous = None
+    for m in sample_sizes(analysis.n):
+        with profiler.stage("Подвыборка", m):
+            sample = subsample(analysis, m, rng)
+        m = sample.n
+        with profiler.stage("Базовые статистики (подвыборка)", m):
+            sample.calculate_basic_stats()
+        corr = correlation_report(sample)
+        models = dict(iter_models(sample, nonlinear, profiler))
+        plot_data = None
+        if render_mode is not None:
+            with profiler.stage("Данные графика (подвыборка)", m):
+                plot_data = prepare_plot_data(sample, render_mode)
+        change = None if previous is None else curve_change(previous, models, sample)
+        converged = change is not None and change < tolerance
+        yield dict(
+            analysis=sample,
+            n=m,
+            total=analysis.n,
+            correlation=corr,
+            models=models,
+            plot_data=plot_data,
+            change=change,
+            tolerance=tolerance,
+            converged=converged,
+        )
+        if converged:
+            return
+        previous = models
+
+
+def sample_report(step, nonlinear=False, profiler=NULL_PROFILER):
+    """
+    Отчёт по подвыборке этапа, на котором оценки сошлись.
+
+    Args:
+        step (dict): этап iter_refinements.
+        nonlinear (bool): см. pipeline.iter_models; должен совпадать
+            с параметром iter_refinements.
+        profiler (Profiler): замер времени этапов.
+
+    Returns:
+        dict: отчёт в формате pipeline.run_analysis (перекрёстная
+        проверка — по подвыборке) с ключами sample (этап iter_refinements)
+        и plot_data.
+    """
+    sample = step["analysis"]
+    with profiler.stage("Перекрёстная проверка", sample.n):
+        cv = cross_validate(sample, nonlinear=nonlinear)
+    report = make_report(step["correlation"], step["models"], cv)
+    report["sample"] = step
+    report["plot_data"] = step["plot_data"]
+    return report
+
+
+def sample_lines(step):
+    """Текст о подвыборке этапа построчно."""
+    lines = [f"Подвыборка: {step['n']:,} из {step['total']:,} точек".replace(",", " ")]
+    if step["change"] is None:
+        lines.append("Предварительные оценки, уточнение продолжается…")
+    elif step["converged"]:
+        lines.append(
+            f"Оценки сошлись: изменение кривых {step['change']:.2%} СКО Y "
+            f"< допуска {step['tolerance']:.2%}; полный проход не выполнялся"
+        )
+    else:
+        lines.append(
+            f"Изменение кривых {step['change']:.2%} СКО Y "
+            f"≥ допуска {step['tolerance']:.2%}, уточнение продолжается…"
+        )
+    return lines
@@ -0,0 +1,226 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor, QFont
+
+from pipeline import REPORT_COLUMNS, format_number
+
+NUMERIC_FIELDS = ["rmse", "mare", "r2", "F"]
+NUMERIC_FORMATS = {"rmse": ".4f", "mare": ".2f", "r2": ".4f", "F": ".2f"}
+FIELDS = ["name", "eq"] + NUMERIC_FIELDS + ["sig"]
+
+
+class ReportTableModel(QAbstractTableModel):
+    """
+    Табличная модель отчёта по моделям регрессии.
+
+    Результаты хранятся по столбцам в массивах NumPy; текст, шрифты
+    и цвета ячеек вычисляются только при запросе представлением,
+    то есть только для видимых строк. Сортировка и фильтрация
+    выполняются над массивами и сводятся к перестановке индексов строк.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self.clear()
+
+    def clear(self):
+        self.beginResetModel()
+        self._size = 0
+        self._columns = dict(
+            name=np.empty(16, dtype=object),
+            eq=np.empty(16, dtype=object),
+            rmse=np.empty(16),
+            mare=np.empty(16),
+            r2=np.empty(16),
+            F=np.empty(16),
+            sig=np.empty(16, dtype=bool),
+        )
+        self._rows = np.empty(0, dtype=np.intp)
+        self._sort = None
+        self._filter_text = ""
+        self._only_significant = False
+        self._best_rmse = self._best_r2 = None
+        self.endResetModel()
+
+    def column(self, field):
+        """Возвращает столбец результатов (без учёта сортировки и фильтра)."""
+        return self._columns[field][: self._size]
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._columns["name"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for field, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[: self._size] = values[: self._size]
+            self._columns[field] = grown
+
+    def append_row(self, name, m):
+        """Добавляет одну модель (FittedModel из pipeline.iter_models)."""
+        self.append_rows(
+            [name],
+            [m.eq],
+            **{field: [getattr(m, field)] for field in NUMERIC_FIELDS},
+            sig=[m.sig],
+        )
+
+    def set_row(self, name, m):
+        """
+        Заменяет значения модели с именем name на месте (например, при
+        уточнении прогрессивного анализа) или добавляет её, если такой
+        строки ещё нет.
+        """
+        found = np.flatnonzero(self.column("name") == name)
+        if len(found) == 0:
+            self.append_row(name, m)
+            return
+        row = found[0]
+        self._columns["eq"][row] = m.eq
+        for field in NUMERIC_FIELDS:
+            self._columns[field][row] = getattr(m, field)
+        self._columns["sig"][row] = m.sig
+        if self._sort is not None or self._filter_text or self._only_significant:
+            self._update_rows()
+        visible = np.flatnonzero(self._rows == row)
+        if len(visible):
+            position = int(visible[0])
+            self.dataChanged.emit(
+                self.index(position, 0), self.index(position, self.columnCount() - 1)
+            )
+
+    def append_rows(self, names, eqs, rmse, mare, r2, F, sig):
+        """
+        Добавляет сразу много моделей по столбцам (например, результаты
+        BatchRegression или перебора степеней полинома).
+        """
+        count = len(names)
+        if count == 0:
+            return
+        self._reserve(count)
+        start, stop = self._size, self._size + count
+        values = dict(name=names, eq=eqs, rmse=rmse, mare=mare, r2=r2, F=F, sig=sig)
+        for field, column in values.items():
+            self._columns[field][start:stop] = column
+        self._size = stop
+        if self._sort is None and not self._filter_text and not self._only_significant:
+            self.beginInsertRows(QModelIndex(), start, stop - 1)
+            self._rows = np.arange(stop, dtype=np.intp)
+            self.endInsertRows()
+        else:
+            self._update_rows()
+
+    def set_best(self, best_rmse, best_r2):
+        """Отмечает лучшие модели по СКО и по R² (по имени)."""
+        self._best_rmse, self._best_r2 = best_rmse, best_r2
+        if self.rowCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.BackgroundRole],
+            )
+
+    def set_filter(self, text="", only_significant=False):
+        """Оставляет строки, где имя или уравнение содержит text."""
+        self._filter_text = text.strip().lower()
+        self._only_significant = only_significant
+        self._update_rows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort = (column, order) if column >= 0 else None
+        self._update_rows()
+
+    def _update_rows(self):
+        """
+        Пересчитывает видимые строки после сортировки, фильтра или
+        изменения данных.
+
+        Перестановка тех же строк сообщается как изменение раскладки
+        (с переносом постоянных индексов), а изменение набора строк —
+        как сброс модели: контракт layoutChanged не допускает появления
+        и исчезновения строк.
+        """
+        rows = self._visible_rows()
+        old_rows = self._rows
+        if len(rows) != len(old_rows) or not np.array_equal(
+            np.sort(rows), np.sort(old_rows)
+        ):
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        position = np.empty(self._size, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+        self._rows = rows
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.index(int(position[old_rows[index.row()]]), index.column())
+                for index in persistent
+            ],
+        )
+        self.layoutChanged.emit()
+
+    def _visible_rows(self):
+        rows = np.arange(self._size, dtype=np.intp)
+        if self._only_significant:
+            rows = rows[self.column("sig")]
+        if self._filter_text:
+            text = self._filter_text
+            names, eqs = self.column("name"), self.column("eq")
+            keep = [text in names[i].lower() or text in eqs[i].lower() for i in rows]
+            rows = rows[np.asarray(keep, dtype=bool)]
+        if self._sort is not None:
+            column, order = self._sort
+            values = self.column(FIELDS[column])[rows]
+            if values.dtype == object:
+                values = np.asarray(values, dtype=str)
+            rows = rows[np.argsort(values, kind="stable")]
+            if order == Qt.DescendingOrder:
+                rows = rows[::-1]
+        return rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(REPORT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return REPORT_COLUMNS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        field = FIELDS[index.column()]
+        value = self._columns[field][row]
+
+        if role == Qt.DisplayRole:
+            if field == "sig":
+                return "Да" if value else "Нет"
+            if field in NUMERIC_FORMATS:
+                return format_number(value, NUMERIC_FORMATS[field])
+            return value
+        if role == Qt.FontRole and field in ("name", "sig"):
+            return self._bold
+        if role == Qt.ForegroundRole and field == "sig":
+            return QColor("darkgreen") if value else QColor("red")
+        if role == Qt.BackgroundRole:
+            name = self._columns["name"][row]
+            if name == self._best_rmse and name == self._best_r2:
+                return QColor(Qt.yellow)
+            if name == self._best_rmse:
+                return QColor(Qt.green)
+            if name == self._best_r2:
+                return QColor(Qt.cyan)
+        return None
@@ -0,0 +1,266 @@
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from batch import MODEL_DEGREES
+
+MAX_DEGREE = 3
+WINDOWS_PER_CHUNK = 1 << 18
+
+# Порядок сумм по окну: t^k (k = 0..6), y·t^k (k = 0..3), y²,
+# затем (n, Σu, Σu², Σv, Σuv, Σv²) для экспоненциальной и степенной моделей.
+_POWER = slice(0, 2 * MAX_DEGREE + 1)
+_CROSS = slice(2 * MAX_DEGREE + 1, 3 * MAX_DEGREE + 2)
+_SYY = 3 * MAX_DEGREE + 2
+_EXP = slice(_SYY + 1, _SYY + 7)
+_POW = slice(_SYY + 7, _SYY + 13)
+N_SUMS = _SYY + 13
+
+
+def rolling_regression(x, y, window, windows_per_chunk=WINDOWS_PER_CHUNK):
+    """
+    Строит все пять семейств моделей на каждом положении скользящего окна.
+
+    Суммы по окну обновляются добавлением входящей и вычитанием
+    выходящей точки; это выполняется векторно через префиксные суммы,
+    поэтому стоимость не зависит от ширины окна. Чтобы префиксные суммы
+    высоких степеней не теряли точность, ряд делится на сегменты
+    по window окон, и в каждом сегменте X и Y сдвигаются и масштабируются
+    по его 2·window точкам.
+
+    Для экспоненциальной и степенной моделей R² и СКО вычисляются
+    для линеаризованной модели (в логарифмах Y), как и при их построении.
+
+    Args:
+        x (array_like): значения X (можно np.memmap).
+        y (array_like): значения Y.
+        window (int): ширина окна (не меньше 2).
+        windows_per_chunk (int): число окон, обрабатываемых за раз.
+
+    Returns:
+        dict: {имя модели: dict(coefs, r2, rmse)}; coefs имеет форму
+        (число окон, число коэффициентов), r2 и rmse — (число окон,).
+        Окно i содержит точки i .. i + window - 1.
+    """
+    n = len(x)
+    if not 2 <= window <= n:
+        raise ValueError(f"Ширина окна должна быть от 2 до {n}, получено {window}")
+    count = n - window + 1
+    results = {
+        name: dict(
+            coefs=np.empty((count, size)),
+            r2=np.empty(count),
+            rmse=np.empty(count),
+        )
+        for name, size in _family_sizes().items()
+    }
+    chunk = max(1, windows_per_chunk // window) * window
+    for start in range(0, count, chunk):
+        stop = min(start + chunk, count)
+        part = _rolling_chunk(x, y, window, start, stop)
+        for name, values in part.items():
+            for key, value in values.items():
+                results[name][key][start:stop] = value
+    return results
+
+
+def _family_sizes():
+    sizes = {name: degree + 1 for name, degree in MODEL_DEGREES.items()}
+    sizes.update({"Экспоненциальная": 2, "Степенная": 2})
+    return sizes
+
+
+def _rolling_chunk(x, y, window, start, stop):
+    # Сегмент j содержит окна start + j·w ... start + (j + 1)·w - 1,
+    # то есть точки start + j·w ... start + (j + 2)·w - 1.
+    segments = -(-(stop - start) // window)
+    length = (segments + 1) * window
+    xs = _padded(x, start, length)
+    ys = _padded(y, start, length)
+    x_seg = sliding_window_view(xs, 2 * window)[::window]
+    y_seg = sliding_window_view(ys, 2 * window)[::window]
+
+    x_lo, x_hi = x_seg.min(axis=1), x_seg.max(axis=1)
+    shift = ((x_hi + x_lo) / 2)[:, None]
+    scale = np.where(x_hi > x_lo, (x_hi - x_lo) / 2, 1.0)[:, None]
+    y_shift = y_seg.mean(axis=1)[:, None]
+    t = (x_seg - shift) / scale
+    dy = y_seg - y_shift
+
+    # Суммы по окнам хранятся по столбцам: sums[i] имеет форму
+    # (сегменты, окна сегмента), и дальнейшие решения поэлементны.
+    sums = np.empty((N_SUMS, segments, window))
+    column = iter(range(N_SUMS))
+    p = np.ones_like(t)
+    for k in range(2 * MAX_DEGREE + 1):
+        _window_sums(p, window, sums[next(column)])
+        p = p * t
+    p = dy
+    for k in range(MAX_DEGREE + 1):
+        _window_sums(p, window, sums[next(column)])
+        p = p * t
+    _window_sums(dy * dy, window, sums[next(column)])
+
+    valid_exp = y_seg > 0
+    ln_y = np.log(np.where(valid_exp, y_seg, 1.0))
+    exp_shift = _masked_mean(ln_y, valid_exp)
+    for values in _log_columns(valid_exp, t, ln_y - exp_shift):
+        _window_sums(values, window, sums[next(column)])
+
+    valid_pow = valid_exp & (x_seg > 0)
+    ln_x = np.log(np.where(valid_pow, x_seg, 1.0))
+    ln_x_shift = _masked_mean(ln_x, valid_pow)
+    pow_shift = _masked_mean(ln_y, valid_pow)
+    for values in _log_columns(valid_pow, ln_x - ln_x_shift, ln_y - pow_shift):
+        _window_sums(values, window, sums[next(column)])
+
+    size = stop - start
+    flat = lambda a: np.broadcast_to(a, (segments, window)).reshape(-1)[:size]
+
+    part = {}
+    polynomials = _polynomials(sums)
+    for name, degree in MODEL_DEGREES.items():
+        coefs, r2, rmse = polynomials[degree]
+        coefs = _unscale(coefs, shift, scale)
+        coefs[..., 0] += y_shift
+        part[name] = dict(
+            coefs=coefs.reshape(-1, degree + 1)[:size], r2=flat(r2), rmse=flat(rmse)
+        )
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        alpha, beta, r2, rmse = _linear(sums[_EXP])
+        ln_a = alpha + exp_shift - beta * shift / scale
+        coefs = np.stack((np.exp(ln_a), beta / scale), axis=-1)
+        part["Экспоненциальная"] = dict(
+            coefs=coefs.reshape(-1, 2)[:size], r2=flat(r2), rmse=flat(rmse)
+        )
+
+        alpha, beta, r2, rmse = _linear(sums[_POW])
+        ln_a = alpha + pow_shift - beta * ln_x_shift
+        coefs = np.stack((np.exp(ln_a), np.broadcast_to(beta, ln_a.shape)), axis=-1)
+        part["Степенная"] = dict(
+            coefs=coefs.reshape(-1, 2)[:size], r2=flat(r2), rmse=flat(rmse)
+        )
+    return part
+
+
+def _padded(a, start, length):
+    """Срез a[start:start + length], дополненный последним значением."""
+    values = np.asarray(a[start : start + length], dtype=np.float64)
+    if len(values) < length:
+        values = np.concatenate((values, np.full(length - len(values), values[-1])))
+    return values
+
+
+def _window_sums(values, window, out):
+    """Суммы по окнам внутри сегментов через префиксные суммы."""
+    prefix = np.zeros((len(values), values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=prefix[:, 1:])
+    np.subtract(prefix[:, window : 2 * window], prefix[:, :window], out=out)
+
+
+def _masked_mean(values, mask):
+    count = mask.sum(axis=1)
+    total = np.where(mask, values, 0.0).sum(axis=1)
+    return np.divide(total, count, out=np.zeros_like(total), where=count > 0)[:, None]
+
+
+def _log_columns(valid, u, v):
+    w = valid.astype(np.float64)
+    u, v = u * w, v * w
+    return w, u, u * u, v, u * v, v * v
+
+
+def _polynomials(sums):
+    """
+    Решает нормальные уравнения всех окон поэлементно, без вызова LAPACK
+    на каждую систему. Матрица Грама масштабируется по диагонали
+    и раскладывается по Холецкому явными формулами над массивами окон.
+    Множитель Холецкого для степени d — левый верхний блок множителя
+    для MAX_DEGREE, поэтому одно разложение служит всем степеням,
+    а SS_res = Σy² - |z|² получается из прямой подстановки Lz = Xᵀy.
+
+    Returns:
+        dict: {степень: (коэффициенты по t формы (..., d + 1), r2, rmse)}.
+    """
+    k = MAX_DEGREE + 1
+    power, cross = sums[_POWER], sums[_CROSS]
+    n, sy, syy = power[0], cross[0], sums[_SYY]
+    ss_tot = syy - sy**2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = [1 / np.sqrt(power[2 * i]) for i in range(k)]
+        L = [[None] * k for _ in range(k)]
+        for j in range(k):
+            s = power[2 * j] * d[j] ** 2 - sum(L[j][m] ** 2 for m in range(j))
+            L[j][j] = np.sqrt(np.maximum(s, 0.0))
+            for i in range(j + 1, k):
+                s = power[i + j] * d[i] * d[j] - sum(
+                    L[i][m] * L[j][m] for m in range(j)
+                )
+                L[i][j] = s / L[j][j]
+        z = []
+        for i in range(k):
+            s = cross[i] * d[i] - sum(L[i][m] * z[m] for m in range(i))
+            z.append(s / L[i][i])
+
+        result = {}
+        ss_res = syy
+        for degree in range(MAX_DEGREE + 1):
+            ss_res = ss_res - z[degree] ** 2
+            if degree == 0:
+                continue
+            sol = [None] * (degree + 1)
+            for i in reversed(range(degree + 1)):
+                s = z[i] - sum(L[m][i] * sol[m] for m in range(i + 1, degree + 1))
+                sol[i] = s / L[i][i]
+            coefs = np.stack([c * di for c, di in zip(sol, d)], axis=-1)
+            result[degree] = (coefs, *_metrics(np.maximum(ss_res, 0.0), ss_tot, n))
+        return result
+
+
+def _unscale(coefs, shift, scale):
+    """
+    Поэлементный аналог analysis.unscale_polynomial для окон сегмента:
+    a_m = Σ_k c_k·C(k, m)·(-shift)^(k-m) / scale^k.
+    """
+    size = coefs.shape[-1]
+    c = [coefs[..., k] / scale**k for k in range(size)]
+    result = np.empty_like(coefs)
+    with np.errstate(invalid="ignore"):
+        for m in range(size):
+            result[..., m] = sum(
+                math.comb(k, m) * (-shift) ** (k - m) * c[k] for k in range(m, size)
+            )
+    return result
+
+
+def _linear(sums):
+    n, su, suu, sv, suv, svv = sums
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (n * suv - su * sv) / (n * suu - su**2)
+        alpha = (sv - beta * su) / n
+        ss_res = np.maximum(svv - alpha * sv - beta * suv, 0.0)
+        return (alpha, beta, *_metrics(ss_res, svv - sv**2 / n, n))
+
+
+def _metrics(ss_res, ss_tot, n):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 0.0)
+        rmse = np.sqrt(ss_res / n)
+    return r2, rmse
+
+
+def save_rolling(results, path):
+    """
+    Сохраняет результат rolling_regression в .npz; ключи массивов
+    имеют вид «<модель>.coefs», «<модель>.r2», «<модель>.rmse».
+    """
+    np.savez(
+        path,
+        **{
+            f"{name}.{key}": value
+            for name, values in results.items()
+            for key, value in values.items()
+        },
+    )
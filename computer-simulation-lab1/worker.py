@@ -0,0 +1,296 @@
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from bootstrap import confidence_intervals
+from cross_validation import cross_validate
+from parallel import analyze_dataset, iter_datasets
+from pipeline import (
+    MODEL_NAMES,
+    correlation_report,
+    iter_models,
+    make_report,
+    multivariate_model,
+)
+from plotting import prepare_plot_data, resolve_mode
+from profiling import NULL_PROFILER
+from progressive import applies, iter_refinements, sample_report
+
+
+class AnalysisWorker(QObject):
+    """
+    Выполняет анализ в фоновом потоке (через QObject.moveToThread).
+
+    Модели строятся по одной; после каждой испускается model_ready,
+    поэтому окно может заполнять таблицу по мере расчёта.
+
+    В прогрессивном режиме большие данные сначала анализируются по
+    подвыборкам растущего размера (progressive.iter_refinements): на
+    каждом этапе model_ready испускается заново для всех моделей, затем
+    refined с результатами этапа. Если оценки сошлись, отчёт строится
+    по подвыборке без полного прохода.
+    """
+
+    correlation_ready = pyqtSignal(object)
+    model_ready = pyqtSignal(str, object)
+    refined = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    INTERVALS = dict(method="bootstrap", n_resamples=1000, confidence=0.95, seed=None)
+
+    def __init__(
+        self,
+        analysis,
+        render_mode="auto",
+        intervals=False,
+        nonlinear=False,
+        cache=None,
+        profiler=NULL_PROFILER,
+        progressive=False,
+    ):
+        """
+        Args:
+            analysis (RegressionAnalysis): анализ.
+            render_mode (str): режим отображения точек (см. prepare_plot_data).
+            intervals (bool): оценивать бутстреп-интервалы (INTERVALS).
+            nonlinear (bool): см. pipeline.iter_models.
+            cache (ResultCache | None): кеш результатов; при попадании
+                отчёт выдаётся без расчёта.
+            profiler (Profiler): замер времени этапов; профиль cProfile
+                собирается по всему фоновому расчёту.
+            progressive (bool): прогрессивный анализ по подвыборкам
+                (для данных, где progressive.applies).
+        """
+        super().__init__()
+        self.analysis = analysis
+        self.render_mode = render_mode
+        self.intervals = intervals
+        self.nonlinear = nonlinear
+        self.cache = cache
+        self.profiler = profiler
+        self.progressive = progressive
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Просит остановить расчёт после текущей модели."""
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            with self.profiler.capture():
+                self._run()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _run(self):
+        if self.progressive and applies(self.analysis):
+            step = self._refine()
+            if step is None:
+                self.cancelled.emit()
+                return
+            if step["converged"]:
+                self._finish_sample(step)
+                return
+        profiler = self.profiler
+        key = None
+        if self.cache is not None:
+            with profiler.stage("Чтение кеша"):
+                key = self.cache.key(
+                    self.analysis,
+                    nonlinear=self.nonlinear,
+                    intervals=self.INTERVALS if self.intervals else None,
+                )
+                report = self.cache.load(key, self.analysis)
+            if report is not None:
+                profiler.count("Попадания в кеш")
+                self._emit_cached(key, report)
+                return
+        self._compute(key)
+
+    def _refine(self):
+        """
+        Испускает предварительные результаты по подвыборкам.
+
+        Returns:
+            dict | None: последний этап или None, если расчёт отменён.
+        """
+        self.progress.emit(0, 0)
+        step = None
+        steps = iter_refinements(
+            self.analysis,
+            self.nonlinear,
+            render_mode=resolve_mode(self.analysis, self.render_mode),
+            profiler=self.profiler,
+        )
+        for step in steps:
+            if self.is_cancelled():
+                return None
+            self.correlation_ready.emit(step["correlation"])
+            for name, m in step["models"].items():
+                self.model_ready.emit(name, m)
+            self.refined.emit(step)
+        return None if self.is_cancelled() else step
+
+    def _finish_sample(self, step):
+        report = sample_report(step, self.nonlinear, self.profiler)
+        if self.intervals:
+            with self.profiler.stage("Доверительные интервалы", step["n"]):
+                report["intervals"] = confidence_intervals(
+                    step["analysis"], nonlinear=self.nonlinear, **self.INTERVALS
+                )
+        self.finished.emit(report)
+
+    def _emit_cached(self, key, report):
+        total = len(report["models"]) + 2
+        self.correlation_ready.emit(report["correlation"])
+        for name, m in report["models"].items():
+            self.model_ready.emit(name, m)
+        self.progress.emit(total - 1, total)
+        plot_data = report.get("plot_data")
+        mode = resolve_mode(self.analysis, self.render_mode)
+        if plot_data is None or plot_data["mode"] != mode:
+            with self.profiler.stage("Данные графика", len(self.analysis.x)):
+                report["plot_data"] = prepare_plot_data(self.analysis, mode)
+            with self.profiler.stage("Запись кеша"):
+                self.cache.store(key, self.analysis, report)
+        self.progress.emit(total, total)
+        self.finished.emit(report)
+
+    def _compute(self, key):
+        profiler = self.profiler
+        rows = len(self.analysis.x)
+        total = len(MODEL_NAMES) + 3 + self.intervals
+        if self.analysis.stats is None:
+            with profiler.stage("Базовые статистики", rows):
+                self.analysis.calculate_basic_stats()
+        if self.is_cancelled():
+            self.cancelled.emit()
+            return
+        with profiler.stage("Корреляция"):
+            corr = correlation_report(self.analysis)
+        self.correlation_ready.emit(corr)
+        self.progress.emit(1, total)
+
+        models = {}
+        for name, m in iter_models(self.analysis, self.nonlinear, profiler):
+            if self.is_cancelled():
+                self.cancelled.emit()
+                return
+            models[name] = m
+            self.model_ready.emit(name, m)
+            self.progress.emit(len(models) + 1, total)
+
+        with profiler.stage("Перекрёстная проверка", rows):
+            cv = cross_validate(self.analysis, nonlinear=self.nonlinear)
+        self.progress.emit(len(models) + 2, total)
+        if self.is_cancelled():
+            self.cancelled.emit()
+            return
+        report = make_report(corr, models, cv)
+        if self.intervals:
+            with profiler.stage("Доверительные интервалы", rows):
+                report["intervals"] = confidence_intervals(
+                    self.analysis, nonlinear=self.nonlinear, **self.INTERVALS
+                )
+            self.progress.emit(total - 1, total)
+            if self.is_cancelled():
+                self.cancelled.emit()
+                return
+        with profiler.stage("Данные графика", rows):
+            report["plot_data"] = prepare_plot_data(self.analysis, self.render_mode)
+        if key is not None:
+            with profiler.stage("Запись кеша"):
+                self.cache.store(key, self.analysis, report)
+        self.progress.emit(total, total)
+        self.finished.emit(report)
+
+
+class MultivariateWorker(QObject):
+    """Строит множественную регрессию в фоновом потоке."""
+
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, mv, method="cholesky"):
+        super().__init__()
+        self.mv = mv
+        self.method = method
+
+    def run(self):
+        try:
+            if self.mv.means is None:
+                self.mv.calculate_basic_stats()
+            name, m = multivariate_model(self.mv, self.method)
+            self.finished.emit(name, m)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class CorrelationWorker(QObject):
+    """Вычисляет матрицу корреляций в фоновом потоке."""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, corr):
+        super().__init__()
+        self.corr = corr
+
+    def run(self):
+        try:
+            self.finished.emit(self.corr.calculate())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class BatchWorker(QObject):
+    """
+    Анализирует папку наборов данных в пуле процессов (parallel.iter_datasets)
+    и выдаёт результат каждого набора по мере готовности.
+    """
+
+    dataset_ready = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, paths, workers=None, task=analyze_dataset, **options):
+        """
+        Args:
+            paths (list[str]): пути к файлам данных.
+            workers (int | None): число процессов.
+            task (callable): задача для каждого набора (см.
+                parallel.iter_datasets), например export.export_dataset.
+            **options: параметры task.
+        """
+        super().__init__()
+        self.paths = paths
+        self.workers = workers
+        self.task = task
+        self.options = options
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Отменяет ещё не начатые наборы после ближайшего результата."""
+        self._cancel.set()
+
+    def run(self):
+        try:
+            total = len(self.paths)
+            self.progress.emit(0, total)
+            results = iter_datasets(self.paths, self.workers, self.task, **self.options)
+            for done, result in enumerate(results, start=1):
+                self.dataset_ready.emit(result)
+                self.progress.emit(done, total)
+                if self._cancel.is_set():
+                    results.close()
+                    break
+            self.finished.emit()
+        except Exception as e:
+            self.failed.emit(str(e))